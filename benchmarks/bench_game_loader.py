@@ -0,0 +1,246 @@
+# coding: utf-8
+"""
+Compares the board game loader (:py:func:`boardgamegeek.loaders.game._create_game_from_xml`, which uses the extractor
+compiled from :py:data:`boardgamegeek.loaders.game.BOARD_GAME_SCHEMA`, walking the children of an item once) with the
+previous one, which searched the item with XPath expressions for each field (kept below for the comparison). The
+extractors of all the item types are compiled the same way, so this measures the path they share.
+
+The board games from the recorded ``/thing`` replies in ``test/xml`` are repeated to build batches of ``--batch-size``
+items, like the replies to :py:meth:`boardgamegeek.api.BGGClient.game_list`. The batches are parsed once, only the
+loading of the games is measured. Both loaders are checked to return the same data.
+
+Usage::
+
+    python benchmarks/bench_game_loader.py [--batch-size 100] [--iterations 20]
+"""
+from __future__ import print_function
+
+import argparse
+import glob
+import io
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from boardgamegeek.api import html_parser
+from boardgamegeek.exceptions import BGGApiError
+from boardgamegeek.loaders import game as game_loader
+from boardgamegeek.objects.games import BoardGame
+from boardgamegeek.utils import xml_subelement_attr_list, xml_subelement_text, xml_subelement_attr
+from boardgamegeek.utils import get_board_game_version_from_element
+
+XML_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test", "xml")
+
+BOARD_GAME_TYPES = ("boardgame", "boardgameexpansion", "boardgameaccessory")
+
+
+def xpath_loader(xml_root, game_id, game_type, html_parser):
+    """ The loader used before, searching the item for each field """
+    data = {"id": game_id,
+            "name": xml_subelement_attr(xml_root, "name[@type='primary']"),
+            "alternative_names": xml_subelement_attr_list(xml_root, "name[@type='alternate']"),
+            "thumbnail": xml_subelement_text(xml_root, "thumbnail"),
+            "image": xml_subelement_text(xml_root, "image"),
+            "expansion": game_type == "boardgameexpansion",       # is this game an expansion?
+            "accessory": game_type == "boardgameaccessory",       # is this game an accessory?
+            "families": xml_subelement_attr_list(xml_root, "link[@type='boardgamefamily']"),
+            "categories": xml_subelement_attr_list(xml_root, "link[@type='boardgamecategory']"),
+            "implementations": xml_subelement_attr_list(xml_root, "link[@type='boardgameimplementation']"),
+            "mechanics": xml_subelement_attr_list(xml_root, "link[@type='boardgamemechanic']"),
+            "designers": xml_subelement_attr_list(xml_root, "link[@type='boardgamedesigner']"),
+            "artists": xml_subelement_attr_list(xml_root, "link[@type='boardgameartist']"),
+            "publishers": xml_subelement_attr_list(xml_root, "link[@type='boardgamepublisher']"),
+            "description": xml_subelement_text(xml_root, "description", convert=html_parser.unescape, quiet=True)}
+
+    expands = []        # list of items this game expands
+    expansions = []     # list of expansions this game has
+    for e in xml_root.findall("link[@type='boardgameexpansion']"):
+        try:
+            item = {"id": e.attrib["id"], "name": e.attrib["value"]}
+        except KeyError:
+            raise BGGApiError("malformed XML element ('link type=boardgameexpansion')")
+
+        if e.attrib.get("inbound", "false").lower()[0] == 't':
+            # this is an item expanded by game_id
+            expands.append(item)
+        else:
+            expansions.append(item)
+
+    data["expansions"] = expansions
+    data["expands"] = expands
+
+    # These XML elements have a numberic value, attempt to convert them to integers
+    for i in ["yearpublished", "minplayers", "maxplayers", "playingtime", "minplaytime", "maxplaytime", "minage"]:
+        data[i] = xml_subelement_attr(xml_root, i, convert=int, quiet=True)
+
+    # Look for the videos
+    # TODO: The BGG API doesn't take the page=NNN parameter into account for videos; when it does, paginate them too
+    videos = xml_root.find("videos")
+    if videos is not None:
+        vid_list = []
+        for vid in videos.findall("video"):
+            try:
+                vd = {"id": vid.attrib["id"],
+                      "name": vid.attrib["title"],
+                      "category": vid.attrib.get("category"),
+                      "language": vid.attrib.get("language"),
+                      "link": vid.attrib["link"],
+                      "uploader": vid.attrib.get("username"),
+                      "uploader_id": vid.attrib.get("userid"),
+                      "post_date": vid.attrib.get("postdate")
+                      }
+                vid_list.append(vd)
+            except KeyError:
+                raise BGGApiError("malformed XML element ('video')")
+
+        data["videos"] = vid_list
+
+    # look for the versions
+    versions = xml_root.find("versions")
+    if versions is not None:
+        ver_list = []
+
+        for version in versions.findall("item[@type='boardgameversion']"):
+            try:
+                vd = get_board_game_version_from_element(version)
+                ver_list.append(vd)
+            except KeyError:
+                raise BGGApiError("malformed XML element ('versions')")
+
+        data["versions"] = ver_list
+
+    # look for the statistics
+    stats = xml_root.find("statistics/ratings")
+    if stats is not None:
+        sd = {
+            "usersrated": xml_subelement_attr(stats, "usersrated", convert=int, quiet=True),
+            "average": xml_subelement_attr(stats, "average", convert=float, quiet=True),
+            "bayesaverage": xml_subelement_attr(stats, "bayesaverage", convert=float, quiet=True),
+            "stddev": xml_subelement_attr(stats, "stddev", convert=float, quiet=True),
+            "median": xml_subelement_attr(stats, "median", convert=float, quiet=True),
+            "owned": xml_subelement_attr(stats, "owned", convert=int, quiet=True),
+            "trading": xml_subelement_attr(stats, "trading", convert=int, quiet=True),
+            "wanting": xml_subelement_attr(stats, "wanting", convert=int, quiet=True),
+            "wishing": xml_subelement_attr(stats, "wishing", convert=int, quiet=True),
+            "numcomments": xml_subelement_attr(stats, "numcomments", convert=int, quiet=True),
+            "numweights": xml_subelement_attr(stats, "numweights", convert=int, quiet=True),
+            "averageweight": xml_subelement_attr(stats, "averageweight", convert=float, quiet=True),
+            "ranks": []
+        }
+
+        ranks = stats.findall("ranks/rank")
+        for rank in ranks:
+            try:
+                rank_value = int(rank.attrib.get("value"))
+            except:
+                rank_value = None
+            sd["ranks"].append({"id": rank.attrib["id"],
+                                "name": rank.attrib["name"],
+                                "friendlyname": rank.attrib.get("friendlyname"),
+                                "value": rank_value})
+
+        data["stats"] = sd
+
+        polls = xml_root.findall("poll")
+        data["suggested_players"] = {}
+        for poll in polls:
+            if poll.attrib.get("name") == "suggested_numplayers":
+                results = poll.findall('results')
+                data["suggested_players"]['total_votes'] = poll.attrib.get('totalvotes')
+                data["suggested_players"]['results'] = {}
+                for result in results:
+                    player_count = result.attrib.get("numplayers")
+                    if result.find("result[@value='Best']") is not None:
+                        data["suggested_players"]['results'][player_count] = {
+                            'best_rating': result.find("result[@value='Best']")
+                            .attrib.get("numvotes"),
+                            'recommended_rating': result
+                            .find("result[@value='Recommended']").attrib.get("numvotes"),
+                            'not_recommeded_rating': result
+                            .find("result[@value='Not Recommended']")
+                            .attrib.get("numvotes"),
+                        }
+                    else:
+                        ''' if there is only one poll player count and no votes recorded
+                            by default it is the the best player count '''
+                        data["suggested_players"]['results'][player_count] = {
+                            'best_rating': '1',
+                            'recommended_rating': '0',
+                            'not_recommeded_rating': '0',
+                        }
+
+    return BoardGame(data)
+
+
+
+def load_batches(batch_size, versions):
+    """ Builds batches of ``batch_size`` games from the recorded replies (with or without the versions) """
+    items = []
+    for filename in sorted(glob.glob(os.path.join(XML_PATH, "thing?*"))):
+        if ("versions=1" in filename) != versions:
+            continue
+        with io.open(filename, "rb") as f:
+            root = ET.fromstring(f.read())
+        items.extend(item for item in root.findall("item") if item.attrib.get("type") in BOARD_GAME_TYPES)
+
+    if not items:
+        return []
+    return [(items * (batch_size // len(items) + 1))[:batch_size]]
+
+
+def capture_data(loader, item):
+    """ Returns the data a loader would create the game from """
+    captured = []
+
+    original = game_loader.BoardGame
+    game_loader.BoardGame = captured.append
+    globals()["BoardGame"] = captured.append
+    try:
+        loader(item, int(item.attrib["id"]), item.attrib["type"], html_parser)
+    finally:
+        game_loader.BoardGame = original
+        globals()["BoardGame"] = original
+    return captured[0]
+
+
+def run(loader, batches, iterations):
+    best = None
+    for _ in range(iterations):
+        start = time.time()
+        for batch in batches:
+            for item in batch:
+                loader(item, int(item.attrib["id"]), item.attrib["type"], html_parser)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark the board game loaders")
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--iterations", type=int, default=20)
+    args = parser.parse_args()
+
+    for versions in [False, True]:
+        batches = load_batches(args.batch_size, versions)
+        if not batches:
+            continue
+
+        for item in batches[0]:
+            assert capture_data(xpath_loader, item) == capture_data(game_loader._create_game_from_xml, item), \
+                "the loaders disagree on game {}".format(item.attrib["id"])
+
+        xpath = run(xpath_loader, batches, args.iterations)
+        compiled = run(game_loader._create_game_from_xml, batches, args.iterations)
+
+        print("{} games {} versions".format(args.batch_size, "with" if versions else "without"))
+        print("  xpath       best time: {:8.4f}s".format(xpath))
+        print("  compiled    best time: {:8.4f}s".format(compiled))
+        print("  speedup: {:.2f}x".format(xpath / compiled))
+
+
+if __name__ == "__main__":
+    main()
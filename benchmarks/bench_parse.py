@@ -0,0 +1,130 @@
+# coding: utf-8
+"""
+Compares parsing the BGG API responses from the decoded text (``ET.fromstring(r.text)``, what
+:py:func:`boardgamegeek.utils.request_and_parse_xml` used to do) with parsing the raw bytes
+(``ET.fromstring(r.content)``).
+
+The recorded replies from ``test/xml`` are used, wrapped in ``requests.Response`` objects so that the charset
+detection done by ``requests`` is included in the measurements. Since the recorded replies are small, the
+largest one is also inflated (by repeating its items) to the size of a big ``/thing?versions=1`` or ``/collection``
+reply.
+
+Each variant runs in its own process, so that the peak RSS values are comparable.
+
+Usage::
+
+    python benchmarks/bench_parse.py [--size-mb 4] [--iterations 5]
+"""
+from __future__ import print_function
+
+import argparse
+import gc
+import glob
+import io
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+import requests
+
+XML_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test", "xml")
+
+VARIANTS = {
+    "text": lambda r: ET.fromstring(r.text),
+    "content": lambda r: ET.fromstring(r.content),
+}
+
+
+def load_fixtures():
+    fixtures = []
+    for filename in sorted(glob.glob(os.path.join(XML_PATH, "*"))):
+        with io.open(filename, "rb") as f:
+            fixtures.append(f.read())
+    return fixtures
+
+
+def inflate(fixtures, size_mb):
+    """ Builds a ``size_mb`` MB document by repeating the items of the largest recorded reply """
+    largest = max(fixtures, key=len)
+    root = ET.fromstring(largest)
+    items = list(root)
+    copies = max(1, int(size_mb * 1024 * 1024 / len(largest)))
+    for _ in range(copies - 1):
+        root.extend(items)
+    return b'<?xml version="1.0" encoding="utf-8"?>' + ET.tostring(root, encoding="utf-8").split(b"?>", 1)[-1]
+
+
+def make_response(body):
+    r = requests.Response()
+    r.status_code = 200
+    r.headers["content-type"] = "text/xml"
+    r._content = body
+    return r
+
+
+def max_rss_kb():
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # bytes on macOS, kilobytes everywhere else
+    return rss // 1024 if sys.platform == "darwin" else rss
+
+
+def run_variant(variant, bodies, iterations):
+    parse = VARIANTS[variant]
+    gc.collect()
+    rss_before = max_rss_kb()
+
+    best = None
+    for _ in range(iterations):
+        start = time.time()
+        for body in bodies:
+            parse(make_response(body))
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    return {"seconds": best, "rss_growth_kb": max_rss_kb() - rss_before}
+
+
+def measure(variant, workload, size_mb, iterations):
+    """ Runs a variant in a new process and returns its results """
+    output = subprocess.check_output([sys.executable, os.path.abspath(__file__),
+                                      "--run", variant,
+                                      "--workload", workload,
+                                      "--size-mb", str(size_mb),
+                                      "--iterations", str(iterations)])
+    return json.loads(output.decode("utf-8"))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="benchmark XML parsing from text vs bytes")
+    parser.add_argument("--size-mb", type=float, default=4.0, help="size of the inflated document")
+    parser.add_argument("--iterations", type=int, default=5)
+    parser.add_argument("--run", choices=sorted(VARIANTS), help=argparse.SUPPRESS)
+    parser.add_argument("--workload", choices=["fixtures", "inflated"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run:
+        fixtures = load_fixtures()
+        bodies = fixtures if args.workload == "fixtures" else [inflate(fixtures, args.size_mb)]
+        print(json.dumps(run_variant(args.run, bodies, args.iterations)))
+        return
+
+    for workload in ["fixtures", "inflated"]:
+        results = dict((variant, measure(variant, workload, args.size_mb, args.iterations)) for variant in VARIANTS)
+        text, content = results["text"], results["content"]
+
+        print("{} ({})".format(workload, "all recorded replies" if workload == "fixtures"
+                               else "{} MB document".format(args.size_mb)))
+        for variant in sorted(results):
+            print("  {:8} best time: {:8.4f}s   peak RSS growth: {:8d} kB".format(variant,
+                                                                                results[variant]["seconds"],
+                                                                                results[variant]["rss_growth_kb"]))
+        print("  speedup: {:.2f}x, peak RSS growth saved: {} kB".format(text["seconds"] / content["seconds"],
+                                                                       text["rss_growth_kb"] - content["rss_growth_kb"]))
+
+
+if __name__ == "__main__":
+    main()
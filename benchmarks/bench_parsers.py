@@ -0,0 +1,99 @@
+# coding: utf-8
+"""
+Compares the XML parser backends (see :py:mod:`boardgamegeek.parsers`) over the recorded replies from ``test/xml``:
+parsing alone, and parsing plus creating the board games from the ``/thing`` replies, the loaders being the same for
+every backend. The largest reply is also inflated (by repeating its items) to the size of a big ``/thing?versions=1``
+reply.
+
+Usage::
+
+    python benchmarks/bench_parsers.py [--size-mb 4] [--iterations 5]
+"""
+from __future__ import print_function
+
+import argparse
+import glob
+import io
+import os
+import sys
+import time
+import xml.etree.ElementTree as ET
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from boardgamegeek.api import html_parser
+from boardgamegeek.loaders import create_game_from_xml
+from boardgamegeek.parsers import ElementTreeParser, LxmlParser
+
+XML_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "test", "xml")
+
+
+def load_fixtures():
+    fixtures = {}
+    for filename in sorted(glob.glob(os.path.join(XML_PATH, "*"))):
+        with io.open(filename, "rb") as f:
+            fixtures[os.path.basename(filename)] = f.read()
+    return fixtures
+
+
+def inflate(body, size_mb):
+    """ Builds a ``size_mb`` MB document by repeating the items of a reply """
+    root = ET.fromstring(body)
+    items = list(root)
+    copies = max(1, int(size_mb * 1024 * 1024 / len(body)))
+    for _ in range(copies - 1):
+        root.extend(items)
+    return ET.tostring(root, encoding="utf-8")
+
+
+def parse(parser, bodies):
+    for body in bodies:
+        parser.fromstring(body)
+
+
+def parse_and_load(parser, bodies):
+    for body in bodies:
+        for item in parser.fromstring(body).findall("item"):
+            create_game_from_xml(item, game_id=int(item.attrib["id"]), html_parser=html_parser)
+
+
+def best_time(func, parser, bodies, iterations):
+    best = None
+    for _ in range(iterations):
+        start = time.time()
+        func(parser, bodies)
+        elapsed = time.time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description="benchmark the XML parser backends")
+    arg_parser.add_argument("--size-mb", type=float, default=4.0, help="size of the inflated document")
+    arg_parser.add_argument("--iterations", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    parsers = [ElementTreeParser(), LxmlParser()]
+
+    fixtures = load_fixtures()
+    things = [body for name, body in fixtures.items() if name.startswith("thing?")]
+    largest_thing = max(things, key=len)
+
+    workloads = [("parse, all recorded replies", parse, list(fixtures.values())),
+                 ("parse and load, recorded /thing replies", parse_and_load, things),
+                 ("parse and load, {} MB /thing reply".format(args.size_mb), parse_and_load,
+                  [inflate(largest_thing, args.size_mb)])]
+
+    for title, func, bodies in workloads:
+        size_mb = sum(len(body) for body in bodies) / 1024.0 / 1024.0
+        print(title)
+        results = {}
+        for parser in parsers:
+            results[parser.name] = best_time(func, parser, bodies, args.iterations)
+            print("  {:6} best time: {:8.4f}s   {:8.2f} MB/s".format(parser.name, results[parser.name],
+                                                                   size_mb / results[parser.name]))
+        print("  speedup: {:.2f}x".format(results["etree"] / results["lxml"]))
+
+
+if __name__ == "__main__":
+    main()
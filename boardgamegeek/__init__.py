@@ -9,12 +9,15 @@
 
 from .api import BGGClient, BGGChoose, BGGRestrictDomainTo, BGGRestrictPlaysTo, BGGRestrictGameSearchResultsTo, BGGRestrictFamilySearchResultsTo, BGGRestrictCollectionTo
 from .exceptions import BGGError, BGGApiRetryError, BGGApiError, BGGApiTimeoutError, BGGValueError, BGGItemNotFoundError
-from .cache import CacheBackendNone, CacheBackendMemory, CacheBackendSqlite
+from .cache import CacheBackendNone, CacheBackendMemory, CacheBackendSqlite, CacheBackendCompressedSqlite, ObjectCache
+from .cache import TTLPolicy, NegativeCache, CacheBackendFileSystem, CacheStats
 from .version import __version__
 
 __all__ = ["BGGClient", "BGGChoose", "BGGRestrictGameSearchResultsTo", "BGGRestrictFamilySearchResultsTo", "BGGRestrictPlaysTo", "BGGRestrictDomainTo",
            "BGGRestrictCollectionTo", "BGGError", "BGGValueError", "BGGApiRetryError", "BGGApiError",
-           "BGGApiTimeoutError", "BGGItemNotFoundError", "CacheBackendNone", "CacheBackendSqlite", "CacheBackendMemory"]
+           "BGGApiTimeoutError", "BGGItemNotFoundError", "CacheBackendNone", "CacheBackendSqlite", "CacheBackendMemory",
+           "CacheBackendCompressedSqlite", "ObjectCache", "TTLPolicy",
+           "NegativeCache", "CacheBackendFileSystem", "CacheStats"]
 
 __import__('pkg_resources').declare_namespace(__name__)
 
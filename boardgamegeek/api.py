@@ -14,10 +14,13 @@ objects.
 """
 from __future__ import unicode_literals
 
-import datetime
+import functools
+import inspect
 import logging
 import sys
+import threading
 import warnings
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
 from fuzzywuzzy import fuzz
 # This is required for decoding HTML entities from the description text
@@ -28,30 +31,57 @@ else:
     import HTMLParser as hp
 
 
-from .objects.user import User
-from .objects.search import SearchResult
-
-from .exceptions import BGGApiError, BGGError, BGGItemNotFoundError, BGGValueError
-from .utils import xml_subelement_attr, request_and_parse_xml
-from .utils import RateLimitingAdapter, DEFAULT_REQUESTS_PER_MINUTE
+from .exceptions import BGGError, BGGItemNotFoundError, BGGValueError, _BGGMissingItemError
+from .utils import request_and_parse_xml, request_and_iterparse_xml
+from .utils import RateLimitingAdapter, DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_BURST
 from .cache import CacheBackendMemory, CacheBackendNone
+from .batching import ThingBatcher
+from .parsers import get_parser
+from .poller import DeferredRequestPoller
+from .objects.games import BoardGameComment
+from .objects.guild import Guild
 
 from .loaders import create_guild_from_xml, add_guild_members_from_xml
-from .loaders import create_plays_from_xml, add_plays_from_xml
+from .loaders import create_plays_from_xml, add_plays_from_xml_stream
 from .loaders import create_hot_items_from_xml, add_hot_items_from_xml
-from .loaders import create_collection_from_xml, add_collection_items_from_xml
-from .loaders import create_game_from_xml, add_game_comments_from_xml
+from .loaders import create_collection_from_xml_stream
+from .loaders.collection import COLLECTION_ITEM_FIELDS, COLLECTION_STATS_FIELDS
+from .loaders import create_game_from_xml, add_game_comments_from_xml, get_game_comments_from_xml
+from .loaders import get_game_ranks_from_xml
+from .loaders.game import BOARD_GAME_FIELDS
 from .loaders import create_family_from_xml
+from .loaders import create_user_from_xml, add_user_buddies_and_guilds_from_xml
+from .loaders import get_user_buddies_and_guilds_totals_from_xml
+from .loaders import create_search_results_from_xml
 
 
 log = logging.getLogger("boardgamegeek.api")
 html_parser = hp.HTMLParser()
+if not hasattr(html_parser, "unescape"):
+    # HTMLParser.unescape() was removed in Python 3.9
+    import html
+    html_parser.unescape = html.unescape
 
 HOT_ITEM_CHOICES = ["boardgame", "rpg", "videogame", "boardgameperson", "rpgperson", "boardgamecompany",
                     "rpgcompany", "videogamecompany"]
 
 COLLECTION_SUBTYPES = ["boardgame", "boardgameexpansion", "boardgameaccessory", "rpgitem", "rpgissue", "videogame"]
 
+DEFAULT_WORKERS = 4
+
+# default value of BGGClient's ``cache``, standing for an in-memory cache of its own (``None`` disables caching)
+_DEFAULT_CACHE = object()
+
+# maximum number of ids accepted by the /thing API in a single call
+GAME_LIST_CHUNK_SIZE = 20
+
+# the values of a game which are only returned by the /thing API when it's called with stats=1
+_GAME_STATS_FIELDS = frozenset(["stats", "suggested_players"])
+
+# the values of a collection item which are returned by the /collection API when it's called with brief=1
+_BRIEF_COLLECTION_FIELDS = frozenset(["name", "lastmodified", "own", "preordered", "prevowned", "want", "wanttobuy",
+                                      "wanttoplay", "fortrade", "wishlist", "wishlistpriority"])
+
 
 class BGGChoose(object):
     """
@@ -109,6 +139,421 @@ def call_progress_cb(progress_cb, current, total):
         progress_cb(current, total)
 
 
+def last_page(total_items, items_per_page):
+    """
+    Computes the number of the last page of a paginated API call
+
+    :param int total_items: total number of items, as reported by the server
+    :param int items_per_page: how many items were returned on the first page
+    :return: the number of the last page
+    """
+    if items_per_page <= 0 or total_items <= items_per_page:
+        return 1
+    return (total_items + items_per_page - 1) // items_per_page
+
+
+# The functions below validate the arguments of the API calls and build the parameters of the HTTP requests. They're
+# shared by all the clients (e.g. :py:class:`BGGClient` and :py:class:`boardgamegeek.asyncapi.AsyncBGGClient`)
+
+def _guild_params(guild_id, members):
+    try:
+        guild_id = int(guild_id)
+    except:
+        raise BGGValueError("invalid guild id")
+
+    return {"id": guild_id, "members": 1 if members else 0}
+
+
+def _user_params(name, buddies, guilds, hot, top, domain):
+    if not name:
+        raise BGGValueError("no user name specified")
+
+    if domain not in [BGGRestrictDomainTo.BOARD_GAME, BGGRestrictDomainTo.RPG, BGGRestrictDomainTo.VIDEO_GAME]:
+        raise BGGValueError("invalid domain")
+
+    return {"name": name,
+            "buddies": 1 if buddies else 0,
+            "guilds": 1 if guilds else 0,
+            "hot": 1 if hot else 0,
+            "top": 1 if top else 0,
+            "domain": domain}
+
+
+def _plays_params(name, game_id, min_date, max_date, subtype):
+    if not name and not game_id:
+        raise BGGValueError("no user name specified")
+
+    if name and game_id:
+        raise BGGValueError("can't retrieve by user and by game at the same time")
+
+    if subtype not in ["boardgame", "boardgameexpansion", "boardgameaccessory", "rpgitem", "videogame"]:
+        raise BGGValueError("invalid subtype")
+
+    params = {"subtype": subtype}
+
+    if name:
+        params["username"] = name
+    else:
+        try:
+            params["id"] = int(game_id)
+        except ValueError:
+            raise BGGValueError("invalid game id")
+
+    if min_date:
+        try:
+            params["mindate"] = min_date.isoformat()
+        except AttributeError:
+            raise BGGValueError("mindate must be a datetime.date object")
+
+    if max_date:
+        try:
+            params["maxdate"] = max_date.isoformat()
+        except AttributeError:
+            raise BGGValueError("maxdate must be a datetime.date object")
+
+    return params
+
+
+def _hot_items_params(item_type):
+    if item_type not in HOT_ITEM_CHOICES:
+        raise BGGValueError("invalid type specified")
+
+    return {"type": item_type}
+
+
+def _collection_params(user_name, subtype=BGGRestrictCollectionTo.BOARD_GAME, exclude_subtype=None, ids=None,
+                       versions=False, own=None, rated=None, played=None, commented=None, trade=None, want=None,
+                       wishlist=None, wishlist_prio=None, preordered=None, want_to_play=None, want_to_buy=None,
+                       prev_owned=None, has_parts=None, want_parts=None, min_rating=None, rating=None,
+                       min_bgg_rating=None, bgg_rating=None, min_plays=None, max_plays=None, collection_id=None,
+                       modified_since=None, fields=None):
+
+    if not user_name:
+        raise BGGValueError("no user name specified")
+
+    if subtype not in COLLECTION_SUBTYPES:
+        raise BGGValueError("invalid 'subtype'")
+
+    params={"username": user_name,
+            "subtype": subtype}
+
+    fields = _fields(fields, COLLECTION_ITEM_FIELDS)
+    if fields is None or not fields.isdisjoint(COLLECTION_STATS_FIELDS):
+        params["stats"] = 1
+
+    if fields is not None:
+        versions = "versions" in fields
+        if fields <= _BRIEF_COLLECTION_FIELDS:
+            params["brief"] = 1
+
+    if exclude_subtype is not None:
+        if exclude_subtype not in COLLECTION_SUBTYPES:
+            raise BGGValueError("invalid 'exclude_subtype'")
+
+        if subtype == exclude_subtype:
+            raise BGGValueError("incompatible 'subtype' and 'exclude_subtype'")
+
+        params["excludesubtype"] = exclude_subtype
+
+    if ids is not None:
+        params["id"] = ",".join(["{}".format(id_) for id_ in ids])
+
+    for param in ["versions", "own", "rated", "played", "trade", "want", "wishlist", "preordered"]:
+        p = locals()[param]
+        if p is not None:
+            params[param] = 1 if p else 0
+
+    if commented is not None:
+        params["comment"] = 1 if commented else 0
+
+    if wishlist_prio is not None:
+        if 1 <= wishlist_prio <= 5:
+            params["wishlishpriority"] = wishlist_prio
+        else:
+            raise BGGValueError("invalid 'wishlist_prio'")
+
+    if want_to_play is not None:
+        params["wanttoplay"] = 1 if want_to_play else 0
+
+    if want_to_buy is not None:
+        params["wanttobuy"] = 1 if want_to_buy else 0
+
+    if prev_owned is not None:
+        params["prevowned"] = 1 if prev_owned else 0
+
+    if has_parts is not None:
+        params["hasparts"] = 1 if has_parts else 0
+
+    if want_parts is not None:
+        params["wantparts"] = 1 if want_parts else 0
+
+    if min_rating is not None:
+        if 1.0 <= min_rating <= 10.0:
+            params["minrating"] = min_rating
+        else:
+            raise BGGValueError("invalid 'min_rating'")
+
+    if rating is not None:
+        if 1.0 <= rating <= 10.0:
+            params["rating"] = rating
+        else:
+            raise BGGValueError("invalid 'rating'")
+
+    if min_bgg_rating is not None:
+        if 1.0 <= min_bgg_rating <= 10.0:
+            params["minbggrating"] = min_bgg_rating
+        else:
+            raise BGGValueError("invalid 'bgg_min_rating'")
+
+    if bgg_rating is not None:
+        if 1.0 <= bgg_rating <= 10.0:
+            params["bggrating"] = bgg_rating
+        else:
+            raise BGGValueError("invalid 'bgg_rating'")
+
+    if collection_id is not None:
+        params["collid"] = collection_id
+
+    if modified_since is not None:
+        params["modifiedsince"] = modified_since
+
+    return params
+
+
+def _search_params(query, search_type, exact):
+    if not query:
+        raise BGGValueError("invalid query string")
+
+    if search_type is None:
+        search_type = [BGGRestrictGameSearchResultsTo.BOARD_GAME]
+
+    params = {"query": query}
+
+    for s in search_type:
+
+        values = [type_.value for l in [BGGRestrictGameSearchResultsTo, BGGRestrictFamilySearchResultsTo] for type_ in l]
+
+        log.debug(values)
+        if s not in values and s not in BGGRestrictGameSearchResultsTo and s not in BGGRestrictFamilySearchResultsTo:
+            raise BGGValueError("invalid search type: {}".format(search_type))
+
+    params["type"] = ",".join(s.value if s in BGGRestrictGameSearchResultsTo or s in BGGRestrictFamilySearchResultsTo else s for s in search_type)
+
+    if exact:
+        params["exact"] = 1
+
+    return params
+
+
+def _fields(fields, valid_fields):
+    """
+    Validates the values requested with the ``fields`` argument of an API call
+
+    :param fields: the requested values, ``None`` for all of them
+    :param frozenset valid_fields: the values which can be requested
+    :return: the requested values, as a frozenset, or ``None`` for all of them
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if some of the values are unknown
+    """
+    if fields is None:
+        return None
+
+    try:
+        fields = frozenset(fields)
+    except TypeError:
+        raise BGGValueError("invalid 'fields'")
+
+    unknown = fields - valid_fields
+    if unknown:
+        raise BGGValueError("invalid fields: {}".format(", ".join(sorted(unknown))))
+
+    return fields
+
+
+def _game_flags(fields, versions, videos):
+    """
+    Returns the ``versions`` and ``videos`` flags of a /thing call, which are only set for the requested values when
+    ``fields`` is set
+    """
+    if fields is None:
+        return bool(versions), bool(videos)
+    return "versions" in fields, "videos" in fields
+
+
+def _game_params(game_id, versions, videos, historical, marketplace, comments, rating_comments, fields=None):
+    params = {"id": game_id,
+              "versions": 1 if versions else 0,
+              "videos": 1 if videos else 0,
+              "historical": 1 if historical else 0,
+              "marketplace": 1 if marketplace else 0,
+              "comments": 1 if comments else 0,
+              "ratingcomments": 1 if rating_comments else 0,
+              "pagesize": 100,
+              "page": 1}
+    if fields is None or not fields.isdisjoint(_GAME_STATS_FIELDS):
+        params["stats"] = 1
+    return params
+
+
+def _game_list_ids(game_id_list):
+    """
+    Validates a list of game ids
+
+    :return: the list of unique ids, in the order in which they were first seen
+    """
+    if not game_id_list:
+        raise BGGError("List of Game Ids must be specified")
+
+    try:
+        game_ids = [int(game_id) for game_id in game_id_list]
+    except (TypeError, ValueError):
+        raise BGGValueError("invalid game id in list")
+
+    seen = set()
+    return [game_id for game_id in game_ids if not (game_id in seen or seen.add(game_id))]
+
+
+def _game_list_params(game_ids, versions, videos, historical, marketplace, fields=None):
+    params = {"id": ",".join([str(game_id) for game_id in game_ids]),
+              "versions": 1 if versions else 0,
+              "videos": 1 if videos else 0,
+              "historical": 1 if historical else 0,
+              "marketplace": 1 if marketplace else 0}
+    if fields is None or not fields.isdisjoint(_GAME_STATS_FIELDS):
+        params["stats"] = 1
+    return params
+
+
+def _object_key(endpoint, params, fields=None):
+    """
+    Returns the key under which the object built from a request is cached (see
+    :py:class:`boardgamegeek.cache.ObjectCache`)
+    """
+    key = endpoint, tuple(sorted(params.items()))
+    if fields is not None:
+        key += (tuple(sorted(fields)),)
+    return key
+
+
+def _hashable(value):
+    if isinstance(value, list):
+        return tuple(value)
+    if isinstance(value, set):
+        return frozenset(value)
+    return value
+
+
+def _negative_cached(method):
+    """
+    Decorator for the methods retrieving an item, failing fast when they're called again for an item which is known
+    not to exist (see :py:class:`boardgamegeek.cache.NegativeCache`). Calls are told apart by all their arguments, but
+    ``progress``.
+    """
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        if self._negative_cache is None:
+            return method(self, *args, **kwargs)
+
+        call_args = inspect.getcallargs(method, self, *args, **kwargs)
+        key = (method.__name__,) + tuple(sorted((name, _hashable(value)) for name, value in call_args.items()
+                                                if name not in ("self", "progress")))
+        self._negative_cache.check(key)
+
+        try:
+            return method(self, *args, **kwargs)
+        except BGGItemNotFoundError as e:
+            self._negative_cache.remember(key, e)
+            raise
+
+    return wrapper
+
+
+def _chunks(items, size):
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _create_games_from_xml(xml_root, lazy=False, fields=None):
+    """
+    Creates the games from a reply of the /thing API
+
+    :param bool lazy: create the board games as :py:class:`boardgamegeek.objects.games.LazyBoardGame`
+    :param fields: if set, only these values of the board games are read
+    :return: dictionary mapping the id of each game to the game
+    """
+    games = {}
+    for game_root in xml_root.findall("item"):
+        game_id = int(game_root.attrib["id"])
+        games[game_id] = create_game_from_xml(game_root, game_id=game_id, html_parser=html_parser, lazy=lazy,
+                                              fields=fields)
+    return games
+
+
+def _comments_params(game_id, rating_comments):
+    try:
+        game_id = int(game_id)
+    except:
+        raise BGGValueError("invalid game id")
+
+    return {"id": game_id, "ratingcomments" if rating_comments else "comments": 1, "pagesize": 100}
+
+
+def _choose_game_id(name, search_results, choose):
+    """
+    Selects a game id from a list of search results, for the choices that don't need additional data about the games
+
+    :return: the selected game id or ``None`` if additional data is needed (``BGGChoose.BEST_RANK``)
+    """
+    if not search_results:
+        raise BGGItemNotFoundError("can't find '{}'".format(name))
+
+    if choose == BGGChoose.FIRST:
+        return search_results[0].id
+    elif choose == BGGChoose.RECENT:
+        # choose the result with the biggest year
+        return max(search_results, key=lambda x: x.year if x.year is not None else -300000).id
+    elif choose == BGGChoose.NEAREST:
+        return max(search_results, key=lambda x: fuzz.token_set_ratio(name, x.name)).id
+
+    return None
+
+
+def _best_ranked_id(game_ids, ranks):
+    """
+    Selects the id of the best ranked game
+
+    :param list game_ids: the candidates, in order of preference for equally ranked games
+    :param dict ranks: the rank of each game (``None`` for unranked ones), as returned by
+                       :py:func:`boardgamegeek.loaders.get_game_ranks_from_xml`
+    """
+    def _rank(game_id):
+        rank = ranks.get(game_id)
+        return rank if rank is not None else 10000000000
+    return min(game_ids, key=_rank)
+
+
+# The functions below parse a single page of a paginated result, for the iterators which don't accumulate the items
+# (e.g. :py:meth:`BGGCommon.iter_plays`). Each page is loaded into an empty copy of the container returned for the
+# first page.
+
+def _page_guild_members(guild, xml_root):
+    page_guild = Guild(guild.data())
+    add_guild_members_from_xml(page_guild, xml_root)
+    return list(page_guild)
+
+
+def _page_plays(plays, xml_stream):
+    page_plays = plays.__class__(plays.data())
+    add_plays_from_xml_stream(page_plays, xml_stream)
+    return page_plays.plays
+
+
+def _page_comments(xml_root):
+    xml_root = xml_root.find("item")
+    if xml_root is None:
+        return []
+    comments, _ = get_game_comments_from_xml(xml_root)
+    return [BoardGameComment(comment) for comment in comments]
+
+
 class BGGCommon(object):
     """
     Base class for the BoardGameGeek websites APIs. All site-specific clients are derived from this.
@@ -118,8 +563,23 @@ class BGGCommon(object):
     :param float timeout: timeout for a request, in seconds
     :param int retries: how many retries to perform in special cases
     :param float retry_delay: delay between retries, in seconds
+    :param int requests_per_minute: how many requests per minute to allow, for each API endpoint
+    :param int requests_burst: how many requests can be sent back to back, for each API endpoint
+    :param dict endpoint_rate_limits: per endpoint ``(requests_per_minute, requests_burst)`` overrides, keyed by
+                                      endpoint name (e.g. ``{"collection": (10, 1)}``)
+    :param int workers: number of threads used for fetching data concurrently (e.g. the pages of a guild's
+                        members list). Concurrent requests are still subject to rate limiting. Use 1 to fetch
+                        everything sequentially
+    :param :py:class:`boardgamegeek.cache.ObjectCache` object_cache: if set, the objects created from the API
+                                                                     replies are cached here
+    :param :py:class:`boardgamegeek.cache.NegativeCache` negative_cache: if set, the requests for items which don't
+                                                                         exist are remembered here
+    :param parser: the XML parser backend, ``"lxml"``, ``"etree"`` or ``None`` for lxml when it's installed (see
+                   :py:func:`boardgamegeek.parsers.get_parser`)
     """
-    def __init__(self, api_endpoint, cache, timeout, retries, retry_delay, requests_per_minute):
+    def __init__(self, api_endpoint, cache, timeout, retries, retry_delay, requests_per_minute,
+                 requests_burst=DEFAULT_REQUESTS_BURST, endpoint_rate_limits=None, workers=DEFAULT_WORKERS,
+                 object_cache=None, negative_cache=None, parser=None):
         self._search_api_url = api_endpoint + "/search"
         self._thing_api_url = api_endpoint + "/thing"
         self._family_api_url = api_endpoint + "/family"
@@ -132,15 +592,178 @@ class BGGCommon(object):
             self._timeout = float(timeout)
             self._retries = int(retries)
             self._retry_delay = float(retry_delay)
+            self._workers = max(1, int(workers))
         except:
             raise BGGValueError
 
+        self._executor = None
+        self._poller = None
+        self._executor_lock = threading.Lock()
+        self._object_cache = object_cache
+        self._negative_cache = negative_cache
+        self._parser = get_parser(parser)
+
         if cache is None:
             cache = CacheBackendNone()
+        self._cache = cache
         self.requests_session = cache.cache
 
         # add the rate limiting adapter
-        self.requests_session.mount(api_endpoint, RateLimitingAdapter(rpm=requests_per_minute))
+        self.requests_session.mount(api_endpoint, RateLimitingAdapter(rpm=requests_per_minute,
+                                                                      burst=requests_burst,
+                                                                      endpoint_limits=endpoint_rate_limits))
+
+    @property
+    def workers(self):
+        """
+        :return: the number of threads used for fetching data concurrently
+        :rtype: integer
+        """
+        return self._workers
+
+    def _get_executor(self):
+        """
+        Returns the pool of worker threads used for concurrent requests, creating it on first use
+        """
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers)
+            return self._executor
+
+    def _get_poller(self):
+        """
+        Returns the poller used for the requests deferred by the server, creating it on first use
+        """
+        executor = self._get_executor()
+        with self._executor_lock:
+            if self._poller is None:
+                self._poller = DeferredRequestPoller(executor)
+            return self._poller
+
+    def cache_stats(self):
+        """
+        Returns the statistics of the HTTP cache: the hits, misses, stale responses served, evictions, bytes stored and
+        a histogram of the lookup times, for each API endpoint (see
+        :py:meth:`boardgamegeek.cache.CacheStats.snapshot`)
+
+        :return: the statistics, keyed by endpoint name (empty if caching is disabled)
+        :rtype: dict
+        """
+        return self._cache.stats()
+
+    def _get_cached_object(self, key):
+        """
+        Returns an object from the object cache, ``None`` if it's not there (or there's no object cache)
+        """
+        if self._object_cache is None:
+            return None
+        return self._object_cache.get(key)
+
+    def _cache_object(self, key, obj):
+        if self._object_cache is not None:
+            self._object_cache.set(key, obj)
+
+    def _fetch_page(self, url, params, page, item_tag=None):
+        """
+        Fetches a page of a paginated API call
+
+        :param str url: the address of the API call
+        :param dict params: parameters of the API call (the page number will be added to them)
+        :param int page: the page to fetch
+        :param str item_tag: if set, the page is downloaded but not parsed yet, a stream of the items with this tag
+                             is returned instead (see :py:class:`boardgamegeek.utils.XMLItemStream`)
+        :return: the parsed XML
+        """
+        log.debug("fetching page {} of {}".format(page, url))
+        page_params = dict(params)
+        page_params["page"] = page
+        if item_tag is not None:
+            return request_and_iterparse_xml(self.requests_session,
+                                             url,
+                                             item_tag,
+                                             params=page_params,
+                                             timeout=self._timeout,
+                                             retries=self._retries,
+                                             retry_delay=self._retry_delay,
+                                             stream=False,
+                                             parser=self._parser)
+
+        return request_and_parse_xml(self.requests_session,
+                                     url,
+                                     params=page_params,
+                                     timeout=self._timeout,
+                                     retries=self._retries,
+                                     retry_delay=self._retry_delay,
+                                     parser=self._parser)
+
+    def _fetch_pages(self, url, params, first_page, last_known_page, item_tag=None):
+        """
+        Generator returning the parsed XML of consecutive pages of a paginated API call, starting with ``first_page``.
+
+        Pages up to ``last_known_page`` are fetched concurrently by the worker pool (and returned in page order),
+        the ones after it are fetched one by one, on demand. Closing the generator cancels the requests for pages
+        which haven't been fetched yet.
+
+        :param str url: the address of the API call
+        :param dict params: parameters of the API call (the page number will be added to them)
+        :param int first_page: the first page to fetch
+        :param int last_known_page: the last page which is known to exist
+        :param str item_tag: see :py:meth:`_fetch_page`
+        """
+        page = first_page
+        if self._workers > 1 and last_known_page > first_page:
+            for xml_root in self._get_executor().map(lambda p: self._fetch_page(url, params, p, item_tag),
+                                                     range(first_page, last_known_page + 1)):
+                yield xml_root
+            page = last_known_page + 1
+
+        while True:
+            yield self._fetch_page(url, params, page, item_tag)
+            page += 1
+
+    def _iter_paged_items(self, url, params, xml_root, page_items, total_items=None, item_tag=None):
+        """
+        Generator returning the items of a paginated API call, one page at a time: only the current page is kept in
+        memory, while the next one is fetched in the background (unless ``workers`` is 1). Closing the generator
+        cancels the pending request, so stopping early doesn't fetch the remaining pages.
+
+        :param str url: the address of the API call
+        :param dict params: parameters of the API call (the page number will be added to them)
+        :param xml_root: the already fetched first page
+        :param callable page_items: callable returning the list of items parsed from a page
+        :param int total_items: number of items reported by the server. If ``None``, pages are fetched until an
+                                empty one is found
+        :param str item_tag: see :py:meth:`_fetch_page`
+        """
+        page = 1
+        count = 0
+        pending = None
+        try:
+            while True:
+                items = page_items(xml_root)
+                if not items:
+                    return
+
+                count += len(items)
+                page += 1
+                more = total_items is None or count < total_items
+                if more and self._workers > 1:
+                    pending = self._get_executor().submit(self._fetch_page, url, params, page, item_tag)
+
+                for item in items:
+                    yield item
+
+                if not more:
+                    return
+
+                if pending is not None:
+                    xml_root = pending.result()
+                    pending = None
+                else:
+                    xml_root = self._fetch_page(url, params, page, item_tag)
+        finally:
+            if pending is not None:
+                pending.cancel()
 
     def _get_id(self, name, game_types, choose):
         """
@@ -165,22 +788,58 @@ class BGGCommon(object):
         log.debug("getting game id for '{}'".format(name))
         res = self.search(name, search_type=game_types, exact=True)
 
-        if not res:
-            raise BGGItemNotFoundError("can't find '{}'".format(name))
+        game_id = _choose_game_id(name, res, choose)
+        if game_id is not None:
+            return game_id
+
+        # getting the best rank requires fetching the ranks of all games returned
+        game_ids = [r.id for r in res]
+        return _best_ranked_id(game_ids, self._get_game_ranks(game_ids))
+
+    def _get_game_ranks(self, game_ids):
+        """
+        Fetches the ranks of some games, in as few requests as possible (which are made concurrently). Only the ranks
+        are parsed out of the replies.
+
+        :param list game_ids: the ids of the games
+        :return: dictionary mapping each game id to its rank (``None`` if it's not ranked)
+        """
+        def _fetch_chunk(chunk):
+            xml_stream = request_and_iterparse_xml(self.requests_session,
+                                                   self._thing_api_url,
+                                                   "item",
+                                                   params={"id": ",".join([str(game_id) for game_id in chunk]),
+                                                           "stats": 1},
+                                                   timeout=self._timeout,
+                                                   retries=self._retries,
+                                                   retry_delay=self._retry_delay,
+                                                   parser=self._parser)
+            return get_game_ranks_from_xml(xml_stream)
+
+        return self._fetch_in_chunks(_fetch_chunk, _game_list_ids(game_ids))
+
+    def _fetch_in_chunks(self, fetch_chunk, game_ids):
+        """
+        Splits a list of ids in chunks of ``GAME_LIST_CHUNK_SIZE`` (the most the /thing API accepts in a call) and
+        fetches them concurrently
 
-        if choose == BGGChoose.FIRST:
-            return res[0].id
-        elif choose == BGGChoose.RECENT:
-            # choose the result with the biggest year
-            return max(res, key=lambda x: x.year if x.year is not None else -300000).id
-        elif choose == BGGChoose.NEAREST:
-            return max(res, key=lambda x: fuzz.token_set_ratio(name, x.name)).id
+        :param callable fetch_chunk: callable fetching a list of ids, returning a dictionary of results keyed by id
+        :param list game_ids: the ids
+        :return: the merged results
+        :rtype: dict
+        """
+        chunks = _chunks(game_ids, GAME_LIST_CHUNK_SIZE)
+        if len(chunks) > 1 and self._workers > 1:
+            results = self._get_executor().map(fetch_chunk, chunks)
         else:
-            # getting the best rank requires fetching the data of all games returned
-            game_data = [self.game(game_id=r.id) for r in res]
-            # ...and selecting the one with the best ranking
-            return min(game_data, key=lambda x: x.boardgame_rank if x.boardgame_rank is not None else 10000000000).id
+            results = map(fetch_chunk, chunks)
+
+        merged = {}
+        for chunk_results in results:
+            merged.update(chunk_results)
+        return merged
 
+    @_negative_cached
     def guild(self, guild_id, progress=None, members=True):
         """
         Retrieves details about a guild
@@ -197,22 +856,26 @@ class BGGCommon(object):
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
         """
 
-        try:
-            guild_id = int(guild_id)
-        except:
-            raise BGGValueError("invalid guild id")
+        params = _guild_params(guild_id, members)
+        guild_id = params["id"]
+
+        key = _object_key("guild", params)
+        guild = self._get_cached_object(key)
+        if guild is not None:
+            return guild
 
         xml_root = request_and_parse_xml(self.requests_session,
                                          self._guild_api_url,
-                                         params={"id": guild_id,
-                                                 "members": 1 if members else 0},
+                                         params=params,
                                          timeout=self._timeout,
                                          retries=self._retries,
-                                         retry_delay=self._retry_delay)
+                                         retry_delay=self._retry_delay,
+                                         parser=self._parser)
 
         guild = create_guild_from_xml(xml_root, html_parser)
 
         if not members:
+            self._cache_object(key, guild)
             return guild
 
         # Add the first page of members
@@ -224,28 +887,62 @@ class BGGCommon(object):
             return guild
 
         # Fetch the other pages of members
-        page = 1
-        while len(guild) < guild.members_count and added_member:
-            page += 1
-            log.debug("fetching guild members page {}".format(page))
-
-            xml_root = request_and_parse_xml(self.requests_session,
-                                             self._guild_api_url,
-                                             params={"id": guild_id, "members": 1, "page": page},
-                                             timeout=self._timeout,
-                                             retries=self._retries,
-                                             retry_delay=self._retry_delay)
+        pages = self._fetch_pages(self._guild_api_url,
+                                  {"id": guild_id, "members": 1},
+                                  first_page=2,
+                                  last_known_page=last_page(guild.members_count, len(guild)))
 
-            added_member = add_guild_members_from_xml(guild, xml_root)
+        completed = True
+        while len(guild) < guild.members_count and added_member:
+            added_member = add_guild_members_from_xml(guild, next(pages))
 
             try:
                 call_progress_cb(progress, len(guild), guild.members_count)
             except:
+                completed = False
                 break
 
+        pages.close()
+
+        if completed:
+            self._cache_object(key, guild)
+
         return guild
 
+    def iter_guild_members(self, guild_id):
+        """
+        Iterates over the names of the members of a guild. Unlike :py:meth:`guild`, the members aren't accumulated:
+        only the page being processed is kept in memory (while the next one is fetched in the background) and no
+        more pages are fetched once the iteration is stopped.
+
+        :param integer guild_id: the id number of the guild
+        :return: an iterator over the member names
+        :raises: :py:exc:`BGGValueError` in case of an invalid parameter(s)
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGItemNotFoundError` if the guild wasn't found
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after a short delay
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
+        """
+        params = _guild_params(guild_id, members=True)
+
+        xml_root = request_and_parse_xml(self.requests_session,
+                                         self._guild_api_url,
+                                         params=params,
+                                         timeout=self._timeout,
+                                         retries=self._retries,
+                                         retry_delay=self._retry_delay,
+                                         parser=self._parser)
+
+        guild = create_guild_from_xml(xml_root, html_parser)
+
+        return self._iter_paged_items(self._guild_api_url,
+                                      params,
+                                      xml_root,
+                                      page_items=lambda page_root: _page_guild_members(guild, page_root),
+                                      total_items=guild.members_count)
+
     # TODO: refactor
+    @_negative_cached
     def user(self, name, progress=None, buddies=True, guilds=True, hot=True, top=True, domain=BGGRestrictDomainTo.BOARD_GAME):
         """
         Retrieves details about an user
@@ -270,128 +967,72 @@ class BGGCommon(object):
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
         """
 
-        if not name:
-            raise BGGValueError("no user name specified")
+        params = _user_params(name, buddies, guilds, hot, top, domain)
 
-        if domain not in [BGGRestrictDomainTo.BOARD_GAME, BGGRestrictDomainTo.RPG, BGGRestrictDomainTo.VIDEO_GAME]:
-            raise BGGValueError("invalid domain")
-
-        params = {"name": name,
-                  "buddies": 1 if buddies else 0,
-                  "guilds": 1 if guilds else 0,
-                  "hot": 1 if hot else 0,
-                  "top": 1 if top else 0,
-                  "domain": domain}
+        key = _object_key("user", params)
+        user = self._get_cached_object(key)
+        if user is not None:
+            return user
 
         root = request_and_parse_xml(self.requests_session,
                                      self._user_api_url,
                                      params=params,
                                      timeout=self._timeout,
                                      retries=self._retries,
-                                     retry_delay=self._retry_delay)
+                                     retry_delay=self._retry_delay,
+                                     parser=self._parser)
 
-        # when the user is not found, the API returns an response, but with most fields empty. id is empty too
-        try:
-            data = {"name": root.attrib["name"],
-                    "id": int(root.attrib["id"])}
-        except (KeyError, ValueError):
-            raise BGGItemNotFoundError
-
-        for i in ["firstname", "lastname", "avatarlink",
-                  "stateorprovince", "country", "webaddress", "xboxaccount",
-                  "wiiaccount", "steamaccount", "psnaccount", "traderating"]:
-            data[i] = xml_subelement_attr(root, i)
-
-        data["yearregistered"] = xml_subelement_attr(root, "yearregistered", convert=int, quiet=True)
-        data["lastlogin"] = xml_subelement_attr(root,
-                                                "lastlogin",
-                                                convert=lambda x: datetime.datetime.strptime(x, "%Y-%m-%d"),
-                                                quiet=True)
-
-        # TODO: move add_top_item add_hot_item to sepparated files
-        user = User(data)
-
-        # add top items
-        if top:
-            for top_item in root.findall(".//top/item"):
-                user.add_top_item({"id": int(top_item.attrib["id"]),
-                                   "name": top_item.attrib["name"]})
-
-        # add hot items
-        if hot:
-            for hot_item in root.findall(".//hot/item"):
-                user.add_hot_item({"id": int(hot_item.attrib["id"]),
-                                   "name": hot_item.attrib["name"]})
+        user = create_user_from_xml(root)
 
         if not buddies and not guilds:
+            self._cache_object(key, user)
             return user
 
-        total_buddies = 0
-        total_guilds = 0
-
-        buddies = root.find("buddies")
-        if buddies is not None:
-            total_buddies = int(buddies.attrib["total"])
-            if total_buddies > 0:
-                # add the buddies from the first page
-                for buddy in buddies.findall(".//buddy"):
-                    user.add_buddy({"name": buddy.attrib["name"],
-                                    "id": buddy.attrib["id"]})
-
-        guilds = root.find("guilds")
-        if guilds is not None:
-            total_guilds = int(guilds.attrib["total"])
-            if total_guilds > 0:
-                # add the guilds from the first page
-                for guild in guilds.findall(".//guild"):
-                    user.add_guild({"name": guild.attrib["name"],
-                                    "id": guild.attrib["id"]})
+        # add the buddies and guilds from the first page
+        add_user_buddies_and_guilds_from_xml(user, root)
 
         # It seems that the BGG API can return more results than what's specified in the documentation (they say
         # page size is 100, but for an user with 114 friends, all buddies are there on the first page).
         # Therefore, we'll keep fetching pages until we reach the number of items we're expecting or we don't get
         # any more data
 
-        max_items_to_fetch = max(total_buddies, total_guilds)
+        max_items_to_fetch = max(get_user_buddies_and_guilds_totals_from_xml(root))
 
         try:
             call_progress_cb(progress, max(user.total_buddies, user.total_guilds), max_items_to_fetch)
         except:
             return user
 
+        pages = self._fetch_pages(self._user_api_url,
+                                  params,
+                                  first_page=2,
+                                  last_known_page=last_page(max_items_to_fetch,
+                                                            max(user.total_buddies, user.total_guilds)))
         page = 2
+        completed = True
         while max(user.total_buddies, user.total_guilds) < max_items_to_fetch:
-            added_buddy = False
-            added_guild = False
-            params["page"] = page
-            root = request_and_parse_xml(self.requests_session,
-                                         self._user_api_url,
-                                         params=params,
-                                         timeout=self._timeout)
-
-            for buddy in root.findall(".//buddy"):
-                user.add_buddy({"name": buddy.attrib["name"],
-                                "id": buddy.attrib["id"]})
-                added_buddy = True
-
-            for guild in root.findall(".//guild"):
-                user.add_guild({"name": guild.attrib["name"],
-                                "id": guild.attrib["id"]})
-                added_guild = True
+            added_items = add_user_buddies_and_guilds_from_xml(user, next(pages))
 
             try:
                 call_progress_cb(progress, max(user.total_buddies, user.total_guilds), max_items_to_fetch)
             except:
+                completed = False
                 break
 
-            page += 1
-
-            if not added_buddy and not added_guild:
+            if not added_items:
                 log.debug("didn't add any buddy/guild after fetching page {}, stopping here".format(page))
                 break
 
+            page += 1
+
+        pages.close()
+
+        if completed:
+            self._cache_object(key, user)
+
         return user
 
+    @_negative_cached
     def plays(self, name=None, game_id=None, progress=None, min_date=None, max_date=None, subtype=BGGRestrictPlaysTo.BOARD_GAME):
         """
         Retrieves the plays for an user (if using ``name``) or for a game (if using ``game_id``)
@@ -412,80 +1053,96 @@ class BGGCommon(object):
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
 
         """
-        if not name and not game_id:
-            raise BGGValueError("no user name specified")
+        params = _plays_params(name, game_id, min_date, max_date, subtype)
+        game_id = params.get("id")
 
-        if name and game_id:
-            raise BGGValueError("can't retrieve by user and by game at the same time")
-
-        if subtype not in ["boardgame", "boardgameexpansion", "boardgameaccessory", "rpgitem", "videogame"]:
-            raise BGGValueError("invalid subtype")
-
-        params = {"subtype": subtype}
-
-        if name:
-            params["username"] = name
-            game_id = None
-        else:
-            try:
-                params["id"] = int(game_id)
-            except ValueError:
-                raise BGGValueError("invalid game id")
-
-        if min_date:
-            try:
-                params["mindate"] = min_date.isoformat()
-            except AttributeError:
-                raise BGGValueError("mindate must be a datetime.date object")
-
-        if max_date:
-            try:
-                params["maxdate"] = max_date.isoformat()
-            except AttributeError:
-                raise BGGValueError("maxdate must be a datetime.date object")
+        key = _object_key("plays", params)
+        plays = self._get_cached_object(key)
+        if plays is not None:
+            return plays
 
-        xml_root = request_and_parse_xml(self.requests_session,
-                                         self._plays_api_url,
-                                         params=params,
-                                         timeout=self._timeout,
-                                         retries=self._retries,
-                                         retry_delay=self._retry_delay)
+        xml_stream = request_and_iterparse_xml(self.requests_session,
+                                               self._plays_api_url,
+                                               "play",
+                                               params=params,
+                                               timeout=self._timeout,
+                                               retries=self._retries,
+                                               retry_delay=self._retry_delay,
+                                               parser=self._parser)
 
-        plays = create_plays_from_xml(xml_root, game_id)
-        added_plays = add_plays_from_xml(plays, xml_root)
+        plays = create_plays_from_xml(xml_stream.root, game_id)
+        added_plays = add_plays_from_xml_stream(plays, xml_stream)
 
         try:
             call_progress_cb(progress, len(plays), plays.plays_count)
         except:
             return plays
 
-        page = 1
+        # The pages up to the reported number of plays are fetched concurrently, but since the BGG API doesn't seem
+        # to always report the total number of plays for games correctly, continue until we can't add anymore
+        pages = self._fetch_pages(self._plays_api_url,
+                                  params,
+                                  first_page=2,
+                                  last_known_page=last_page(plays.plays_count, len(plays)),
+                                  item_tag="play")
 
-        # Since the BGG API doesn't seem to report the total number of plays for games correctly (it's 0), just
-        # continue until we can't add anymore
+        completed = True
         while added_plays:
-            page += 1
-            log.debug("fetching page {} of plays".format(page))
-
-            params["page"] = page
-
-            # fetch the next pages of plays
-            xml_root = request_and_parse_xml(self.requests_session,
-                                             self._plays_api_url,
-                                             params=params,
-                                             timeout=self._timeout,
-                                             retries=self._retries,
-                                             retry_delay=self._retry_delay)
-
-            added_plays = add_plays_from_xml(plays, xml_root)
+            added_plays = add_plays_from_xml_stream(plays, next(pages))
 
             try:
                 call_progress_cb(progress, len(plays), plays.plays_count)
             except:
+                completed = False
                 break
 
+        pages.close()
+
+        if completed:
+            self._cache_object(key, plays)
+
         return plays
 
+    def iter_plays(self, name=None, game_id=None, min_date=None, max_date=None, subtype=BGGRestrictPlaysTo.BOARD_GAME):
+        """
+        Iterates over the plays of an user (if using ``name``) or of a game (if using ``game_id``). Unlike
+        :py:meth:`plays`, the play sessions aren't accumulated: only the page being processed is kept in memory
+        (while the next one is fetched in the background) and no more pages are fetched once the iteration is stopped.
+
+        :param str name: user name to retrieve the plays for
+        :param integer game_id: game id to retrieve the plays for
+        :param datetime.date min_date: return only plays of the specified date or later
+        :param datetime.date max_date: return only plays of the specified date or earlier
+        :param str subtype: limit plays results to the specified subtype.
+        :return: an iterator over the play sessions
+        :rtype: iterator of :py:class:`boardgamegeek.plays.PlaySession`
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of invalid parameter(s)
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGItemNotFoundError` if the user/game wasn't found
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after a short delay
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
+        """
+        params = _plays_params(name, game_id, min_date, max_date, subtype)
+
+        xml_stream = request_and_iterparse_xml(self.requests_session,
+                                               self._plays_api_url,
+                                               "play",
+                                               params=params,
+                                               timeout=self._timeout,
+                                               retries=self._retries,
+                                               retry_delay=self._retry_delay,
+                                               stream=False,
+                                               parser=self._parser)
+
+        plays = create_plays_from_xml(xml_stream.root, params.get("id"))
+
+        # the reported number of plays isn't reliable, keep going until an empty page
+        return self._iter_paged_items(self._plays_api_url,
+                                      params,
+                                      xml_stream,
+                                      page_items=lambda page_stream: _page_plays(plays, page_stream),
+                                      item_tag="play")
+
     def hot_items(self, item_type):
         """
         Return the list of "Hot Items"
@@ -502,28 +1159,34 @@ class BGGCommon(object):
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
         """
-        if item_type not in HOT_ITEM_CHOICES:
-            raise BGGValueError("invalid type specified")
+        params = _hot_items_params(item_type)
 
-        params = {"type": item_type}
+        key = _object_key("hot", params)
+        hot_items = self._get_cached_object(key)
+        if hot_items is not None:
+            return hot_items
 
         xml_root = request_and_parse_xml(self.requests_session,
                                          self._hot_api_url,
                                          params=params,
                                          timeout=self._timeout,
                                          retries=self._retries,
-                                         retry_delay=self._retry_delay)
+                                         retry_delay=self._retry_delay,
+                                         parser=self._parser)
 
         hot_items = create_hot_items_from_xml(xml_root)
         add_hot_items_from_xml(hot_items, xml_root)
 
+        self._cache_object(key, hot_items)
+
         return hot_items
 
+    @_negative_cached
     def collection(self, user_name, subtype=BGGRestrictCollectionTo.BOARD_GAME, exclude_subtype=None, ids=None, versions=False,
                    own=None, rated=None, played=None, commented=None, trade=None, want=None, wishlist=None,
                    wishlist_prio=None, preordered=None, want_to_play=None, want_to_buy=None, prev_owned=None,
                    has_parts=None, want_parts=None, min_rating=None, rating=None, min_bgg_rating=None, bgg_rating=None,
-                   min_plays=None, max_plays=None, collection_id=None, modified_since=None):
+                   min_plays=None, max_plays=None, collection_id=None, modified_since=None, fields=None):
         """
         Returns an user's game collection
 
@@ -554,7 +1217,10 @@ class BGGCommon(object):
         :param double bgg_rating: return items rated on BGG with a maximum of ``bgg_rating``
         :param int collection_id: restrict results to the collection specified by this id
         :param str modified_since: restrict results to those whose status (own, want, etc.) has been changed/added since ``modified_since``. Format: ``YY-MM-DD`` or ``YY-MM-DD HH:MM:SS``
-
+        :param fields: if set, only these values of the items are requested and read (e.g. ``{"name", "own"}``, see
+                       :py:data:`boardgamegeek.loaders.collection.COLLECTION_ITEM_FIELDS`), besides their ids and
+                       names. The statistics are only requested if some of the values read from them are needed,
+                       and the versions only if ``"versions"`` is requested (``versions`` is ignored)
 
         :return: ``Collection`` object
         :rtype: :py:class:`boardgamegeek.collection.Collection`
@@ -566,101 +1232,76 @@ class BGGCommon(object):
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
         """
 
-        # Parameter validation
-
-        if not user_name:
-            raise BGGValueError("no user name specified")
-
-        if subtype not in COLLECTION_SUBTYPES:
-            raise BGGValueError("invalid 'subtype'")
-
-        params={"username": user_name,
-                "subtype": subtype,
-                "stats": 1}
-
-        if exclude_subtype is not None:
-            if exclude_subtype not in COLLECTION_SUBTYPES:
-                raise BGGValueError("invalid 'exclude_subtype'")
-
-            if subtype == exclude_subtype:
-                raise BGGValueError("incompatible 'subtype' and 'exclude_subtype'")
-
-            params["excludesubtype"] = exclude_subtype
-
-        if ids is not None:
-            params["id"] = ",".join(["{}".format(id_) for id_ in ids])
-
-        for param in ["versions", "own", "rated", "played", "trade", "want", "wishlist", "preordered"]:
-            p = locals()[param]
-            if p is not None:
-                params[param] = 1 if p else 0
-
-        if commented is not None:
-            params["comment"] = 1 if commented else 0
+        params = _collection_params(user_name, subtype, exclude_subtype, ids, versions, own, rated, played,
+                                    commented, trade, want, wishlist, wishlist_prio, preordered, want_to_play,
+                                    want_to_buy, prev_owned, has_parts, want_parts, min_rating, rating,
+                                    min_bgg_rating, bgg_rating, min_plays, max_plays, collection_id, modified_since,
+                                    fields)
+        fields = _fields(fields, COLLECTION_ITEM_FIELDS)
 
-        if wishlist_prio is not None:
-            if 1 <= wishlist_prio <= 5:
-                params["wishlishpriority"] = wishlist_prio
-            else:
-                raise BGGValueError("invalid 'wishlist_prio'")
+        key = _object_key("collection", params, fields)
+        collection = self._get_cached_object(key)
+        if collection is not None:
+            return collection
 
-        if want_to_play is not None:
-            params["wanttoplay"] = 1 if want_to_play else 0
+        # large collections are parsed incrementally, so that only one item at a time is kept in the XML tree
+        xml_stream = request_and_iterparse_xml(self.requests_session,
+                                               self._collection_api_url,
+                                               "item",
+                                               params=params,
+                                               timeout=self._timeout,
+                                               retries=self._retries,
+                                               retry_delay=self._retry_delay,
+                                               parser=self._parser)
 
-        if want_to_buy is not None:
-            params["wanttobuy"] = 1 if want_to_buy else 0
-
-        if prev_owned is not None:
-            params["prevowned"] = 1 if prev_owned else 0
-
-        if has_parts is not None:
-            params["hasparts"] = 1 if has_parts else 0
-
-        if want_parts is not None:
-            params["wantparts"] = 1 if want_parts else 0
-
-        if min_rating is not None:
-            if 1.0 <= min_rating <= 10.0:
-                params["minrating"] = min_rating
-            else:
-                raise BGGValueError("invalid 'min_rating'")
-
-        if rating is not None:
-            if 1.0 <= rating <= 10.0:
-                params["rating"] = rating
-            else:
-                raise BGGValueError("invalid 'rating'")
-
-        if min_bgg_rating is not None:
-            if 1.0 <= min_bgg_rating <= 10.0:
-                params["minbggrating"] = min_bgg_rating
-            else:
-                raise BGGValueError("invalid 'bgg_min_rating'")
-
-        if bgg_rating is not None:
-            if 1.0 <= bgg_rating <= 10.0:
-                params["bggrating"] = bgg_rating
-            else:
-                raise BGGValueError("invalid 'bgg_rating'")
-
-        if collection_id is not None:
-            params["collid"] = collection_id
-
-        if modified_since is not None:
-            params["modifiedsince"] = modified_since
-
-        xml_root = request_and_parse_xml(self.requests_session,
-                                         self._collection_api_url,
-                                         params=params,
-                                         timeout=self._timeout,
-                                         retries=self._retries,
-                                         retry_delay=self._retry_delay)
+        collection = create_collection_from_xml_stream(xml_stream, user_name, subtype, fields=fields)
 
-        collection = create_collection_from_xml(xml_root, user_name)
-        add_collection_items_from_xml(collection, xml_root, subtype)
+        self._cache_object(key, collection)
 
         return collection
 
+    def prefetch_collections(self, user_names, **kwargs):
+        """
+        Requests the collections of several users at once, without waiting for them.
+
+        BGG replies to collection requests with HTTP 202 while it prepares the export. Instead of sleeping in the
+        calling thread (like :py:meth:`collection` does), these requests are queued and polled again in the background,
+        on a schedule shared by all of them, while the worker threads move on to other requests.
+
+        :param user_names: the names of the users whose collections are requested
+        :param kwargs: filters for the collections, same as the keyword arguments of :py:meth:`collection`
+        :return: dictionary mapping each user name to a :py:class:`concurrent.futures.Future` resolving to the user's
+                 :py:class:`boardgamegeek.collection.Collection` (or to the exception raised while fetching it, e.g.
+                 :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if the collection wasn't ready after the
+                 configured number of retries)
+        :rtype: dict
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of invalid parameter(s)
+        """
+        all_params = [_collection_params(user_name, **kwargs) for user_name in user_names]
+        fields = _fields(kwargs.get("fields"), COLLECTION_ITEM_FIELDS)
+
+        poller = self._get_poller()
+        futures = {}
+        for params in all_params:
+            futures[params["username"]] = poller.submit(self._collection_attempt(params, fields),
+                                                        retries=self._retries,
+                                                        retry_delay=self._retry_delay)
+        return futures
+
+    def _collection_attempt(self, params, fields=None):
+        def _attempt():
+            # no retries here, the poller takes care of them
+            xml_stream = request_and_iterparse_xml(self.requests_session,
+                                                   self._collection_api_url,
+                                                   "item",
+                                                   params=params,
+                                                   timeout=self._timeout,
+                                                   retries=0,
+                                                   parser=self._parser)
+
+            return create_collection_from_xml_stream(xml_stream, params["username"], params["subtype"], fields=fields)
+        return _attempt
+
     def search(self, query, search_type=None, exact=False):
         """
         Search for a game
@@ -676,46 +1317,17 @@ class BGGCommon(object):
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the API response was invalid or couldn't be parsed
         :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
         """
-        if not query:
-            raise BGGValueError("invalid query string")
-
-        if search_type is None:
-            search_type = [BGGRestrictGameSearchResultsTo.BOARD_GAME]
-
-        params = {"query": query}
-
-        for s in search_type:
-            
-            values = [type_.value for l in [BGGRestrictGameSearchResultsTo, BGGRestrictFamilySearchResultsTo] for type_ in l]
-            
-            log.debug(values)
-            if s not in values and s not in BGGRestrictGameSearchResultsTo and s not in BGGRestrictFamilySearchResultsTo:
-                raise BGGValueError("invalid search type: {}".format(search_type))
-
-        params["type"] = ",".join(s.value if s in BGGRestrictGameSearchResultsTo or s in BGGRestrictFamilySearchResultsTo else s for s in search_type)
-
-        if exact:
-            params["exact"] = 1
+        params = _search_params(query, search_type, exact)
 
         root = request_and_parse_xml(self.requests_session,
                                      self._search_api_url,
                                      params=params,
                                      timeout=self._timeout,
                                      retries=self._retries,
-                                     retry_delay=self._retry_delay)
-
-        results = []
-        for item in root.findall("item"):
-            kwargs = {"id": item.attrib["id"],
-                      "name": xml_subelement_attr(item, "name"),
-                      "yearpublished": xml_subelement_attr(item,
-                                                           "yearpublished",
-                                                           default=0,
-                                                           convert=int,
-                                                           quiet=True),
-                      "type": item.attrib["type"]}
+                                     retry_delay=self._retry_delay,
+                                     parser=self._parser)
 
-            results.append(SearchResult(kwargs))
+        results = create_search_results_from_xml(root)
 
         return sorted(results, key=lambda x: fuzz.token_set_ratio(query, x.name), reverse=True)
 
@@ -727,12 +1339,34 @@ class BGGClient(BGGCommon):
         Caching for the requests can be used by specifying an URI for the ``cache`` parameter. By default, an in-memory
         cache is used, with sqlite being the other currently supported option.
 
-        :param :py:class:`boardgamegeek.cache.CacheBackend` cache: An object to be used for caching the requests
+        :param :py:class:`boardgamegeek.cache.CacheBackend` cache: An object to be used for caching the requests. If
+                                                                   not set, the client gets its own in-memory cache;
+                                                                   ``None`` disables caching
         :param float timeout: Timeout for network operations, in seconds
         :param int retries: Number of retries to perform in case the API returns HTTP 202 (retry) or in case of timeouts
         :param float retry_delay: Time to sleep, in seconds, between retries when the API returns HTTP 202 (retry)
         :param disable_ssl: ignored, left for backwards compatibility
-        :param requests_per_minute: how many requests per minute to allow to go out to BGG (throttle prevention)
+        :param requests_per_minute: how many requests per minute to allow to go out to each BGG API endpoint (throttle
+                                    prevention)
+        :param requests_burst: how many requests can go out back to back to an API endpoint, after a period of
+                               inactivity
+        :param endpoint_rate_limits: per endpoint ``(requests_per_minute, requests_burst)`` overrides, keyed by the
+                                     endpoint name (e.g. ``{"collection": (10, 1)}``)
+        :param workers: number of threads used for fetching data concurrently, e.g. the pages of a guild's members
+                        list (1 fetches everything sequentially)
+        :param batch_window: if set, the games requested by :py:meth:`game` and :py:meth:`game_list` are held for this
+                             many seconds (e.g. ``0.005``), so that the requests made concurrently from several threads
+                             are merged into multi-id /thing calls. Requests for comments are never merged
+        :param object_cache: a :py:class:`boardgamegeek.cache.ObjectCache` for the created objects (games,
+                             collections, guilds, ...). A hit skips both the HTTP cache and the parsing of the reply
+        :param negative_cache: a :py:class:`boardgamegeek.cache.NegativeCache` remembering the items which weren't
+                               found (users, guilds, games), so that asking for them again fails right away
+        :param parser: the XML parser: ``"lxml"`` (several times faster), ``"etree"`` (the standard library's) or
+                       ``None`` to use lxml when it's installed, and the standard library otherwise
+        :param lazy_games: if ``True``, :py:meth:`game` and :py:meth:`game_list` return board games as
+                           :py:class:`boardgamegeek.objects.games.LazyBoardGame` objects, which decode each value from
+                           the XML when it's first used. Useful when loading many games and reading only some of their
+                           information
 
         Example usage::
 
@@ -742,16 +1376,98 @@ class BGGClient(BGGCommon):
             124742
             >>> bgg_no_cache = BGGClient(cache=CacheBackendNone())
             >>> bgg_sqlite_cache = BGGClient(cache=CacheBackendSqlite(path="/path/to/cache.db", ttl=3600))
+            >>> bgg_object_cache = BGGClient(object_cache=ObjectCache(max_size=5000, ttl=600))
+            >>> bgg_lazy = BGGClient(lazy_games=True)
 
     """
-    def __init__(self, cache=CacheBackendMemory(ttl=3600), timeout=15, retries=3, retry_delay=5, disable_ssl=False, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE):
+    def __init__(self, cache=_DEFAULT_CACHE, timeout=15, retries=3, retry_delay=5, disable_ssl=False,
+                 requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE, requests_burst=DEFAULT_REQUESTS_BURST,
+                 endpoint_rate_limits=None, workers=DEFAULT_WORKERS, batch_window=None, object_cache=None,
+                 negative_cache=None, parser=None, lazy_games=False):
+
+        # the cache owns the requests session the rate limiting adapter is mounted on, so every client needs its own
+        if cache is _DEFAULT_CACHE:
+            cache = CacheBackendMemory(ttl=3600)
 
         super(BGGClient, self).__init__(api_endpoint="https://www.boardgamegeek.com/xmlapi2",
                                         cache=cache,
                                         timeout=timeout,
                                         retries=retries,
                                         retry_delay=retry_delay,
-                                        requests_per_minute=requests_per_minute)
+                                        requests_per_minute=requests_per_minute,
+                                        requests_burst=requests_burst,
+                                        endpoint_rate_limits=endpoint_rate_limits,
+                                        workers=workers,
+                                        object_cache=object_cache,
+                                        negative_cache=negative_cache,
+                                        parser=parser)
+
+        self._lazy_games = bool(lazy_games)
+
+        self._batcher = None
+        if batch_window:
+            self._batcher = ThingBatcher(self._fetch_games, window=float(batch_window),
+                                         max_batch_size=GAME_LIST_CHUNK_SIZE, workers=self._workers)
+
+    def _fetch_games(self, game_ids, options):
+        """
+        Fetches some games with a single /thing call
+
+        :param list game_ids: the ids of the games (at most ``GAME_LIST_CHUNK_SIZE``)
+        :param tuple options: ``(versions, videos, historical, marketplace, fields)``
+        :return: dictionary mapping the id of each game returned by the server to the game
+        """
+        xml_root = request_and_parse_xml(self.requests_session,
+                                         self._thing_api_url,
+                                         params=_game_list_params(game_ids, *options),
+                                         timeout=self._timeout,
+                                         retries=self._retries,
+                                         retry_delay=self._retry_delay,
+                                         parser=self._parser)
+        if len(game_ids) > 1:
+            self._cache_game_items(xml_root, options)
+
+        return _create_games_from_xml(xml_root, lazy=self._lazy_games, fields=options[-1])
+
+    def _get_cached_games(self, game_ids, options):
+        """
+        Gets the games which are in the HTTP cache on their own, as the reply to a /thing call for a single id (which
+        might have been split out of the reply for several ids, see :py:meth:`_cache_game_items`)
+
+        :param list game_ids: the ids of the games
+        :param tuple options: ``(versions, videos, historical, marketplace, fields)``
+        :return: dictionary mapping the ids of the games found in the cache to the games
+        """
+        if not hasattr(self.requests_session, "cached_response"):
+            return {}
+
+        games = {}
+        for game_id in game_ids:
+            response = self.requests_session.cached_response(self._thing_api_url,
+                                                             _game_list_params([game_id], *options))
+            if response is None:
+                continue
+
+            try:
+                xml_root = self._parser.fromstring(response.content)
+            except self._parser.errors:
+                continue
+            games.update(_create_games_from_xml(xml_root, lazy=self._lazy_games, fields=options[-1]))
+
+        return games
+
+    def _cache_game_items(self, xml_root, options):
+        """
+        Caches each game from a reply of the /thing API separately, as if it was requested on its own, so that later
+        calls for different sets of ids can reuse it
+        """
+        if not hasattr(self.requests_session, "save_content"):
+            return
+
+        for item in xml_root.findall("item"):
+            self.requests_session.save_content(self._thing_api_url,
+                                               _game_list_params([int(item.attrib["id"])], *options),
+                                               b"<items>" + self._parser.tostring(item) + b"</items>")
 
     def get_game_id(self, name, choose=BGGChoose.FIRST):
         """
@@ -786,18 +1502,28 @@ class BGGClient(BGGCommon):
         return self._get_id(name, game_types=[game_type for game_type in BGGRestrictFamilySearchResultsTo], choose=choose)
 
     def game_list(self, game_id_list=[], versions=False,
-                  videos=False, historical=False, marketplace=False):
+                  videos=False, historical=False, marketplace=False, fields=None):
         """
         Get list of games by from a list of ids.
 
+        The BGG API only accepts a limited number of ids per call, so the list is split in chunks of
+        ``GAME_LIST_CHUNK_SIZE`` ids, which are fetched concurrently (still subject to rate limiting).
+
         :param list game_id_list:  List of game ids
         :param bool versions: include versions information
         :param bool videos: include videos
         :param bool historical: include historical data
         :param bool marketplace: include marketplace data
-        :return: list of ``BoardGame`` objects
+        :param fields: if set, only these values of the games are requested and read (e.g. ``{"name", "stats",
+                       "mechanics"}``, see :py:data:`boardgamegeek.loaders.game.BOARD_GAME_FIELDS`), besides their ids
+                       and names. The statistics are only requested if ``"stats"`` or ``"suggested_players"`` is
+                       requested, the versions and the videos only if they're requested (``versions`` and ``videos``
+                       are ignored)
+        :return: list of ``BoardGame`` objects, in the order of ``game_id_list``. The ids for which the server didn't
+                 return anything are marked by ``None``
         :rtype: list`
 
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of an invalid id
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekAPIRetryError`
             if this request should be retried after a short delay
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekAPIError`
@@ -806,42 +1532,45 @@ class BGGClient(BGGCommon):
             if there was a timeout
         """
 
-        if not game_id_list:
-            raise BGGError("List of Game Ids must be specified")
+        game_ids = _game_list_ids(game_id_list)
+        fields = _fields(fields, BOARD_GAME_FIELDS)
+        versions, videos = _game_flags(fields, versions, videos)
+        options = (versions, videos, bool(historical), bool(marketplace), fields)
 
-        log.debug("retrieving games {}".format(game_id_list,))
+        # the games are cached one by one, under the same keys as the ones retrieved with game()
+        keys = dict((game_id, _object_key("thing", _game_params(game_id, versions, videos, historical, marketplace,
+                                                                False, False, fields), fields))
+                    for game_id in game_ids)
 
-        params = {"id": ','.join([str(game_id) for game_id in game_id_list]),
-                  "versions": 1 if versions else 0,
-                  "videos": 1 if videos else 0,
-                  "historical": 1 if historical else 0,
-                  "marketplace": 1 if marketplace else 0,
-                  "stats": 1}
+        games = {}
+        for game_id in game_ids:
+            game = self._get_cached_object(keys[game_id])
+            if game is not None:
+                games[game_id] = game
+        missing_ids = [game_id for game_id in game_ids if game_id not in games]
 
-        xml_root = request_and_parse_xml(self.requests_session,
-                                         self._thing_api_url,
-                                         params=params,
-                                         timeout=self._timeout,
-                                         retries=self._retries,
-                                         retry_delay=self._retry_delay)
+        # then assemble what we can from the games in the HTTP cache, and only request the rest
+        fetched = self._get_cached_games(missing_ids, options)
+        missing_ids = [game_id for game_id in missing_ids if game_id not in fetched]
 
-        xml_root = xml_root.findall("item")
-        if xml_root is None:
-            msg = "invalid data for game ids: {}".format(game_id_list,)
-            raise BGGApiError(msg)
+        log.debug("retrieving {} games ({} cached)".format(len(game_ids), len(game_ids) - len(missing_ids)))
 
-        game_list = []
-        for i, game_root in enumerate(xml_root):
-            game = create_game_from_xml(game_root,
-                                        game_id=game_id_list[i],
-                                        html_parser=html_parser)
-            game_list.append(game)
+        if missing_ids and self._batcher is not None:
+            futures = [self._batcher.submit(game_id, options) for game_id in missing_ids]
+            fetched.update(zip(missing_ids, [future.result() for future in futures]))
+        elif missing_ids:
+            fetched.update(self._fetch_in_chunks(lambda chunk: self._fetch_games(chunk, options), missing_ids))
 
-        return game_list
+        for game_id, game in fetched.items():
+            if game is not None and game_id in keys:
+                self._cache_object(keys[game_id], game)
+                games[game_id] = game
 
+        return [games.get(int(game_id)) for game_id in game_id_list]
 
+    @_negative_cached
     def game(self, name=None, game_id=None, choose=BGGChoose.FIRST, versions=False, videos=False, historical=False,
-             marketplace=False, comments=False, rating_comments=False, progress=None):
+             marketplace=False, comments=False, rating_comments=False, progress=None, fields=None):
         """
         Get information about a game.
 
@@ -856,10 +1585,16 @@ class BGGClient(BGGCommon):
         :param bool comments: include comments
         :param bool rating_comments: include comments with rating (ignored in favor of ``comments``, if that is true)
         :param callable progress: callable for reporting progress if fetching comments
+        :param fields: if set, only these values of the games are requested and read (e.g. ``{"name", "stats",
+                       "mechanics"}``, see :py:data:`boardgamegeek.loaders.game.BOARD_GAME_FIELDS`), besides their ids
+                       and names. The statistics are only requested if ``"stats"`` or ``"suggested_players"`` is
+                       requested, the versions and the videos only if they're requested (``versions`` and ``videos``
+                       are ignored)
         :return: ``BoardGame`` object
         :rtype: :py:class:`boardgamegeek.games.BoardGame`
 
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekError` in case of invalid name or game_id
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGItemNotFoundError` if the game wasn't found
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekAPIRetryError` if this request should be retried after a
                  short delay
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekAPIError` if the response couldn't be parsed
@@ -869,6 +1604,9 @@ class BGGClient(BGGCommon):
         if not name and game_id is None:
             raise BGGError("game name or id not specified")
 
+        fields = _fields(fields, BOARD_GAME_FIELDS)
+        versions, videos = _game_flags(fields, versions, videos)
+
         if game_id is None:
             game_id = self.get_game_id(name, choose=choose)
             if game_id is None:
@@ -876,34 +1614,52 @@ class BGGClient(BGGCommon):
 
         log.debug("retrieving game id {}{}".format(game_id, " ({})".format(name) if name is not None else ""))
 
-        params = {"id": game_id,
-                  "versions": 1 if versions else 0,
-                  "videos": 1 if videos else 0,
-                  "historical": 1 if historical else 0,
-                  "marketplace": 1 if marketplace else 0,
-                  "comments": 1 if comments else 0,
-                  "ratingcomments": 1 if rating_comments else 0,
-                  "pagesize": 100,
-                  "page": 1,
-                  "stats": 1}
+        params = _game_params(game_id, versions, videos, historical, marketplace, comments, rating_comments, fields)
 
-        xml_root = request_and_parse_xml(self.requests_session,
-                                         self._thing_api_url,
-                                         params=params,
-                                         timeout=self._timeout,
-                                         retries=self._retries,
-                                         retry_delay=self._retry_delay)
+        key = _object_key("thing", params, fields)
+        game = self._get_cached_object(key)
+        if game is not None:
+            return game
 
-        xml_root = xml_root.find("item")
+        options = (versions, videos, bool(historical), bool(marketplace), fields)
+
+        if not comments:
+            # the game might be in the HTTP cache from an earlier game_list() call
+            game = self._get_cached_games([game_id], options).get(_game_list_ids([game_id])[0])
+
+            if game is None and self._batcher is not None:
+                game = self._batcher.submit(_game_list_ids([game_id])[0], options).result()
+                if game is None:
+                    msg = "invalid data for game id: {}{}".format(game_id, "" if name is None else " ({})".format(name))
+                    raise _BGGMissingItemError(msg)
+
+            if game is not None:
+                self._cache_object(key, game)
+                return game
+
+        reply_root = request_and_parse_xml(self.requests_session,
+                                           self._thing_api_url,
+                                           params=params,
+                                           timeout=self._timeout,
+                                           retries=self._retries,
+                                           retry_delay=self._retry_delay,
+                                           parser=self._parser)
+
+        xml_root = reply_root.find("item")
         if xml_root is None:
             msg = "invalid data for game id: {}{}".format(game_id, "" if name is None else " ({})".format(name))
-            raise BGGApiError(msg)
+            raise _BGGMissingItemError(msg)
 
         game = create_game_from_xml(xml_root,
                                     game_id=game_id,
-                                    html_parser=html_parser)
+                                    html_parser=html_parser,
+                                    lazy=self._lazy_games,
+                                    fields=fields)
 
         if not comments:
+            # make it available to game_list() too
+            self._cache_game_items(reply_root, options)
+            self._cache_object(key, game)
             return game
 
         added_items, total = add_game_comments_from_xml(game, xml_root)
@@ -913,26 +1669,69 @@ class BGGClient(BGGCommon):
         except:
             return game
 
-        page = 1
-        while added_items and len(game.comments) < total:
-            page += 1
+        pages = self._fetch_pages(self._thing_api_url,
+                                  {"id": game_id, "pagesize": 100, "comments": 1},
+                                  first_page=2,
+                                  last_known_page=last_page(total, len(game.comments)))
 
-            xml_root = request_and_parse_xml(self.requests_session,
-                                             self._thing_api_url,
-                                             params={"id": game_id,
-                                                     "pagesize": 100,
-                                                     "comments": 1,
-                                                     "page": page})
+        completed = True
+        while added_items and len(game.comments) < total:
+            xml_root = next(pages).find("item")
+            if xml_root is None:
+                break
 
-            added_items = add_game_comments_from_xml(game, xml_root)
+            added_items, _ = add_game_comments_from_xml(game, xml_root)
 
             try:
-                call_progress_cb(progress, len(game), game.comments)
+                call_progress_cb(progress, len(game.comments), total)
             except:
+                completed = False
                 break
 
+        pages.close()
+
+        if completed:
+            self._cache_object(key, game)
+
         return game
 
+    def iter_comments(self, game_id, rating_comments=False):
+        """
+        Iterates over the comments of a game. Only the page being processed is kept in memory (while the next one is
+        fetched in the background) and no more pages are fetched once the iteration is stopped.
+
+        :param integer game_id: the id of the game
+        :param bool rating_comments: if ``True``, also return the ratings without a comment
+        :return: an iterator over the comments
+        :rtype: iterator of :py:class:`boardgamegeek.objects.games.BoardGameComment`
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` in case of an invalid game id
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGItemNotFoundError` if the game wasn't found
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if this request should be retried after a short delay
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the response couldn't be parsed
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGApiTimeoutError` if there was a timeout
+        """
+        params = _comments_params(game_id, rating_comments)
+
+        xml_root = request_and_parse_xml(self.requests_session,
+                                         self._thing_api_url,
+                                         params=params,
+                                         timeout=self._timeout,
+                                         retries=self._retries,
+                                         retry_delay=self._retry_delay,
+                                         parser=self._parser)
+
+        item = xml_root.find("item")
+        if item is None:
+            raise BGGItemNotFoundError("invalid game id: {}".format(game_id))
+
+        _, total = get_game_comments_from_xml(item)
+
+        return self._iter_paged_items(self._thing_api_url,
+                                      params,
+                                      xml_root,
+                                      page_items=_page_comments,
+                                      total_items=total)
+
     def games(self, name):
         """
         Return a list containing all games with the given name
@@ -943,11 +1742,16 @@ class BGGClient(BGGCommon):
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekAPIError` if the response couldn't be parsed
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekTimeoutError` if there was a timeout
         """
-        return [self.game(game_id=s.id)
-                for s in self.search(name,
-                                     search_type=[game_type for game_type in BGGRestrictGameSearchResultsTo],
-                                     exact=True)]
+        results = self.search(name,
+                              search_type=[game_type for game_type in BGGRestrictGameSearchResultsTo],
+                              exact=True)
+        if not results:
+            return []
 
+        # fetch all the games in as few requests as possible
+        return [game for game in self.game_list([s.id for s in results]) if game is not None]
+
+    @_negative_cached
     def family(self, name=None, family_id=None, choose=BGGChoose.FIRST, versions=False, videos=False, historical=False,
              marketplace=False, comments=False, rating_comments=False, progress=None):
         """
@@ -968,6 +1772,7 @@ class BGGClient(BGGCommon):
         :rtype: :py:class:`boardgamegeek.games.BoardGame`
 
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekError` in case of invalid name or game_id
+        :raises: :py:exc:`boardgamegeek.exceptions.BGGItemNotFoundError` if the family wasn't found
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekAPIRetryError` if this request should be retried after a
                  short delay
         :raises: :py:exc:`boardgamegeek.exceptions.BoardGameGeekAPIError` if the response couldn't be parsed
@@ -995,23 +1800,30 @@ class BGGClient(BGGCommon):
                   "page": 1,
                   "stats": 1}
 
+        key = _object_key("family", params)
+        family = self._get_cached_object(key)
+        if family is not None:
+            return family
+
         xml_root = request_and_parse_xml(self.requests_session,
                                          self._family_api_url,
                                          params=params,
                                          timeout=self._timeout,
                                          retries=self._retries,
-                                         retry_delay=self._retry_delay)
+                                         retry_delay=self._retry_delay,
+                                         parser=self._parser)
 
         xml_root = xml_root.find("item")
         if xml_root is None:
-            msg = "invalid data for game id: {}{}".format(family_id, "" if name is None else " ({})".format(name))
-            raise BGGApiError(msg)
+            msg = "invalid data for family id: {}{}".format(family_id, "" if name is None else " ({})".format(name))
+            raise _BGGMissingItemError(msg)
 
         family = create_family_from_xml(xml_root,
                                     family_id=family_id,
                                     html_parser=html_parser)
                                     
         if not comments:
+            self._cache_object(key, family)
             return family
 
         added_items, total = add_game_comments_from_xml(family, xml_root)
@@ -1030,7 +1842,8 @@ class BGGClient(BGGCommon):
                                              params={"id": game_id,
                                                      "pagesize": 100,
                                                      "comments": 1,
-                                                     "page": page})
+                                                     "page": page},
+                                                     parser=self._parser)
 
             added_items = add_game_comments_from_xml(family, xml_root)
 
@@ -0,0 +1,761 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.asyncapi` - asyncio client
+==============================================
+
+This module contains an asyncio based client with the same interface as :py:class:`boardgamegeek.api.BGGClient`,
+for applications which need to make lots of concurrent requests without blocking a thread for each of them. It
+requires Python 3.6+ and aiohttp_.
+
+Rate limiting and the delays used for retrying calls are non-blocking, so a single event loop can wait on lots of
+requests at once.
+
+.. _aiohttp: https://aiohttp.readthedocs.io
+
+.. module:: boardgamegeek.asyncapi
+   :platform: Unix, Windows
+   :synopsis: asyncio based client for the BoardGameGeek API
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+"""
+import asyncio
+import io
+import logging
+import xml.etree.ElementTree as ET
+from xml.etree.ElementTree import ParseError as ETParseError
+
+import aiohttp
+from fuzzywuzzy import fuzz
+
+from .api import BGGChoose, BGGRestrictDomainTo, BGGRestrictPlaysTo, BGGRestrictCollectionTo
+from .api import BGGRestrictGameSearchResultsTo, BGGRestrictFamilySearchResultsTo
+from .api import call_progress_cb, last_page, html_parser
+from .api import _guild_params, _user_params, _plays_params, _hot_items_params, _collection_params, _search_params
+from .api import _game_params, _comments_params, _choose_game_id, _best_ranked_id
+from .api import _game_list_ids, _game_list_params, _chunks, _create_games_from_xml, GAME_LIST_CHUNK_SIZE
+from .api import _page_guild_members, _page_plays, _page_comments, _fields, _game_flags, DEFAULT_WORKERS
+from .exceptions import BGGApiError, BGGApiRetryError, BGGApiTimeoutError, BGGError, BGGItemNotFoundError
+from .exceptions import BGGValueError, _BGGMissingItemError
+from .utils import RateLimiter, XMLItemStream, DEFAULT_REQUESTS_PER_MINUTE, DEFAULT_REQUESTS_BURST
+
+from .loaders import create_guild_from_xml, add_guild_members_from_xml
+from .loaders import create_plays_from_xml, add_plays_from_xml_stream
+from .loaders import create_hot_items_from_xml, add_hot_items_from_xml
+from .loaders import create_collection_from_xml_stream
+from .loaders import create_game_from_xml, add_game_comments_from_xml, get_game_comments_from_xml
+from .loaders import get_game_ranks_from_xml
+from .loaders import create_family_from_xml
+from .loaders import create_user_from_xml, add_user_buddies_and_guilds_from_xml
+from .loaders import get_user_buddies_and_guilds_totals_from_xml
+from .loaders import create_search_results_from_xml
+from .loaders.collection import COLLECTION_ITEM_FIELDS
+from .loaders.game import BOARD_GAME_FIELDS
+
+
+log = logging.getLogger("boardgamegeek.asyncapi")
+
+
+async def get_xml_body(session, rate_limiter, url, params=None, timeout=15, retries=3, retry_delay=5):
+    """
+    Sends a request to the BGG API, retrying it if needed, and returns the body of the response. This is the asyncio
+    counterpart of :py:func:`boardgamegeek.utils.get_xml_response`.
+
+    :param session: an :py:class:`aiohttp.ClientSession`, used to fetch the url
+    :param rate_limiter: the :py:class:`boardgamegeek.utils.RateLimiter` used for throttling the requests
+    :param url: the address where to get the XML from
+    :param params: dictionary containing the parameters which should be sent with the request
+    :param timeout: number of seconds after which the request times out
+    :param retries: number of retries to perform in case of timeout
+    :param retry_delay: the amount of seconds to sleep when retrying an API call that returned 202
+    :return: the XML
+    :rtype: bytes
+    :raises: :py:class:`BGGApiRetryError` if this request should be retried after a short delay
+    :raises: :py:class:`BGGApiError` if the response was invalid
+    :raises: :py:class:`BGGApiTimeoutError` if there was a timeout
+    """
+
+    # aiohttp only accepts strings (and ints) as query parameters
+    if params is not None:
+        params = {k: str(v) for k, v in params.items()}
+
+    retr = retries
+
+    # retry loop
+    while retr >= 0:
+        retr -= 1
+        try:
+            need_to_wait = rate_limiter.reserve(url)
+            if need_to_wait > 0:
+                await asyncio.sleep(need_to_wait)
+
+            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as r:
+
+                if r.status == 202:
+                    if retries == 0:
+                        # (BoardGameGeek API says that on status code 202 the call should be retried after a delay)
+                        raise BGGApiRetryError
+                    elif retr == 0:
+                        raise BGGApiRetryError("failed to retrieve data after {} retries".format(retries))
+                    else:
+                        log.debug("API call will be retried in {} seconds ({} more retries)".format(retry_delay, retr))
+                        if retr >= 0:
+                            await asyncio.sleep(retry_delay)
+                            retry_delay *= 1.5
+                        continue
+                elif r.status == 503:
+                    log.warning("API returned 503, retrying")
+                    if retr >= 0:
+                        await asyncio.sleep(retry_delay)
+                        retry_delay *= 3
+                    continue
+
+                if not r.headers.get("content-type", "").lower().startswith("text/xml"):
+                    raise BGGApiError("non-XML reply")
+
+                return await r.read()
+
+        except asyncio.TimeoutError:
+            if retries == 0:
+                raise BGGApiTimeoutError
+            elif retr == 0:
+                raise BGGApiTimeoutError("failed to retrieve data after {} retries".format(retries))
+            else:
+                log.debug("API request timeout, retrying {} more times w/timeout {}".format(retr, timeout))
+                timeout *= 2.5
+                continue
+
+        except (BGGApiRetryError, BGGApiTimeoutError, BGGApiError):
+            raise
+
+        except Exception as e:
+            raise BGGApiError("error fetching BGG API response: {}".format(e))
+
+    raise BGGApiError("couldn't fetch data within the configured number of retries")
+
+
+async def request_and_parse_xml(session, rate_limiter, url, params=None, timeout=15, retries=3, retry_delay=5):
+    """
+    Downloads an XML from the specified url, parses it and returns the xml ElementTree. This is the asyncio
+    counterpart of :py:func:`boardgamegeek.utils.request_and_parse_xml`, see :py:func:`get_xml_body` for the
+    parameters.
+
+    :return: :py:func:`xml.etree.ElementTree` corresponding to the XML
+    :raises: :py:class:`BGGApiError` if the response was invalid or couldn't be parsed
+    """
+    xml = await get_xml_body(session, rate_limiter, url, params=params, timeout=timeout, retries=retries,
+                             retry_delay=retry_delay)
+    try:
+        return ET.fromstring(xml)
+    except ETParseError as e:
+        raise BGGApiError("error decoding BGG API response: {}".format(e))
+
+
+async def request_and_iterparse_xml(session, rate_limiter, url, item_tag, params=None, timeout=15, retries=3,
+                                    retry_delay=5):
+    """
+    Downloads an XML from the specified url and returns a :py:class:`boardgamegeek.utils.XMLItemStream` for parsing
+    it incrementally, without building the whole tree. This is the asyncio counterpart of
+    :py:func:`boardgamegeek.utils.request_and_iterparse_xml`, see :py:func:`get_xml_body` for the parameters.
+
+    :param str item_tag: the tag of the items (children of the root element) returned by the stream
+    :rtype: :py:class:`boardgamegeek.utils.XMLItemStream`
+    :raises: :py:class:`BGGApiError` if the response was invalid or couldn't be parsed
+    """
+    xml = await get_xml_body(session, rate_limiter, url, params=params, timeout=timeout, retries=retries,
+                             retry_delay=retry_delay)
+    return XMLItemStream(io.BytesIO(xml), item_tag)
+
+
+class AsyncBGGCommon(object):
+    """
+    Base class for the asyncio clients of the BoardGameGeek websites APIs.
+
+    The :py:class:`aiohttp.ClientSession` used for the requests is created on first use; call :py:meth:`close` (or
+    use the client as an asynchronous context manager) to release it.
+
+    :param str api_endpoint: URL of the API
+    :param float timeout: timeout for a request, in seconds
+    :param int retries: how many retries to perform in special cases
+    :param float retry_delay: delay between retries, in seconds
+    :param int requests_per_minute: how many requests per minute to allow, for each API endpoint
+    :param int requests_burst: how many requests can be sent back to back, for each API endpoint
+    :param dict endpoint_rate_limits: per endpoint ``(requests_per_minute, requests_burst)`` overrides
+    :param int workers: how many requests for the pages of a paginated call (or for the chunks of a long list of
+                        games) are in flight at once. Use 1 to fetch them sequentially
+    """
+    def __init__(self, api_endpoint, timeout, retries, retry_delay, requests_per_minute,
+                 requests_burst=DEFAULT_REQUESTS_BURST, endpoint_rate_limits=None, workers=DEFAULT_WORKERS):
+        self._search_api_url = api_endpoint + "/search"
+        self._thing_api_url = api_endpoint + "/thing"
+        self._family_api_url = api_endpoint + "/family"
+        self._guild_api_url = api_endpoint + "/guild"
+        self._user_api_url = api_endpoint + "/user"
+        self._plays_api_url = api_endpoint + "/plays"
+        self._hot_api_url = api_endpoint + "/hot"
+        self._collection_api_url = api_endpoint + "/collection"
+        try:
+            self._timeout = float(timeout)
+            self._retries = int(retries)
+            self._retry_delay = float(retry_delay)
+            self._workers = max(1, int(workers))
+        except:
+            raise BGGValueError
+
+        self.rate_limiter = RateLimiter(rpm=requests_per_minute,
+                                        burst=requests_burst,
+                                        endpoint_limits=endpoint_rate_limits)
+        self._session = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def close(self):
+        """
+        Closes the HTTP session used by this client
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _request(self, url, params, retries=None, retry_delay=None, item_tag=None):
+        """
+        Fetches and parses an XML. If ``item_tag`` is set, a :py:class:`boardgamegeek.utils.XMLItemStream` of the
+        items with this tag is returned instead of the tree
+        """
+        if self._session is None:
+            self._session = aiohttp.ClientSession()
+
+        kwargs = {"params": params,
+                  "timeout": self._timeout,
+                  "retries": self._retries if retries is None else retries,
+                  "retry_delay": self._retry_delay if retry_delay is None else retry_delay}
+
+        if item_tag is not None:
+            return await request_and_iterparse_xml(self._session, self.rate_limiter, url, item_tag, **kwargs)
+
+        return await request_and_parse_xml(self._session, self.rate_limiter, url, **kwargs)
+
+    async def _fetch_pages(self, url, params, first_page, last_known_page, item_tag=None):
+        """
+        Asynchronous generator returning the parsed XML of consecutive pages of a paginated API call. See
+        :py:meth:`boardgamegeek.api.BGGCommon._fetch_pages`
+        """
+        def _page_params(page):
+            page_params = dict(params)
+            page_params["page"] = page
+            return page_params
+
+        page = first_page
+        if last_known_page > first_page:
+            # same as the worker pool of the threaded client: at most ``workers`` pages are fetched at once
+            semaphore = asyncio.Semaphore(self._workers)
+
+            async def _fetch_page(p):
+                async with semaphore:
+                    return await self._request(url, _page_params(p), item_tag=item_tag)
+
+            tasks = [asyncio.ensure_future(_fetch_page(p)) for p in range(first_page, last_known_page + 1)]
+            try:
+                for task in tasks:
+                    yield await task
+            finally:
+                for task in tasks:
+                    task.cancel()
+            page = last_known_page + 1
+
+        while True:
+            yield await self._request(url, _page_params(page), item_tag=item_tag)
+            page += 1
+
+    async def _iter_paged_items(self, url, params, xml_root, page_items, total_items=None, item_tag=None):
+        """
+        Asynchronous generator returning the items of a paginated API call, one page at a time. See
+        :py:meth:`boardgamegeek.api.BGGCommon._iter_paged_items`
+        """
+        page = 1
+        count = 0
+        pending = None
+        try:
+            while True:
+                items = page_items(xml_root)
+                if not items:
+                    return
+
+                count += len(items)
+                page += 1
+                more = total_items is None or count < total_items
+                if more:
+                    page_params = dict(params)
+                    page_params["page"] = page
+                    pending = asyncio.ensure_future(self._request(url, page_params, item_tag=item_tag))
+
+                for item in items:
+                    yield item
+
+                if not more:
+                    return
+
+                xml_root = await pending
+                pending = None
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def _get_id(self, name, game_types, choose):
+        """
+        Returns the BGG ID of a game, searching by name. See :py:meth:`boardgamegeek.api.BGGCommon._get_id`
+        """
+        if choose not in [BGGChoose.FIRST, BGGChoose.RECENT, BGGChoose.BEST_RANK, BGGChoose.NEAREST]:
+            raise BGGValueError("invalid value for parameter 'choose': {}".format(choose))
+
+        log.debug("getting game id for '{}'".format(name))
+        res = await self.search(name, search_type=game_types, exact=True)
+
+        game_id = _choose_game_id(name, res, choose)
+        if game_id is not None:
+            return game_id
+
+        # getting the best rank requires fetching the ranks of all games returned
+        game_ids = [r.id for r in res]
+        return _best_ranked_id(game_ids, await self._get_game_ranks(game_ids))
+
+    async def _get_game_ranks(self, game_ids):
+        """
+        Fetches the ranks of some games. See :py:meth:`boardgamegeek.api.BGGCommon._get_game_ranks`
+        """
+        async def _fetch_chunk(chunk):
+            xml_stream = await self._request(self._thing_api_url,
+                                             {"id": ",".join([str(game_id) for game_id in chunk]), "stats": 1},
+                                             item_tag="item")
+            return get_game_ranks_from_xml(xml_stream)
+
+        return await self._fetch_in_chunks(_fetch_chunk, _game_list_ids(game_ids))
+
+    async def _fetch_in_chunks(self, fetch_chunk, game_ids):
+        """
+        Fetches the chunks of a list of ids concurrently. See :py:meth:`boardgamegeek.api.BGGCommon._fetch_in_chunks`
+        """
+        semaphore = asyncio.Semaphore(self._workers)
+
+        async def _fetch_chunk(chunk):
+            async with semaphore:
+                return await fetch_chunk(chunk)
+
+        merged = {}
+        for chunk_results in await asyncio.gather(*[_fetch_chunk(chunk)
+                                                    for chunk in _chunks(game_ids, GAME_LIST_CHUNK_SIZE)]):
+            merged.update(chunk_results)
+        return merged
+
+    async def guild(self, guild_id, progress=None, members=True):
+        """
+        Retrieves details about a guild. See :py:meth:`boardgamegeek.api.BGGCommon.guild`
+        """
+        params = _guild_params(guild_id, members)
+        guild_id = params["id"]
+
+        xml_root = await self._request(self._guild_api_url, params)
+
+        guild = create_guild_from_xml(xml_root, html_parser)
+
+        if not members:
+            return guild
+
+        # Add the first page of members
+        added_member = add_guild_members_from_xml(guild, xml_root)
+
+        try:
+            call_progress_cb(progress, len(guild), guild.members_count)
+        except:
+            return guild
+
+        # Fetch the other pages of members
+        pages = self._fetch_pages(self._guild_api_url,
+                                  {"id": guild_id, "members": 1},
+                                  first_page=2,
+                                  last_known_page=last_page(guild.members_count, len(guild)))
+
+        while len(guild) < guild.members_count and added_member:
+            added_member = add_guild_members_from_xml(guild, await pages.__anext__())
+
+            try:
+                call_progress_cb(progress, len(guild), guild.members_count)
+            except:
+                break
+
+        await pages.aclose()
+
+        return guild
+
+    async def iter_guild_members(self, guild_id):
+        """
+        Asynchronous iterator over the names of the members of a guild. See
+        :py:meth:`boardgamegeek.api.BGGCommon.iter_guild_members`
+        """
+        params = _guild_params(guild_id, members=True)
+
+        xml_root = await self._request(self._guild_api_url, params)
+        guild = create_guild_from_xml(xml_root, html_parser)
+
+        items = self._iter_paged_items(self._guild_api_url,
+                                       params,
+                                       xml_root,
+                                       page_items=lambda page_root: _page_guild_members(guild, page_root),
+                                       total_items=guild.members_count)
+        try:
+            async for member in items:
+                yield member
+        finally:
+            # stop fetching the next page right away if the iteration was stopped early
+            await items.aclose()
+
+    async def user(self, name, progress=None, buddies=True, guilds=True, hot=True, top=True,
+                   domain=BGGRestrictDomainTo.BOARD_GAME):
+        """
+        Retrieves details about an user. See :py:meth:`boardgamegeek.api.BGGCommon.user`
+        """
+        params = _user_params(name, buddies, guilds, hot, top, domain)
+
+        root = await self._request(self._user_api_url, params)
+
+        user = create_user_from_xml(root)
+
+        if not buddies and not guilds:
+            return user
+
+        add_user_buddies_and_guilds_from_xml(user, root)
+
+        max_items_to_fetch = max(get_user_buddies_and_guilds_totals_from_xml(root))
+
+        try:
+            call_progress_cb(progress, max(user.total_buddies, user.total_guilds), max_items_to_fetch)
+        except:
+            return user
+
+        pages = self._fetch_pages(self._user_api_url,
+                                  params,
+                                  first_page=2,
+                                  last_known_page=last_page(max_items_to_fetch,
+                                                            max(user.total_buddies, user.total_guilds)))
+        page = 2
+        while max(user.total_buddies, user.total_guilds) < max_items_to_fetch:
+            added_items = add_user_buddies_and_guilds_from_xml(user, await pages.__anext__())
+
+            try:
+                call_progress_cb(progress, max(user.total_buddies, user.total_guilds), max_items_to_fetch)
+            except:
+                break
+
+            if not added_items:
+                log.debug("didn't add any buddy/guild after fetching page {}, stopping here".format(page))
+                break
+
+            page += 1
+
+        await pages.aclose()
+
+        return user
+
+    async def plays(self, name=None, game_id=None, progress=None, min_date=None, max_date=None,
+                    subtype=BGGRestrictPlaysTo.BOARD_GAME):
+        """
+        Retrieves the plays for an user (if using ``name``) or for a game (if using ``game_id``). See
+        :py:meth:`boardgamegeek.api.BGGCommon.plays`
+        """
+        params = _plays_params(name, game_id, min_date, max_date, subtype)
+        game_id = params.get("id")
+
+        xml_stream = await self._request(self._plays_api_url, params, item_tag="play")
+
+        plays = create_plays_from_xml(xml_stream.root, game_id)
+        added_plays = add_plays_from_xml_stream(plays, xml_stream)
+
+        try:
+            call_progress_cb(progress, len(plays), plays.plays_count)
+        except:
+            return plays
+
+        pages = self._fetch_pages(self._plays_api_url,
+                                  params,
+                                  first_page=2,
+                                  last_known_page=last_page(plays.plays_count, len(plays)),
+                                  item_tag="play")
+
+        while added_plays:
+            added_plays = add_plays_from_xml_stream(plays, await pages.__anext__())
+
+            try:
+                call_progress_cb(progress, len(plays), plays.plays_count)
+            except:
+                break
+
+        await pages.aclose()
+
+        return plays
+
+    async def iter_plays(self, name=None, game_id=None, min_date=None, max_date=None,
+                         subtype=BGGRestrictPlaysTo.BOARD_GAME):
+        """
+        Asynchronous iterator over the plays of an user (if using ``name``) or of a game (if using ``game_id``). See
+        :py:meth:`boardgamegeek.api.BGGCommon.iter_plays`
+        """
+        params = _plays_params(name, game_id, min_date, max_date, subtype)
+
+        xml_stream = await self._request(self._plays_api_url, params, item_tag="play")
+        plays = create_plays_from_xml(xml_stream.root, params.get("id"))
+
+        items = self._iter_paged_items(self._plays_api_url,
+                                       params,
+                                       xml_stream,
+                                       page_items=lambda page_stream: _page_plays(plays, page_stream),
+                                       item_tag="play")
+        try:
+            async for play in items:
+                yield play
+        finally:
+            await items.aclose()
+
+    async def hot_items(self, item_type):
+        """
+        Return the list of "Hot Items". See :py:meth:`boardgamegeek.api.BGGCommon.hot_items`
+        """
+        xml_root = await self._request(self._hot_api_url, _hot_items_params(item_type))
+
+        hot_items = create_hot_items_from_xml(xml_root)
+        add_hot_items_from_xml(hot_items, xml_root)
+
+        return hot_items
+
+    async def collection(self, user_name, subtype=BGGRestrictCollectionTo.BOARD_GAME, exclude_subtype=None, ids=None,
+                         versions=False, own=None, rated=None, played=None, commented=None, trade=None, want=None,
+                         wishlist=None, wishlist_prio=None, preordered=None, want_to_play=None, want_to_buy=None,
+                         prev_owned=None, has_parts=None, want_parts=None, min_rating=None, rating=None,
+                         min_bgg_rating=None, bgg_rating=None, min_plays=None, max_plays=None, collection_id=None,
+                         modified_since=None, fields=None):
+        """
+        Returns an user's game collection. See :py:meth:`boardgamegeek.api.BGGCommon.collection`
+        """
+        params = _collection_params(user_name, subtype, exclude_subtype, ids, versions, own, rated, played,
+                                    commented, trade, want, wishlist, wishlist_prio, preordered, want_to_play,
+                                    want_to_buy, prev_owned, has_parts, want_parts, min_rating, rating,
+                                    min_bgg_rating, bgg_rating, min_plays, max_plays, collection_id, modified_since,
+                                    fields)
+        fields = _fields(fields, COLLECTION_ITEM_FIELDS)
+
+        xml_stream = await self._request(self._collection_api_url, params, item_tag="item")
+
+        return create_collection_from_xml_stream(xml_stream, user_name, subtype, fields=fields)
+
+    async def search(self, query, search_type=None, exact=False):
+        """
+        Search for a game. See :py:meth:`boardgamegeek.api.BGGCommon.search`
+        """
+        params = _search_params(query, search_type, exact)
+
+        root = await self._request(self._search_api_url, params)
+
+        results = create_search_results_from_xml(root)
+
+        return sorted(results, key=lambda x: fuzz.token_set_ratio(query, x.name), reverse=True)
+
+
+class AsyncBGGClient(AsyncBGGCommon):
+    """
+        asyncio client for www.boardgamegeek.com's XML API 2, mirroring :py:class:`boardgamegeek.api.BGGClient`.
+
+        Responses aren't cached by this client.
+
+        :param float timeout: Timeout for network operations, in seconds
+        :param int retries: Number of retries to perform in case the API returns HTTP 202 (retry) or in case of timeouts
+        :param float retry_delay: Time to sleep, in seconds, between retries when the API returns HTTP 202 (retry)
+        :param requests_per_minute: how many requests per minute to allow to go out to each BGG API endpoint
+        :param requests_burst: how many requests can go out back to back to an API endpoint
+        :param endpoint_rate_limits: per endpoint ``(requests_per_minute, requests_burst)`` overrides
+        :param workers: how many pages of a paginated call (or chunks of a long list of games) are fetched at once
+        :param str api_endpoint: URL of the API
+
+        Example usage::
+
+            >>> async def main():
+            ...     async with AsyncBGGClient() as bgg:
+            ...         games = await asyncio.gather(bgg.game(game_id=31260), bgg.game(game_id=124742))
+            ...
+            >>> asyncio.get_event_loop().run_until_complete(main())
+
+    """
+    def __init__(self, timeout=15, retries=3, retry_delay=5, requests_per_minute=DEFAULT_REQUESTS_PER_MINUTE,
+                 requests_burst=DEFAULT_REQUESTS_BURST, endpoint_rate_limits=None, workers=DEFAULT_WORKERS,
+                 api_endpoint="https://www.boardgamegeek.com/xmlapi2"):
+
+        super(AsyncBGGClient, self).__init__(api_endpoint=api_endpoint,
+                                             timeout=timeout,
+                                             retries=retries,
+                                             retry_delay=retry_delay,
+                                             requests_per_minute=requests_per_minute,
+                                             requests_burst=requests_burst,
+                                             endpoint_rate_limits=endpoint_rate_limits,
+                                             workers=workers)
+
+    async def get_game_id(self, name, choose=BGGChoose.FIRST):
+        """
+        Returns the BGG ID of a game, searching by name. See :py:meth:`boardgamegeek.api.BGGClient.get_game_id`
+        """
+        return await self._get_id(name, game_types=[game_type for game_type in BGGRestrictGameSearchResultsTo],
+                                  choose=choose)
+
+    async def get_family_id(self, name, choose=BGGChoose.NEAREST):
+        """
+        Returns the BGG ID of a family, searching by name. See :py:meth:`boardgamegeek.api.BGGClient.get_family_id`
+        """
+        return await self._get_id(name, game_types=[game_type for game_type in BGGRestrictFamilySearchResultsTo],
+                                  choose=choose)
+
+    async def game_list(self, game_id_list=[], versions=False, videos=False, historical=False, marketplace=False,
+                        fields=None):
+        """
+        Get list of games by from a list of ids. See :py:meth:`boardgamegeek.api.BGGClient.game_list`
+        """
+        game_ids = _game_list_ids(game_id_list)
+        fields = _fields(fields, BOARD_GAME_FIELDS)
+        versions, videos = _game_flags(fields, versions, videos)
+
+        log.debug("retrieving {} games".format(len(game_ids)))
+
+        async def _fetch_chunk(chunk):
+            xml_root = await self._request(self._thing_api_url,
+                                           _game_list_params(chunk, versions, videos, historical, marketplace,
+                                                             fields))
+            return _create_games_from_xml(xml_root, fields=fields)
+
+        games = await self._fetch_in_chunks(_fetch_chunk, game_ids)
+
+        return [games.get(int(game_id)) for game_id in game_id_list]
+
+    async def game(self, name=None, game_id=None, choose=BGGChoose.FIRST, versions=False, videos=False,
+                   historical=False, marketplace=False, comments=False, rating_comments=False, progress=None,
+                   fields=None):
+        """
+        Get information about a game. See :py:meth:`boardgamegeek.api.BGGClient.game`
+        """
+        if not name and game_id is None:
+            raise BGGError("game name or id not specified")
+
+        fields = _fields(fields, BOARD_GAME_FIELDS)
+        versions, videos = _game_flags(fields, versions, videos)
+
+        if game_id is None:
+            game_id = await self.get_game_id(name, choose=choose)
+            if game_id is None:
+                raise BGGItemNotFoundError
+
+        log.debug("retrieving game id {}{}".format(game_id, " ({})".format(name) if name is not None else ""))
+
+        params = _game_params(game_id, versions, videos, historical, marketplace, comments, rating_comments, fields)
+
+        xml_root = await self._request(self._thing_api_url, params)
+
+        xml_root = xml_root.find("item")
+        if xml_root is None:
+            msg = "invalid data for game id: {}{}".format(game_id, "" if name is None else " ({})".format(name))
+            raise _BGGMissingItemError(msg)
+
+        game = create_game_from_xml(xml_root,
+                                    game_id=game_id,
+                                    html_parser=html_parser,
+                                    fields=fields)
+
+        if not comments:
+            return game
+
+        added_items, total = add_game_comments_from_xml(game, xml_root)
+
+        try:
+            call_progress_cb(progress, len(game.comments), total)
+        except:
+            return game
+
+        page = 1
+        while added_items and len(game.comments) < total:
+            page += 1
+
+            xml_root = await self._request(self._thing_api_url,
+                                           {"id": game_id, "pagesize": 100, "comments": 1, "page": page})
+
+            xml_root = xml_root.find("item")
+            if xml_root is None:
+                break
+
+            added_items, _ = add_game_comments_from_xml(game, xml_root)
+
+            try:
+                call_progress_cb(progress, len(game.comments), total)
+            except:
+                break
+
+        return game
+
+    async def iter_comments(self, game_id, rating_comments=False):
+        """
+        Asynchronous iterator over the comments of a game. See :py:meth:`boardgamegeek.api.BGGClient.iter_comments`
+        """
+        params = _comments_params(game_id, rating_comments)
+
+        xml_root = await self._request(self._thing_api_url, params)
+
+        item = xml_root.find("item")
+        if item is None:
+            raise BGGItemNotFoundError("invalid game id: {}".format(game_id))
+
+        _, total = get_game_comments_from_xml(item)
+
+        items = self._iter_paged_items(self._thing_api_url,
+                                       params,
+                                       xml_root,
+                                       page_items=_page_comments,
+                                       total_items=total)
+        try:
+            async for comment in items:
+                yield comment
+        finally:
+            await items.aclose()
+
+    async def games(self, name):
+        """
+        Return a list containing all games with the given name. See :py:meth:`boardgamegeek.api.BGGClient.games`
+        """
+        results = await self.search(name,
+                                    search_type=[game_type for game_type in BGGRestrictGameSearchResultsTo],
+                                    exact=True)
+
+        if not results:
+            return []
+
+        return [game for game in await self.game_list([s.id for s in results]) if game is not None]
+
+    async def family(self, name=None, family_id=None, choose=BGGChoose.FIRST):
+        """
+        Get information about a family. See :py:meth:`boardgamegeek.api.BGGClient.family`
+        """
+        if not name and family_id is None:
+            raise BGGError("game name or id not specified")
+
+        if family_id is None:
+            family_id = await self.get_family_id(name, choose=choose)
+            if family_id is None:
+                raise BGGItemNotFoundError
+
+        log.debug("retrieving family id {}{}".format(family_id, " ({})".format(name) if name is not None else ""))
+
+        xml_root = await self._request(self._family_api_url, {"id": family_id})
+
+        xml_root = xml_root.find("item")
+        if xml_root is None:
+            msg = "invalid data for family id: {}{}".format(family_id, "" if name is None else " ({})".format(name))
+            raise _BGGMissingItemError(msg)
+
+        return create_family_from_xml(xml_root,
+                                      family_id=family_id,
+                                      html_parser=html_parser)
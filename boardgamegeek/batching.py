@@ -0,0 +1,128 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.batching` - Request batching
+================================================
+
+The ``/thing`` API accepts several ids in a call. When many threads ask for different games at about the same time,
+the :py:class:`ThingBatcher` holds their requests for a short while and sends them together, as a single multi-id
+request, which saves both time and rate limiting budget.
+
+.. module:: boardgamegeek.batching
+   :platform: Unix, Windows
+   :synopsis: merging concurrent requests for single items
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+"""
+from __future__ import unicode_literals
+
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+
+
+log = logging.getLogger("boardgamegeek.batching")
+
+
+class ThingBatcher(object):
+    """
+    Merges the requests for single items which are made within a short time window into multi-id requests.
+
+    Requests are only merged if they have the same options (e.g. whether to include the versions of the games).
+    A request for an item which is already pending, or in flight, shares the result of the earlier request.
+
+    :param callable fetch: callable taking a list of ids and the options, returning a dictionary mapping the ids to
+                           their results. The ids missing from the dictionary resolve to ``None``
+    :param float window: how long to hold a request before sending it, in seconds
+    :param int max_batch_size: the most ids to send in a request. Full batches are sent right away
+    :param int workers: the most batches in flight at once; the others wait for their turn
+    """
+    def __init__(self, fetch, window, max_batch_size, workers=2):
+        self._fetch = fetch
+        self._window = window
+        self._max_batch_size = max_batch_size
+        self._workers = max(1, int(workers))
+        self._executor = None
+        self._lock = threading.Lock()
+        self._pending = {}      # options -> list of ids waiting to be sent
+        self._timers = {}       # options -> timer which will send the pending ids
+        self._futures = {}      # (options, id) -> future of a pending or in flight request
+
+    def submit(self, item_id, options=()):
+        """
+        Requests an item
+
+        :param int item_id: the id of the item
+        :param tuple options: hashable options of the request; only requests with equal options are merged
+        :return: a future resolving to the item (``None`` if the server didn't return it), or to the exception raised
+                 while fetching it
+        :rtype: :py:class:`concurrent.futures.Future`
+        """
+        key = (options, item_id)
+
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                return future
+
+            future = Future()
+            self._futures[key] = future
+
+            pending = self._pending.setdefault(options, [])
+            pending.append(item_id)
+
+            if len(pending) >= self._max_batch_size:
+                batch = self._take_batch(options)
+            else:
+                batch = None
+                if options not in self._timers:
+                    timer = threading.Timer(self._window, self._flush, args=(options,))
+                    timer.daemon = True
+                    self._timers[options] = timer
+                    timer.start()
+
+        if batch:
+            self._send(options, batch)
+
+        return future
+
+    def _take_batch(self, options):
+        # must be called with the lock held
+        timer = self._timers.pop(options, None)
+        if timer is not None:
+            timer.cancel()
+        return self._pending.pop(options, [])
+
+    def _flush(self, options):
+        with self._lock:
+            batch = self._take_batch(options)
+
+        if batch:
+            self._send(options, batch)
+
+    def _send(self, options, batch):
+        # the callers are blocked waiting, so the requests are made by a pool of their own, which none of them might be
+        # using (and which keeps the batches waiting for the rate limiter from piling up threads)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self._workers)
+            executor = self._executor
+        executor.submit(self._run, options, batch)
+
+    def _run(self, options, batch):
+        log.debug("sending a batch of {} ids".format(len(batch)))
+
+        try:
+            results = self._fetch(batch, options)
+        except Exception as e:
+            results, error = None, e
+        else:
+            error = None
+
+        with self._lock:
+            futures = [self._futures.pop((options, item_id)) for item_id in batch]
+
+        for item_id, future in zip(batch, futures):
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(results.get(item_id))
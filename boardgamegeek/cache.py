@@ -1,11 +1,503 @@
+import binascii
+import bisect
+import errno
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import sqlite3
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+try:
+    import fcntl
+except ImportError:
+    # Windows: the index is only locked between the threads of a process
+    fcntl = None
+
+try:
+    from urllib.parse import urlparse, parse_qsl
+except ImportError:
+    from urlparse import urlparse, parse_qsl
+
 import requests
 import requests_cache
+from requests.hooks import dispatch_hook
+from requests_cache.backends.base import BaseCache
+from requests_cache.backends.sqlite import DbCache
+from requests_cache.core import _normalize_parameters
 
 from .exceptions import BGGValueError
+from .utils import _clock, api_endpoint_name
+
+
+log = logging.getLogger("boardgamegeek.cache")
+
+
+# Suggested expiry times (in seconds) for the replies of each endpoint, to be used with :py:class:`TTLPolicy`
+RECOMMENDED_TTLS = {
+    "hot": 3600,
+    "plays": 3600,
+    "collection": 3600,
+    "thing": 24 * 3600,
+    "family": 24 * 3600,
+    "user": 7 * 24 * 3600,
+    "guild": 7 * 24 * 3600,
+    "search": 30 * 24 * 3600,
+}
+
+
+class TTLPolicy(object):
+    """
+    Decides how long the reply to a request is cached for, depending on the API endpoint and on the parameters of the
+    request.
+
+    The ``rules`` are checked first, in order; the first one matching the request sets its expiry time. Otherwise, the
+    expiry time of the endpoint is used, or ``default`` if there's none.
+
+    Example::
+
+        >>> policy = TTLPolicy(default=3600,
+        ...                    endpoints=RECOMMENDED_TTLS,
+        ...                    rules=[("thing", {"comments": 1}, 3600)])
+        >>> bgg = BGGClient(cache=CacheBackendSqlite(path="cache.db", ttl=policy))
+
+    :param int default: expiry time, in seconds, of the requests not matched by anything else (``None`` for never)
+    :param dict endpoints: expiry times keyed by the name of the endpoint (e.g. ``"thing"``)
+    :param list rules: list of ``(endpoint, params, ttl)`` tuples. A rule matches the requests to ``endpoint`` (or to
+                       any endpoint, if it's ``None``) having all the parameters in the ``params`` dictionary, with
+                       the same values
+    """
+    def __init__(self, default, endpoints=None, rules=None):
+        try:
+            self.default = int(default) if default is not None else None
+            self.endpoints = dict((endpoint, int(ttl) if ttl is not None else None)
+                                  for endpoint, ttl in (endpoints or {}).items())
+            self.rules = [(endpoint, dict((k, str(v)) for k, v in params.items()), int(ttl) if ttl is not None else None)
+                          for endpoint, params, ttl in (rules or [])]
+        except (TypeError, ValueError):
+            raise BGGValueError
+
+    def ttl_for(self, url):
+        """
+        :param str url: the URL of the request, including the query string
+        :return: for how many seconds the reply is valid (``None`` for as long as it's cached)
+        :rtype: integer
+        """
+        endpoint = api_endpoint_name(url)
+
+        if self.rules:
+            params = dict(parse_qsl(urlparse(url).query))
+            for rule_endpoint, rule_params, ttl in self.rules:
+                if rule_endpoint is not None and rule_endpoint != endpoint:
+                    continue
+                if all(params.get(k) == v for k, v in rule_params.items()):
+                    return ttl
+
+        return self.endpoints.get(endpoint, self.default)
+
+    def expire_after(self, url):
+        """
+        Same as :py:meth:`ttl_for`, but as a :py:class:`datetime.timedelta`
+        """
+        ttl = self.ttl_for(url)
+        return timedelta(seconds=ttl) if ttl is not None else None
+
+    def longest(self):
+        """
+        :return: the longest expiry time, ``None`` if some replies never expire
+        """
+        ttls = [self.default] + list(self.endpoints.values()) + [ttl for _, _, ttl in self.rules]
+        if None in ttls:
+            return None
+        return max(ttls)
+
+
+def _as_ttl_policy(ttl):
+    """
+    Returns a :py:class:`TTLPolicy` from either a policy or a number of seconds applying to all the requests
+    """
+    if isinstance(ttl, TTLPolicy):
+        return ttl
+
+    try:
+        return TTLPolicy(default=int(ttl))
+    except (TypeError, ValueError):
+        raise BGGValueError
+
+
+def _stale_grace(stale_grace):
+    try:
+        return timedelta(seconds=int(stale_grace)) if stale_grace else None
+    except (TypeError, ValueError):
+        raise BGGValueError
+
+
+class CacheStats(object):
+    """
+    Counters of how a cache performs, by API endpoint: the hits, misses and stale responses served, the responses
+    evicted, the amount of data stored and a histogram of the lookup times. It's thread safe.
+
+    The amount of data stored is kept up to date by the storages, which record the responses they store and the ones
+    they drop (expired, deleted, evicted or replaced). It only covers the responses stored through this cache: the ones
+    found in a persistent storage when it's opened, or added by other processes sharing it, aren't counted.
+    """
+    # upper bounds of the lookup time histogram buckets, in seconds (the last bucket holds the slower lookups)
+    LATENCY_BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0)
+
+    # the endpoint of the responses evicted by storages which don't know it
+    UNKNOWN_ENDPOINT = "unknown"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = {}
+
+    def _counters(self, endpoint):
+        # must be called with the lock held
+        counters = self._endpoints.get(endpoint)
+        if counters is None:
+            counters = {"hits": 0,
+                        "misses": 0,
+                        "stale": 0,
+                        "evictions": 0,
+                        "bytes_stored": 0,
+                        "bytes_written": 0,
+                        "latency_count": 0,
+                        "latency_sum": 0.0,
+                        "latency_buckets": [0] * (len(self.LATENCY_BUCKETS) + 1)}
+            self._endpoints[endpoint] = counters
+        return counters
+
+    def record_lookup(self, endpoint, outcome, latency):
+        """
+        Records a cache lookup
+
+        :param str endpoint: the API endpoint of the request
+        :param str outcome: ``"hits"``, ``"misses"`` or ``"stale"``
+        :param float latency: how long the lookup took, in seconds
+        """
+        bucket = bisect.bisect_left(self.LATENCY_BUCKETS, latency)
+        with self._lock:
+            counters = self._counters(endpoint)
+            counters[outcome] += 1
+            counters["latency_count"] += 1
+            counters["latency_sum"] += latency
+            counters["latency_buckets"][bucket] += 1
+
+    def record_store(self, endpoint, size):
+        """
+        Records that a response was stored
+
+        :param str endpoint: the API endpoint of the request
+        :param int size: the size of the response body, in bytes
+        """
+        with self._lock:
+            counters = self._counters(endpoint)
+            counters["bytes_stored"] += size
+            counters["bytes_written"] += size
+
+    def record_removal(self, endpoint, size):
+        """
+        Records that a stored response was dropped (expired, deleted, evicted or replaced by a newer one)
+
+        :param str endpoint: the API endpoint of the request
+        :param int size: the size of the response body, in bytes, as passed to :py:meth:`record_store`
+        """
+        with self._lock:
+            self._counters(endpoint)["bytes_stored"] -= size
+
+    def record_eviction(self, endpoint=None):
+        """
+        Records that a response was evicted to make room for another one
+
+        :param str endpoint: the API endpoint of the evicted response, if known
+        """
+        with self._lock:
+            self._counters(endpoint or self.UNKNOWN_ENDPOINT)["evictions"] += 1
+
+    def reset(self):
+        """
+        Sets all the counters back to zero, except for the size of the responses currently stored
+        """
+        with self._lock:
+            stored = dict((endpoint, counters["bytes_stored"]) for endpoint, counters in self._endpoints.items())
+            self._endpoints.clear()
+            for endpoint, size in stored.items():
+                if size:
+                    self._counters(endpoint)["bytes_stored"] = size
+
+    def snapshot(self):
+        """
+        Returns the current values of the counters, by endpoint. For each endpoint there's a dictionary with:
+
+        * ``hits``, ``misses``, ``stale``: how many lookups found a valid response, nothing usable, or an expired
+          response which was served while being refreshed
+        * ``hit_ratio``: the share of the lookups which were served from the cache (``None`` if there were none)
+        * ``evictions``: how many responses were evicted to make room for others
+        * ``bytes_stored``: the size of the response bodies currently stored
+        * ``bytes_written``: the total size of the response bodies stored so far, including the ones dropped since
+        * ``lookup_latency``: a dictionary with the ``count`` and the ``sum`` (in seconds) of the lookup times, and
+          their histogram, ``buckets``, a list of ``(upper bound in seconds, number of lookups)``, with ``inf`` as the
+          last upper bound
+
+        :return: the counters, keyed by endpoint name
+        :rtype: dict
+        """
+        with self._lock:
+            result = {}
+            for endpoint, counters in self._endpoints.items():
+                lookups = counters["hits"] + counters["misses"] + counters["stale"]
+                result[endpoint] = {
+                    "hits": counters["hits"],
+                    "misses": counters["misses"],
+                    "stale": counters["stale"],
+                    "hit_ratio": (counters["hits"] + counters["stale"]) / float(lookups) if lookups else None,
+                    "evictions": counters["evictions"],
+                    "bytes_stored": counters["bytes_stored"],
+                    "bytes_written": counters["bytes_written"],
+                    "lookup_latency": {
+                        "count": counters["latency_count"],
+                        "sum": counters["latency_sum"],
+                        "buckets": list(zip(self.LATENCY_BUCKETS + (float("inf"),), counters["latency_buckets"]))
+                    }
+                }
+            return result
+
+
+class _StoredSizes(object):
+    """
+    Remembers the endpoint and the body size of the responses a storage holds, so that it can report to a
+    :py:class:`CacheStats` what it drops. Does nothing without a :py:class:`CacheStats`.
+
+    :param stats: the :py:class:`CacheStats`, or ``None``
+    """
+    def __init__(self, stats):
+        self._stats = stats
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def describe(response):
+        """
+        :return: the endpoint and the body size of a response
+        :rtype: tuple
+        """
+        return api_endpoint_name(response.url), len(response.content or b"")
+
+    def add(self, key, endpoint, size):
+        if self._stats is None:
+            return
+        with self._lock:
+            replaced = self._entries.get(key)
+            self._entries[key] = endpoint, size
+        if replaced is not None:
+            self._stats.record_removal(*replaced)
+        self._stats.record_store(endpoint, size)
+
+    def remove(self, key):
+        if self._stats is None:
+            return
+        with self._lock:
+            removed = self._entries.pop(key, None)
+        if removed is not None:
+            self._stats.record_removal(*removed)
+
+    def remove_all(self):
+        if self._stats is None:
+            return
+        with self._lock:
+            removed = list(self._entries.values())
+            self._entries.clear()
+        for endpoint, size in removed:
+            self._stats.record_removal(endpoint, size)
+
+    def endpoint(self, key):
+        """
+        :return: the endpoint of a stored response, :py:attr:`CacheStats.UNKNOWN_ENDPOINT` if it isn't known
+        """
+        with self._lock:
+            return self._entries.get(key, (CacheStats.UNKNOWN_ENDPOINT, 0))[0]
+
+
+class BGGCachedSession(requests_cache.core.CachedSession):
+    """
+    A ``requests_cache`` session checking the expiry of the cached responses with a :py:class:`TTLPolicy`, instead of
+    using the same expiry time for everything.
+
+    With a ``stale_grace`` period, the responses which expired less than ``stale_grace`` seconds ago are still served
+    from the cache (stale-while-revalidate), while they're requested again in the background (once, no matter how
+    many times they're served in the meantime). The stale responses have their ``stale`` attribute set to ``True``.
+
+    :param ttl_policy: the :py:class:`TTLPolicy`
+    :param int stale_grace: for how long after expiring a response can still be served, in seconds
+    :param stats: the :py:class:`CacheStats` to record the cache lookups in (a new one if not set). The responses
+                  stored and dropped are recorded by the storage, which should be given the same object
+    :param kwargs: the arguments of :py:class:`requests_cache.core.CachedSession` (except ``expire_after``)
+    """
+    def __init__(self, ttl_policy, stale_grace=None, stats=None, **kwargs):
+        super(BGGCachedSession, self).__init__(expire_after=None, **kwargs)
+        self.ttl_policy = ttl_policy
+        self.stats = stats if stats is not None else CacheStats()
+        self._stale_grace = _stale_grace(stale_grace)
+        self._refreshing = set()
+        self._refreshing_lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        if self._is_cache_disabled or request.method not in self._cache_allowable_methods:
+            return super(BGGCachedSession, self).send(request, **kwargs)
+
+        cache_key = self.cache.create_key(request)
+        endpoint = api_endpoint_name(request.url)
+
+        start = _clock()
+        try:
+            response, timestamp = self.cache.get_response_and_time(cache_key)
+        except (ImportError, TypeError):
+            response, timestamp = None, None
+        latency = _clock() - start
+
+        if response is not None:
+            expire_after = self.ttl_policy.expire_after(request.url)
+            age = datetime.utcnow() - timestamp
+            if expire_after is None or age <= expire_after:
+                self.stats.record_lookup(endpoint, "hits", latency)
+                return self._from_cache(request, response, **kwargs)
+
+            if self._stale_grace is not None and age <= expire_after + self._stale_grace:
+                self.stats.record_lookup(endpoint, "stale", latency)
+                self._refresh(request, cache_key, kwargs)
+                response.stale = True
+                return self._from_cache(request, response, **kwargs)
+
+            self.cache.delete(cache_key)
+
+        self.stats.record_lookup(endpoint, "misses", latency)
+        return self._send_and_cache(request, cache_key, **kwargs)
+
+    @staticmethod
+    def _from_cache(request, response, **kwargs):
+        # dispatch hook here, because it was removed before pickling
+        response.from_cache = True
+        return dispatch_hook("response", request.hooks, response, **kwargs)
+
+    def _refresh(self, request, cache_key, kwargs):
+        """
+        Requests a stale response again, in the background, unless that's already happening
+        """
+        with self._refreshing_lock:
+            if cache_key in self._refreshing:
+                return
+            self._refreshing.add(cache_key)
+
+        thread = threading.Thread(target=self._run_refresh, args=(request.copy(), cache_key, kwargs),
+                                  name="bgg-cache-refresh")
+        thread.daemon = True
+        thread.start()
+
+    def _run_refresh(self, request, cache_key, kwargs):
+        try:
+            self._send_and_cache(request, cache_key, **kwargs).close()
+        except Exception as e:
+            # the stale response is served until the grace period is over, the next request will try again
+            log.warning("failed to refresh {}: {}".format(request.url, e))
+        finally:
+            with self._refreshing_lock:
+                self._refreshing.discard(cache_key)
+
+    def cached_response(self, url, params):
+        """
+        Looks up the response to a GET request in the cache, without sending the request
+
+        :param str url: the URL
+        :param dict params: the parameters of the request
+        :return: the cached response, ``None`` if there's none or it expired
+        """
+        request = self._prepare_get(url, params)
+        endpoint = api_endpoint_name(request.url)
+
+        start = _clock()
+        response, timestamp = self.cache.get_response_and_time(self.cache.create_key(request))
+        latency = _clock() - start
+
+        if response is not None:
+            expire_after = self.ttl_policy.expire_after(request.url)
+            if expire_after is not None and datetime.utcnow() - timestamp > expire_after:
+                response = None
+
+        if response is None:
+            self.stats.record_lookup(endpoint, "misses", latency)
+            return None
+
+        self.stats.record_lookup(endpoint, "hits", latency)
+        response.from_cache = True
+        return response
+
+    def save_content(self, url, params, content):
+        """
+        Caches a reply to a GET request, as if it came from the server (e.g. a part of a bigger reply)
+
+        :param str url: the URL
+        :param dict params: the parameters of the request
+        :param bytes content: the body of the reply
+        """
+        request = self._prepare_get(url, params)
+
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "text/xml; charset=utf-8"
+        response.encoding = "utf-8"
+        response.url = request.url
+        response.request = request
+        response._content = content
+
+        self.cache.save_response(self.cache.create_key(request), response)
+
+    def _prepare_get(self, url, params):
+        # same normalization of the parameters as for the requests sent through the session
+        return self.prepare_request(requests.Request("GET", url, params=_normalize_parameters(params)))
+
+    def _send_and_cache(self, request, cache_key, **kwargs):
+        response = requests.Session.send(self, request, **kwargs)
+        if response.status_code in self._cache_allowable_codes:
+            self.cache.save_response(cache_key, response)
+        response.from_cache = False
+        return response
+
+    def remove_expired_responses(self):
+        """
+        Removes the expired responses from the storage
+        """
+        if hasattr(self.cache, "remove_expired"):
+            self.cache.remove_expired()
+            return
+
+        # the storage doesn't know the expiry times, only drop what expired under all the rules
+        longest = self.ttl_policy.longest()
+        if longest is not None:
+            self.cache.remove_old_entries(datetime.utcnow() - timedelta(seconds=longest) -
+                                          (self._stale_grace or timedelta(0)))
 
 
 class CacheBackend(object):
-    pass
+    def stats(self):
+        """
+        :return: the statistics of the cache, by API endpoint (see :py:meth:`CacheStats.snapshot`)
+        :rtype: dict
+        """
+        stats = getattr(self.cache, "stats", None)
+        return stats.snapshot() if stats is not None else {}
 
 
 class CacheBackendNone(CacheBackend):
@@ -14,25 +506,990 @@ class CacheBackendNone(CacheBackend):
 
 
 class CacheBackendMemory(CacheBackend):
-    """ Cache HTTP requests in memory """
-    def __init__(self, ttl):
+    """
+    Cache HTTP requests in memory
+
+    :param ttl: how long the responses are cached for, in seconds, or a :py:class:`TTLPolicy`
+    :param int max_bytes: if set, the least recently (or least frequently) used responses are evicted to keep the size
+                          of the cached bodies under this budget
+    :param str eviction: which responses to evict first, ``"lru"`` (least recently used) or ``"lfu"`` (least
+                         frequently used)
+    :param float sweep_interval: how often to drop the expired responses, in seconds. The sweeping piggybacks on cache
+                                 accesses, so no thread is needed for it
+    :param int stale_grace: for how long after expiring a response is still served, while it's refreshed in the
+                            background (see :py:class:`BGGCachedSession`)
+    """
+    def __init__(self, ttl, max_bytes=None, eviction="lru", sweep_interval=60, stale_grace=None):
+        ttl_policy = _as_ttl_policy(ttl)
+
+        stats = CacheStats()
+
+        self.store = BoundedMemoryCache(max_bytes=max_bytes, eviction=eviction, ttl=ttl_policy,
+                                        sweep_interval=sweep_interval, stale_grace=stale_grace, stats=stats)
+        self.cache = BGGCachedSession(ttl_policy, stale_grace=stale_grace, stats=stats, backend=self.store,
+                                      allowable_codes=(200,))
+
+
+class BoundedMemoryCache(BaseCache):
+    """
+    In-memory storage for ``requests_cache``, holding at most ``max_bytes`` of response bodies. Unlike the default
+    memory storage, which keeps everything until it's requested again after expiring, the expired responses are also
+    dropped periodically.
+
+    :param int max_bytes: the budget for the size of the stored responses (``None`` for no limit)
+    :param str eviction: ``"lru"`` to evict the least recently used responses first, ``"lfu"`` to evict the least
+                         frequently used ones
+    :param ttl: how long the responses are valid for, in seconds, or a :py:class:`TTLPolicy`
+    :param float sweep_interval: the minimum time between two sweeps for expired responses, in seconds
+    :param int stale_grace: for how long to keep the responses after they expire, in seconds
+    :param stats: if set, the :py:class:`CacheStats` to record the responses stored, dropped and evicted in
+    """
+    # approximate size of a stored response, on top of its body (the headers, url, etc.)
+    ENTRY_OVERHEAD = 1024
+
+    def __init__(self, max_bytes=None, eviction="lru", ttl=None, sweep_interval=60, stale_grace=None, stats=None):
+        super(BoundedMemoryCache, self).__init__()
+
+        if eviction not in ("lru", "lfu"):
+            raise BGGValueError("invalid eviction policy: {}".format(eviction))
+
         try:
-            int(ttl)
-        except ValueError:
+            self.max_bytes = int(max_bytes) if max_bytes is not None else None
+            self._sweep_interval = float(sweep_interval)
+        except (TypeError, ValueError):
             raise BGGValueError
-        self.cache = requests_cache.core.CachedSession(backend="memory", expire_after=ttl, allowable_codes=(200,))
+
+        self._ttl_policy = _as_ttl_policy(ttl) if ttl is not None else None
+        self._stale_grace = _stale_grace(stale_grace) or timedelta(0)
+        self._eviction = eviction
+        self._stats = stats
+        self._stored = _StoredSizes(stats)
+        self._lock = threading.RLock()
+        self.responses = OrderedDict()      # least recently used first
+        self._sizes = {}
+        self._uses = {}
+        self._expires = {}
+        self._last_sweep = _clock()
+
+        self.bytes_used = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def save_response(self, key, response):
+        size = len(response.content or b"") + self.ENTRY_OVERHEAD
+        if self.max_bytes is not None and size > self.max_bytes:
+            # it would evict everything else, and still not fit
+            return
+
+        reduced = self.reduce_response(response)
+        created = datetime.utcnow()
+        expire_after = self._ttl_policy.expire_after(response.url) if self._ttl_policy is not None else None
+
+        with self._lock:
+            self._forget(key)
+            self.responses[key] = reduced, created
+            self._sizes[key] = size
+            self._stored.add(key, *_StoredSizes.describe(response))
+            self._uses[key] = 0
+            if expire_after is not None:
+                self._expires[key] = created + expire_after + self._stale_grace
+            self.bytes_used += size
+
+            self._maybe_sweep()
+
+            while self.max_bytes is not None and self.bytes_used > self.max_bytes:
+                evicted = self._eviction_candidate(new_key=key)
+                if self._stats is not None:
+                    self._stats.record_eviction(api_endpoint_name(self.responses[evicted][0].url))
+                self._forget(evicted)
+                self.evictions += 1
+
+    def get_response_and_time(self, key, default=(None, None)):
+        with self._lock:
+            self._maybe_sweep()
+
+            if key not in self.responses:
+                key = self.keys_map.get(key)
+            if key not in self.responses:
+                return default
+
+            response, timestamp = self.responses.pop(key)
+            self.responses[key] = response, timestamp
+            self._uses[key] += 1
+
+        return self.restore_response(response), timestamp
+
+    def delete(self, key):
+        with self._lock:
+            super(BoundedMemoryCache, self).delete(key)
+            self._drop_stale_sizes()
+
+    def clear(self):
+        with self._lock:
+            super(BoundedMemoryCache, self).clear()
+            self._sizes.clear()
+            self._uses.clear()
+            self._expires.clear()
+            self._stored.remove_all()
+            self.bytes_used = 0
+
+    def remove_old_entries(self, created_before):
+        with self._lock:
+            super(BoundedMemoryCache, self).remove_old_entries(created_before)
+            self._drop_stale_sizes()
+
+    def remove_expired(self):
+        """
+        Drops the expired responses
+
+        :return: the number of responses dropped
+        :rtype: integer
+        """
+        now = datetime.utcnow()
+        with self._lock:
+            expired = [key for key, expires in self._expires.items() if expires < now]
+            for key in expired:
+                self._forget(key)
+            self.expirations += len(expired)
+            self._last_sweep = _clock()
+        return len(expired)
+
+    def stats(self):
+        """
+        :return: the number of responses stored, their size, and how many of them were evicted or expired
+        :rtype: dict
+        """
+        with self._lock:
+            return {"entries": len(self.responses),
+                    "bytes_used": self.bytes_used,
+                    "max_bytes": self.max_bytes,
+                    "evictions": self.evictions,
+                    "expirations": self.expirations}
+
+    def _maybe_sweep(self):
+        if _clock() - self._last_sweep >= self._sweep_interval:
+            self.remove_expired()
+
+    def _eviction_candidate(self, new_key):
+        if self._eviction == "lfu":
+            # the response just added hasn't had a chance to be used yet; ties go to the least recently used
+            return min((key for key in self.responses if key != new_key), key=lambda key: self._uses[key])
+        return next(iter(self.responses))
+
+    def _forget(self, key):
+        if key in self.responses:
+            response, _ = self.responses.pop(key)
+            for r in response.history:
+                self.keys_map.pop(self.create_key(r.request), None)
+        self.bytes_used -= self._sizes.pop(key, 0)
+        self._uses.pop(key, None)
+        self._expires.pop(key, None)
+        self._stored.remove(key)
+
+    def _drop_stale_sizes(self):
+        for key in [key for key in self._sizes if key not in self.responses]:
+            self.bytes_used -= self._sizes.pop(key)
+            self._uses.pop(key, None)
+            self._expires.pop(key, None)
+            self._stored.remove(key)
 
 
 class CacheBackendSqlite(CacheBackend):
-    def __init__(self, path, ttl, fast_save=True):
+    """
+    Cache HTTP requests in a SQLite database
+
+    :param str path: the path of the database file
+    :param ttl: how long the responses are cached for, in seconds, or a :py:class:`TTLPolicy`
+    :param bool fast_save: speeds up the writes, at the risk of losing data if the process crashes
+    :param int stale_grace: for how long after expiring a response is still served, while it's refreshed in the
+                            background (see :py:class:`BGGCachedSession`)
+    """
+    def __init__(self, path, ttl, fast_save=True, stale_grace=None):
+        ttl_policy = _as_ttl_policy(ttl)
+
+        stats = CacheStats()
+
+        self.store = SqliteCache(path, fast_save=fast_save, stats=stats)
+        self.cache = BGGCachedSession(ttl_policy, stale_grace=stale_grace, stats=stats, backend=self.store,
+                                      allowable_codes=(200,))
+
+
+class SqliteCache(DbCache):
+    """
+    The SQLite storage of ``requests_cache``, recording the responses it stores and drops in a :py:class:`CacheStats`
+
+    :param str path: the path of the database file
+    :param bool fast_save: speeds up the writes, at the risk of losing data if the process crashes
+    :param stats: if set, the :py:class:`CacheStats` to record the responses stored and dropped in
+    """
+    def __init__(self, path, fast_save=False, stats=None):
+        super(SqliteCache, self).__init__(path, fast_save=fast_save, extension="")
+        self._stored = _StoredSizes(stats)
+
+    def save_response(self, key, response):
+        super(SqliteCache, self).save_response(key, response)
+        self._stored.add(key, *_StoredSizes.describe(response))
+
+    def delete(self, key):
+        # the same lookup as requests_cache does, to know which response goes away
+        stored_key = key if key in self.responses else self.keys_map.get(key)
+        super(SqliteCache, self).delete(key)
+        self._stored.remove(stored_key)
+
+    def clear(self):
+        super(SqliteCache, self).clear()
+        self._stored.remove_all()
+
+
+class CacheBackendCompressedSqlite(CacheBackend):
+    """
+    Cache HTTP requests in a SQLite database, compressed. See :py:class:`CompressedSqliteCache`.
+
+    :param str path: the path of the database file
+    :param ttl: how long the responses are cached for, in seconds, or a :py:class:`TTLPolicy`
+    :param int compression_level: the zlib compression level (1-9)
+    :param int stale_grace: for how long after expiring a response is still served, while it's refreshed in the
+                            background (see :py:class:`BGGCachedSession`)
+    """
+    def __init__(self, path, ttl, compression_level=6, stale_grace=None):
+        ttl_policy = _as_ttl_policy(ttl)
+
+        stats = CacheStats()
+
+        self.store = CompressedSqliteCache(path, ttl=ttl_policy, compression_level=compression_level,
+                                           stale_grace=stale_grace, stats=stats)
+        self.cache = BGGCachedSession(ttl_policy, stale_grace=stale_grace, stats=stats, backend=self.store,
+                                      allowable_codes=(200,))
+
+    def vacuum(self):
+        """
+        Compacts the database file, dropping the expired responses. See :py:meth:`CompressedSqliteCache.vacuum`
+        """
+        return self.store.vacuum()
+
+
+class CacheBackendFileSystem(CacheBackend):
+    """
+    Cache HTTP requests in a directory, shared by any number of processes. See :py:class:`FileSystemCache`.
+
+    :param str path: the path of the directory
+    :param ttl: how long the responses are cached for, in seconds, or a :py:class:`TTLPolicy`
+    :param int index_slots: how many responses the index can hold (used only when creating the index)
+    :param int stale_grace: for how long after expiring a response is still served, while it's refreshed in the
+                            background (see :py:class:`BGGCachedSession`)
+    """
+    def __init__(self, path, ttl, index_slots=65536, stale_grace=None):
+        ttl_policy = _as_ttl_policy(ttl)
+
+        stats = CacheStats()
+
+        self.store = FileSystemCache(path, ttl=ttl_policy, index_slots=index_slots, stale_grace=stale_grace,
+                                     stats=stats)
+        self.cache = BGGCachedSession(ttl_policy, stale_grace=stale_grace, stats=stats, backend=self.store,
+                                      allowable_codes=(200,))
+
+
+class ObjectCache(object):
+    """
+    Cache for the objects created from the API replies (games, collections, guilds, ...), so that the requests which
+    hit it skip both the HTTP cache and the parsing. It holds at most ``max_size`` objects, evicting the least
+    recently used ones.
+
+    The cached objects are shared by all the callers requesting them, so they should be treated as read-only.
+
+    :param int max_size: the maximum number of objects to keep
+    :param float ttl: how long an object is valid for, in seconds (``None`` for no expiry)
+    """
+    def __init__(self, max_size=1000, ttl=3600):
+        try:
+            self._max_size = int(max_size)
+            self._ttl = float(ttl) if ttl is not None else None
+        except (TypeError, ValueError):
+            raise BGGValueError
+
+        if self._max_size < 1:
+            raise BGGValueError
+
+        self._items = OrderedDict()         # key -> (expiry time, object), least recently used first
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        """
+        Returns a cached object
+
+        :param key: the key of the object
+        :return: the object, ``None`` if it's not in the cache (or it expired)
+        """
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None and entry[0] is not None and entry[0] <= _clock():
+                del self._items[key]
+                entry = None
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            # mark as most recently used
+            del self._items[key]
+            self._items[key] = entry
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, obj):
+        """
+        Adds an object to the cache, evicting the least recently used ones if it's full
+
+        :param key: the key of the object
+        :param obj: the object
+        """
+        expires = _clock() + self._ttl if self._ttl is not None else None
+
+        with self._lock:
+            self._items.pop(key, None)
+            self._items[key] = (expires, obj)
+
+            while len(self._items) > self._max_size:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Removes all the objects from the cache
+        """
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        """
+        :return: the number of cache hits, misses, evictions and the number of objects stored
+        :rtype: dict
+        """
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "evictions": self.evictions, "size": len(self._items)}
+
+
+# Preset dictionary for compressing the replies: the markup which is common to the replies of the BGG API. It mostly
+# helps with the small replies (e.g. searches, or games without versions), which are too short for zlib to find many
+# repetitions inside them. Never change it: the responses already stored can only be decompressed with the same one
+_ZLIB_DICTIONARY = (
+    b'<?xml version="1.0" encoding="utf-8"?>'
+    b'<items total="" pubdate="" termsofuse="https://boardgamegeek.com/xmlapi/termsofuse">'
+    b'<guild id="" name="" created=""><category></category><website></website><manager></manager>'
+    b'<description></description><location><addr1></addr1><addr2></addr2><city></city>'
+    b'<stateorprovince></stateorprovince><postalcode></postalcode><country></country></location>'
+    b'<members count="" page=""><member name="" date="" />'
+    b'<plays username="" userid="" total="" page="" termsofuse="https://boardgamegeek.com/xmlapi/termsofuse">'
+    b'<play id="" date="" quantity="1" length="0" incomplete="0" nowinstats="0" location="">'
+    b'<item name="" objecttype="thing" objectid=""><subtypes><subtype value="boardgame" /></subtypes></item>'
+    b'<players><player username="" userid="" name="" startposition="" color="" score="" new="0" rating="0" win="0" />'
+    b'</players><comments></comments></play>'
+    b'<item objecttype="thing" objectid="" subtype="boardgame" collid=""><name sortindex="1"></name>'
+    b'<yearpublished></yearpublished><status own="0" prevowned="0" fortrade="0" want="0" wanttoplay="0" '
+    b'wanttobuy="0" wishlist="0" preordered="0" lastmodified="" /><numplays>0</numplays>'
+    b'<stats minplayers="" maxplayers="" minplaytime="" maxplaytime="" playingtime="" numowned="">'
+    b'<rating value="N/A">'
+    b'<video id="" title="" category="review" language="English" link="https://www.youtube.com/watch?v=" '
+    b'username="" userid="" postdate="" />'
+    b'<versions><item type="boardgameversion" id=""><link type="boardgameversion" id="" value="" inbound="true"/>'
+    b'<width value="0" /><length value="0" /><depth value="0" /><weight value="0" /><productcode value="" />'
+    b'<link type="language" id="2184" value="English" />'
+    b'<marketplacelistings><listing><listdate value="" /><price currency="USD" value="" /><condition value="" />'
+    b'<notes value="" /><link href="" title="marketplace" /></listing></marketplacelistings>'
+    b'<comments page="1" totalitems=""><comment username="" rating="N/A" value="" />'
+    b'<poll name="suggested_numplayers" title="User Suggested Number of Players" totalvotes="">'
+    b'<poll name="suggested_playerage" title="User Suggested Player Age" totalvotes="">'
+    b'<poll name="language_dependence" title="Language Dependence" totalvotes="">'
+    b'<result level="1" value="No necessary in-game text" numvotes="" />'
+    b'<results numplayers=""><result value="Best" numvotes="" /><result value="Recommended" numvotes="" />'
+    b'<result value="Not Recommended" numvotes="" /></results></poll>'
+    b'<statistics page="1"><ratings><usersrated value="" /><average value="" /><bayesaverage value="" /><ranks>'
+    b'<rank type="family" id="" name="strategygames" friendlyname="Strategy Game Rank" value="" bayesaverage="" />'
+    b'<rank type="subtype" id="1" name="boardgame" friendlyname="Board Game Rank" value="" bayesaverage="" />'
+    b'</ranks><stddev value="" /><median value="0" /><owned value="" /><trading value="" /><wanting value="" />'
+    b'<wishing value="" /><numcomments value="" /><numweights value="" /><averageweight value="" /></ratings>'
+    b'</statistics></item></items>'
+    b'<link type="boardgamecategory" id="" value="" /><link type="boardgamemechanic" id="" value="" />'
+    b'<link type="boardgamefamily" id="" value="" /><link type="boardgameexpansion" id="" value="" />'
+    b'<link type="boardgameimplementation" id="" value="" inbound="true" /><link type="boardgamedesigner" id="" value="" />'
+    b'<link type="boardgameartist" id="" value="" /><link type="boardgamepublisher" id="" value="" />'
+    b'<description></description><yearpublished value="" /><minplayers value="" /><maxplayers value="" />'
+    b'<playingtime value="" /><minplaytime value="" /><maxplaytime value="" /><minage value="" />'
+    b'<item type="boardgame" id=""><thumbnail>https://cf.geekdo-images.com/</thumbnail>'
+    b'<image>https://cf.geekdo-images.com/</image>'
+    b'<name type="primary" sortindex="1" value="" /><name type="alternate" sortindex="1" value="" />'
+)
+
+# the first byte of a stored response tells how it was compressed
+_PLAIN_ZLIB = b"\x00"
+_DICTIONARY_ZLIB = b"\x01"
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+class CompressedSqliteCache(BaseCache):
+    """
+    SQLite storage for ``requests_cache``, keeping the responses compressed with zlib and a preset dictionary for the
+    BGG API replies (which compress 5 to 10 times).
+
+    The database uses write-ahead logging, so readers (in any number of processes) don't block each other or the
+    writer. The responses are written by a background thread, in batches (one transaction each), so the requests
+    don't wait for the disk; until then, they are served from memory. The redirect mappings are only kept in memory.
+
+    :param str path: the path of the database file
+    :param ttl: how long the responses are valid for, in seconds, or a :py:class:`TTLPolicy` (used by
+                :py:meth:`vacuum`)
+    :param int compression_level: the zlib compression level (1-9)
+    :param int max_batch_size: the most writes to group in a transaction
+    :param int stale_grace: for how long to keep the responses after they expire, in seconds
+    :param stats: if set, the :py:class:`CacheStats` to record the responses stored and dropped in (when they're
+                  written to the database)
+    """
+    def __init__(self, path, ttl=None, compression_level=6, max_batch_size=100, stale_grace=None, stats=None):
+        super(CompressedSqliteCache, self).__init__()
+
+        try:
+            self._compression_level = int(compression_level)
+            self._max_batch_size = int(max_batch_size)
+        except (TypeError, ValueError):
+            raise BGGValueError
+
+        self._ttl_policy = _as_ttl_policy(ttl) if ttl is not None else None
+        self._stale_grace = _stale_grace(stale_grace) or timedelta(0)
+        self._stored = _StoredSizes(stats)
+        self.path = path
+        self._local = threading.local()
+        self._pending = {}                  # key -> (created, data) of the responses not written yet
+        self._pending_lock = threading.Lock()
+        self._writes = queue.Queue()
+        self._writer = None
+        self._writer_lock = threading.Lock()
+
+        with self._connection() as conn:
+            conn.execute("CREATE TABLE IF NOT EXISTS responses "
+                         "(key TEXT PRIMARY KEY, created REAL, expires REAL, data BLOB)")
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_created ON responses (created)")
+            conn.execute("CREATE INDEX IF NOT EXISTS responses_expires ON responses (expires)")
+
+    def _connection(self):
+        # sqlite connections can't be shared between threads
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _compress(self, data):
+        try:
+            compressor = zlib.compressobj(self._compression_level, zlib.DEFLATED, 15, 9, zlib.Z_DEFAULT_STRATEGY,
+                                          _ZLIB_DICTIONARY)
+        except TypeError:
+            # preset dictionaries are only supported starting with Python 3.3
+            return _PLAIN_ZLIB + zlib.compress(data, self._compression_level)
+        return _DICTIONARY_ZLIB + compressor.compress(data) + compressor.flush()
+
+    @staticmethod
+    def _decompress(data):
+        data = bytes(data)
+        if data[:1] == _DICTIONARY_ZLIB:
+            decompressor = zlib.decompressobj(15, _ZLIB_DICTIONARY)
+            return decompressor.decompress(data[1:]) + decompressor.flush()
+        return zlib.decompress(data[1:])
+
+    def save_response(self, key, response):
+        created = datetime.utcnow()
+        data = self._compress(pickle.dumps((self.reduce_response(response), created), pickle.HIGHEST_PROTOCOL))
+        created = (created - _EPOCH).total_seconds()
+
+        ttl = self._ttl_policy.ttl_for(response.url) if self._ttl_policy is not None else None
+        expires = created + ttl + self._stale_grace.total_seconds() if ttl is not None else None
+
+        with self._pending_lock:
+            self._pending[key] = created, data
+        self._enqueue(("save", key, created, expires, data) + _StoredSizes.describe(response))
+
+    def get_response_and_time(self, key, default=(None, None)):
+        key = self.keys_map.get(key, key)
+
+        with self._pending_lock:
+            pending = self._pending.get(key)
+
+        if pending is not None:
+            data = pending[1]
+        else:
+            row = self._connection().execute("SELECT data FROM responses WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return default
+            data = row[0]
+
+        try:
+            response, timestamp = pickle.loads(self._decompress(data))
+        except Exception:
+            log.warning("can't read the cached response for {}, ignoring it".format(key))
+            return default
+
+        return self.restore_response(response), timestamp
+
+    def has_key(self, key):
+        return self.get_response_and_time(key) != (None, None)
+
+    def delete(self, key):
+        key = self.keys_map.pop(key, key)
+        with self._pending_lock:
+            self._pending.pop(key, None)
+        self._enqueue(("delete", key))
+
+    def clear(self):
+        self.keys_map.clear()
+        with self._pending_lock:
+            self._pending.clear()
+        self._enqueue(("clear",))
+
+    def remove_old_entries(self, created_before):
+        created_before = (created_before - _EPOCH).total_seconds()
+        with self._pending_lock:
+            for key in [key for key, (created, _) in self._pending.items() if created < created_before]:
+                del self._pending[key]
+        self._enqueue(("expire", created_before))
+
+    def remove_expired(self):
+        """
+        Drops the expired responses (the ones which would be requested again instead of being served from the cache)
+        """
+        now = (datetime.utcnow() - _EPOCH).total_seconds()
+        self._enqueue(("remove_expired", now))
+
+    def flush(self):
+        """
+        Waits until all the pending writes are saved in the database
+        """
+        self._writes.join()
+
+    def vacuum(self):
+        """
+        Compacts the database: drops the expired responses, merges the write-ahead log into the database and rebuilds
+        the database file, to give the free space back to the file system. It blocks the writers (in all processes)
+        while it runs.
+
+        :return: the size of the database file, in bytes
+        :rtype: integer
+        """
+        self.remove_expired()
+        self.flush()
+
+        conn = self._connection()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+        page_count = conn.execute("PRAGMA page_count").fetchone()[0]
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        return page_count * page_size
+
+    def _enqueue(self, operation):
+        self._writes.put(operation)
+
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write, name="bgg-cache-writer")
+                self._writer.daemon = True
+                self._writer.start()
+
+    def _write(self):
+        conn = self._connection()
+        while True:
+            batch = [self._writes.get()]
+            while len(batch) < self._max_batch_size:
+                try:
+                    batch.append(self._writes.get_nowait())
+                except queue.Empty:
+                    break
+
+            try:
+                with conn:
+                    for operation in batch:
+                        self._apply(conn, operation)
+            except sqlite3.Error as e:
+                log.warning("failed to write {} operations to the cache: {}".format(len(batch), e))
+
+            with self._pending_lock:
+                for operation in batch:
+                    # keep serving it from memory if it was saved again in the meantime
+                    if operation[0] == "save" and self._pending.get(operation[1], (None, None))[1] is operation[4]:
+                        del self._pending[operation[1]]
+
+            for _ in batch:
+                self._writes.task_done()
+
+    def _apply(self, conn, operation):
+        # the sizes are tracked here, in the order the operations are written in
+        if operation[0] == "save":
+            _, key, created, expires, data, endpoint, size = operation
+            conn.execute("INSERT OR REPLACE INTO responses (key, created, expires, data) VALUES (?, ?, ?, ?)",
+                         (key, created, expires, sqlite3.Binary(data)))
+            self._stored.add(key, endpoint, size)
+        elif operation[0] == "delete":
+            conn.execute("DELETE FROM responses WHERE key = ?", (operation[1],))
+            self._stored.remove(operation[1])
+        elif operation[0] == "expire":
+            self._delete_where(conn, "created < ?", operation[1])
+        elif operation[0] == "remove_expired":
+            self._delete_where(conn, "expires < ?", operation[1])
+        elif operation[0] == "clear":
+            conn.execute("DELETE FROM responses")
+            self._stored.remove_all()
+
+    def _delete_where(self, conn, condition, value):
+        for (key,) in conn.execute("SELECT key FROM responses WHERE " + condition, (value,)).fetchall():
+            self._stored.remove(key)
+        conn.execute("DELETE FROM responses WHERE " + condition, (value,))
+
+
+def vacuum_database(path):
+    """
+    Compacts a SQLite cache database. The databases of :py:class:`CacheBackendCompressedSqlite` have their expired
+    responses dropped first (see :py:meth:`CompressedSqliteCache.vacuum`); the ones of :py:class:`CacheBackendSqlite`
+    don't record when their responses expire, so they're only compacted.
+
+    :param str path: the path of the database file
+    :return: the size of the database file, in bytes
+    :rtype: integer
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if the file doesn't exist or isn't a cache database
+    """
+    if not os.path.isfile(path):
+        raise BGGValueError("{} doesn't exist".format(path))
+
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        try:
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(responses)")]
+        except sqlite3.DatabaseError:
+            columns = []
+        if not columns:
+            raise BGGValueError("{} isn't a cache database".format(path))
+
+        if "expires" not in columns:
+            conn.execute("VACUUM")
+            return os.path.getsize(path)
+    finally:
+        conn.close()
+
+    return CompressedSqliteCache(path).vacuum()
+
+
+class FileSystemCache(BaseCache):
+    """
+    Storage for ``requests_cache`` in a directory, meant to be shared by many processes (e.g. the workers of a web
+    server): a response fetched by one of them is served from the cache to all the others right away.
+
+    The responses are stored in files named after the hash of their contents, in a tree of 256 subdirectories. They're
+    written to a temporary file first and renamed into place, so a reader never sees a partially written file, and they
+    never change afterwards. The keys are mapped to the files by an index of fixed size, which is memory mapped by all
+    the processes. The readers don't take any lock: each slot of the index has a sequence number which the writers
+    make odd while they update it, and the readers retry when they see it odd or changed. The writers are serialized
+    with a lock on a separate file (on Windows, only between the threads of a process).
+
+    A key can only be stored in the few slots following the one its hash points to. When they're all taken, the oldest
+    response among them is replaced, so the index never needs to grow. The files which aren't referenced by the index
+    anymore are deleted by :py:meth:`remove_expired`.
+
+    The redirect mappings are only kept in memory.
+
+    :param str path: the path of the directory (created if needed)
+    :param ttl: how long the responses are valid for, in seconds, or a :py:class:`TTLPolicy`
+    :param int index_slots: how many responses the index can hold (used only when creating the index)
+    :param int stale_grace: for how long to keep the responses after they expire, in seconds
+    :param stats: if set, the :py:class:`CacheStats` to record the responses stored, dropped and evicted in (the
+                  index doesn't know the endpoints of the responses, the evictions of the ones stored by other
+                  processes are recorded as :py:attr:`CacheStats.UNKNOWN_ENDPOINT`)
+    """
+    _MAGIC = b"BGGC"
+    _HEADER = struct.Struct("<4sII")        # magic, version, number of slots
+    _HEADER_SIZE = 64
+    _SLOT = struct.Struct("<I20s20sdd4x")   # sequence number, key hash, contents hash, created, expires (0 = never)
+    _VERSION = 1
+    _PROBES = 8
+    _EMPTY = b"\x00" * 20
+
+    # unreferenced files younger than this might have just been written by another process, not yet added to the index
+    ORPHAN_AGE = 60
+
+    def __init__(self, path, ttl=None, index_slots=65536, stale_grace=None, stats=None):
+        super(FileSystemCache, self).__init__()
+
         try:
-            int(ttl)
-        except ValueError:
+            index_slots = int(index_slots)
+        except (TypeError, ValueError):
             raise BGGValueError
+        if index_slots < self._PROBES:
+            raise BGGValueError("the index needs at least {} slots".format(self._PROBES))
+
+        self._ttl_policy = _as_ttl_policy(ttl) if ttl is not None else None
+        self._stale_grace = _stale_grace(stale_grace) or timedelta(0)
+        self._stats = stats
+        self._stored = _StoredSizes(stats)
+        self.path = path
+        self._objects_path = os.path.join(path, "objects")
+        self._tmp_path = os.path.join(path, "tmp")
+        self._index_path = os.path.join(path, "index")
+        self._lock_path = os.path.join(path, "lock")
+        self._thread_lock = threading.Lock()
+        self._lock_file = None
+        self._lock_pid = None
+
+        for directory in [path, self._objects_path, self._tmp_path]:
+            try:
+                os.makedirs(directory)
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+
+        if not os.path.exists(self._index_path):
+            self._create_index(index_slots)
+
+        with open(self._index_path, "r+b") as f:
+            self._index = mmap.mmap(f.fileno(), 0)
+
+        magic, version, self.index_slots = self._HEADER.unpack_from(self._index, 0)
+        if magic != self._MAGIC or version != self._VERSION:
+            raise BGGValueError("{} isn't a cache index".format(self._index_path))
+
+    def _create_index(self, slots):
+        fd, tmp_name = tempfile.mkstemp(dir=self._tmp_path)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(self._HEADER.pack(self._MAGIC, self._VERSION, slots).ljust(self._HEADER_SIZE, b"\x00"))
+                f.truncate(self._HEADER_SIZE + slots * self._SLOT.size)
+            try:
+                # fails if another process created it in the meantime, unlike rename
+                os.link(tmp_name, self._index_path)
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+        finally:
+            os.unlink(tmp_name)
+
+    @contextmanager
+    def _locked(self):
+        # serializes the writers to the index, in all the processes
+        with self._thread_lock:
+            if fcntl is None:
+                yield
+                return
+
+            # flock() locks are shared by the processes which inherited the file, so each process opens its own
+            if self._lock_pid != os.getpid():
+                self._lock_file = open(self._lock_path, "a+b")
+                self._lock_pid = os.getpid()
+
+            fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_UN)
+
+    @staticmethod
+    def _hash(data):
+        return hashlib.sha1(data).digest()
+
+    def _slot_offset(self, slot):
+        return self._HEADER_SIZE + slot * self._SLOT.size
+
+    def _probe(self, key_hash):
+        first = struct.unpack_from("<Q", key_hash)[0] % self.index_slots
+        return [(first + i) % self.index_slots for i in range(self._PROBES)]
+
+    def _read_slot(self, slot):
+        offset = self._slot_offset(slot)
+        while True:
+            entry = self._SLOT.unpack_from(self._index, offset)
+            if entry[0] % 2 == 0 and struct.unpack_from("<I", self._index, offset)[0] == entry[0]:
+                return entry
+            # being written by another process
+            time.sleep(0)
+
+    def _write_slot(self, slot, key_hash, contents_hash, created, expires):
+        # must be called with the lock held
+        offset = self._slot_offset(slot)
+        sequence = struct.unpack_from("<I", self._index, offset)[0]
+        struct.pack_into("<I", self._index, offset, (sequence + 1) % 2 ** 32)
+        self._SLOT.pack_into(self._index, offset, (sequence + 1) % 2 ** 32, key_hash, contents_hash, created, expires)
+        struct.pack_into("<I", self._index, offset, (sequence + 2) % 2 ** 32)
+
+    def _object_path(self, contents_hash):
+        name = binascii.hexlify(contents_hash).decode("ascii")
+        return os.path.join(self._objects_path, name[:2], name[2:])
+
+    def _lookup(self, key_hash):
+        for slot in self._probe(key_hash):
+            entry = self._read_slot(slot)
+            if entry[1] == key_hash:
+                return slot, entry
+        return None, None
+
+    def save_response(self, key, response):
+        data = pickle.dumps(self.reduce_response(response), pickle.HIGHEST_PROTOCOL)
+        contents_hash = self._hash(data)
+        path = self._object_path(contents_hash)
+
+        if not os.path.exists(path):
+            try:
+                os.makedirs(os.path.dirname(path))
+            except OSError as e:
+                if e.errno != errno.EEXIST:
+                    raise
+
+            fd, tmp_name = tempfile.mkstemp(dir=self._tmp_path)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(data)
+                os.rename(tmp_name, path)
+            except OSError:
+                # on Windows, rename fails if another process stored the same contents in the meantime
+                if os.path.exists(tmp_name):
+                    os.unlink(tmp_name)
+                if not os.path.exists(path):
+                    raise
+
+        created = (datetime.utcnow() - _EPOCH).total_seconds()
+        ttl = self._ttl_policy.ttl_for(response.url) if self._ttl_policy is not None else None
+        expires = created + ttl + self._stale_grace.total_seconds() if ttl is not None else 0.0
+
+        key_hash = self._hash(key.encode("utf-8"))
+        with self._locked():
+            slot, _ = self._lookup(key_hash)
+            if slot is None:
+                # the first free slot, or else the oldest response
+                entries = [(slot, self._read_slot(slot)) for slot in self._probe(key_hash)]
+                free = [slot for slot, entry in entries if entry[1] == self._EMPTY]
+                if free:
+                    slot = free[0]
+                else:
+                    slot, evicted = min(entries, key=lambda slot_entry: slot_entry[1][3])
+                    if self._stats is not None:
+                        self._stats.record_eviction(self._stored.endpoint(evicted[1]))
+                    self._stored.remove(evicted[1])
+            self._write_slot(slot, key_hash, contents_hash, created, expires)
+            self._stored.add(key_hash, *_StoredSizes.describe(response))
+
+    def get_response_and_time(self, key, default=(None, None)):
+        key = self.keys_map.get(key, key)
+
+        _, entry = self._lookup(self._hash(key.encode("utf-8")))
+        if entry is None:
+            return default
+
+        try:
+            with open(self._object_path(entry[2]), "rb") as f:
+                response = pickle.loads(f.read())
+        except (IOError, OSError):
+            # replaced and cleaned up by another process in the meantime
+            return default
+        except Exception:
+            log.warning("can't read the cached response for {}, ignoring it".format(key))
+            return default
+
+        return self.restore_response(response), _EPOCH + timedelta(seconds=entry[3])
+
+    def has_key(self, key):
+        key = self.keys_map.get(key, key)
+        return self._lookup(self._hash(key.encode("utf-8")))[1] is not None
+
+    def delete(self, key):
+        key_hash = self._hash(self.keys_map.pop(key, key).encode("utf-8"))
+        with self._locked():
+            slot, _ = self._lookup(key_hash)
+            if slot is not None:
+                self._write_slot(slot, self._EMPTY, self._EMPTY, 0.0, 0.0)
+                self._stored.remove(key_hash)
+
+    def clear(self):
+        self.keys_map.clear()
+        self._drop(lambda entry: True)
+
+    def remove_old_entries(self, created_before):
+        created_before = (created_before - _EPOCH).total_seconds()
+        self._drop(lambda entry: entry[3] < created_before)
+
+    def remove_expired(self):
+        """
+        Drops the expired responses (the ones which would be requested again instead of being served from the cache)
+        and deletes the files which aren't used anymore
+
+        :return: the number of files deleted
+        :rtype: integer
+        """
+        now = (datetime.utcnow() - _EPOCH).total_seconds()
+        return self._drop(lambda entry: entry[4] and entry[4] < now)
+
+    def _drop(self, condition):
+        with self._locked():
+            for slot in range(self.index_slots):
+                entry = self._read_slot(slot)
+                if entry[1] != self._EMPTY and condition(entry):
+                    self._write_slot(slot, self._EMPTY, self._EMPTY, 0.0, 0.0)
+                    self._stored.remove(entry[1])
+
+        return self._collect_garbage()
+
+    def _collect_garbage(self):
+        referenced = set()
+        for slot in range(self.index_slots):
+            entry = self._read_slot(slot)
+            if entry[1] != self._EMPTY:
+                referenced.add(self._object_path(entry[2]))
+
+        deleted = 0
+        too_recent = time.time() - self.ORPHAN_AGE
+        for directory in [self._objects_path, self._tmp_path]:
+            for root, _, files in os.walk(directory):
+                for name in files:
+                    path = os.path.join(root, name)
+                    try:
+                        if path not in referenced and os.path.getmtime(path) < too_recent:
+                            os.unlink(path)
+                            deleted += 1
+                    except OSError:
+                        # deleted by another process
+                        pass
+        return deleted
+
+
+class NegativeCache(ObjectCache):
+    """
+    Remembers the requests for items which don't exist (e.g. unknown users, guilds or game names), so that repeating
+    them fails right away, without making a request (and spending the rate limiting budget). It should have a short
+    ``ttl``, since the items might be created in the meantime.
+
+    :param int max_size: the maximum number of requests to remember
+    :param float ttl: for how long to remember a request, in seconds
+    """
+    def __init__(self, max_size=10000, ttl=600):
+        super(NegativeCache, self).__init__(max_size=max_size, ttl=ttl)
+
+    def remember(self, key, error):
+        """
+        Remembers that a request failed because the item doesn't exist
+
+        :param key: the key of the request
+        :param error: the :py:exc:`boardgamegeek.exceptions.BGGItemNotFoundError` it raised
+        """
+        self.set(key, (error.__class__, error.args))
+
+    def check(self, key):
+        """
+        Checks if a request is known to fail
 
-        self.cache = requests_cache.core.CachedSession(cache_name=path,
-                                                       backend="sqlite",
-                                                       expire_after=ttl,
-                                                       extension="",
-                                                       fast_save=fast_save,
-                                                       allowable_codes=(200,))
+        :param key: the key of the request
+        :raises: the exception the request raised, if it's remembered
+        """
+        entry = self.get(key)
+        if entry is not None:
+            error_class, args = entry
+            raise error_class(*args)
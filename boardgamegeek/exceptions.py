@@ -40,6 +40,14 @@ class BGGApiRetryError(BGGApiError):
     pass
 
 
+class _BGGMissingItemError(BGGItemNotFoundError, BGGApiError):
+    """
+    The reply of the BGG XML2 API doesn't have the requested item. It used to be reported as a :py:exc:`BGGApiError`,
+    so it's still one.
+    """
+    pass
+
+
 BoardGameGeekError = BGGError
 BoardGameGeekTimeoutError = BGGApiTimeoutError
 BoardGameGeekAPIError = BGGApiError
@@ -1,11 +1,16 @@
-from .collection import create_collection_from_xml, add_collection_items_from_xml
+from .collection import create_collection_from_xml, add_collection_items_from_xml, create_collection_from_xml_stream
 from .guild import create_guild_from_xml, add_guild_members_from_xml
 from .hotitems import create_hot_items_from_xml, add_hot_items_from_xml
-from .plays import create_plays_from_xml, add_plays_from_xml
-from .game import create_game_from_xml, add_game_comments_from_xml
+from .plays import create_plays_from_xml, add_plays_from_xml, add_plays_from_xml_stream
+from .game import create_game_from_xml, add_game_comments_from_xml, get_game_comments_from_xml, get_game_ranks_from_xml
+from .game import create_lazy_game_from_bytes
 from .family import create_family_from_xml
+from .user import create_user_from_xml, add_user_buddies_and_guilds_from_xml, get_user_buddies_and_guilds_totals_from_xml
+from .search import create_search_results_from_xml
 
 __all__ = [create_collection_from_xml, create_guild_from_xml, create_hot_items_from_xml, create_plays_from_xml,
-           create_game_from_xml, create_family_from_xml,
+           create_game_from_xml, create_family_from_xml, create_user_from_xml, create_search_results_from_xml,
            add_collection_items_from_xml, add_guild_members_from_xml, add_hot_items_from_xml, add_plays_from_xml,
-           add_game_comments_from_xml]
\ No newline at end of file
+           add_game_comments_from_xml, add_user_buddies_and_guilds_from_xml,
+           get_user_buddies_and_guilds_totals_from_xml, get_game_comments_from_xml, create_collection_from_xml_stream,
+           add_plays_from_xml_stream, get_game_ranks_from_xml, create_lazy_game_from_bytes]
@@ -3,6 +3,19 @@ from ..exceptions import BGGApiError, BGGItemNotFoundError
 from ..utils import get_board_game_version_from_element
 from ..utils import xml_subelement_text, xml_subelement_attr
 
+_STATUS_FIELDS = ["lastmodified", "own", "preordered", "prevowned", "want", "wanttobuy", "wanttoplay", "fortrade",
+                  "wishlist", "wishlistpriority"]
+
+#: the values of a collection item which are read from its ``stats`` node, returned only if the collection was
+#: requested with ``stats=1``
+COLLECTION_STATS_FIELDS = frozenset(["stats", "minplayers", "maxplayers", "minplaytime", "maxplaytime", "playingtime",
+                                     "rating"])
+
+#: the values of a collection item which can be requested (see the ``fields`` argument of
+#: :py:func:`add_collection_item_from_xml`)
+COLLECTION_ITEM_FIELDS = frozenset(["name", "image", "thumbnail", "yearpublished", "numplays", "comment",
+                                    "versions"] + _STATUS_FIELDS) | COLLECTION_STATS_FIELDS
+
 
 def create_collection_from_xml(xml_root, user_name):
 
@@ -16,79 +29,122 @@ def create_collection_from_xml(xml_root, user_name):
     return Collection({"owner": user_name})
 
 
-def add_collection_items_from_xml(collection, xml_root, subtype):
+def create_collection_from_xml_stream(xml_stream, user_name, subtype, fields=None):
+    """
+    Creates a collection from a reply which is parsed incrementally, adding each item as soon as it's parsed
+
+    :param xml_stream: the reply's items
+    :type xml_stream: :py:class:`boardgamegeek.utils.XMLItemStream`
+    :param str user_name: the owner of the collection
+    :param str subtype: only the items of this subtype are added
+    :param fields: if set, only these values of the items are read (see :py:func:`add_collection_item_from_xml`)
+    :return: the collection
+    :rtype: :py:class:`boardgamegeek.objects.collection.Collection`
+    """
+
+    collection = Collection({"owner": user_name})
+
+    for item in xml_stream:
+        if item.attrib.get("subtype") == subtype:
+            add_collection_item_from_xml(collection, item, fields=fields)
+
+    # the errors (e.g. invalid user name) are only known once the whole document was parsed
+    create_collection_from_xml(xml_stream.root, user_name)
+
+    return collection
+
+
+def add_collection_items_from_xml(collection, xml_root, subtype, fields=None):
 
     added_items = False
 
     for item in xml_root.findall("item[@subtype='{}']".format(subtype)):
-
-        # initial data for this collection item
-        data = {"name": xml_subelement_text(item, "name"),
-                "id": int(item.attrib["objectid"]),
-                "image": xml_subelement_text(item, "image"),
-                "thumbnail": xml_subelement_text(item, "thumbnail"),
-                "yearpublished": xml_subelement_attr(item,
-                                                     "yearpublished",
-                                                     default=0,
-                                                     convert=int,
-                                                     quiet=True),
-                "numplays": xml_subelement_text(item, "numplays", convert=int, default=0),
-                "comment": xml_subelement_text(item, "comment", default='')}
-
-        # Add item statistics
-        stats = item.find("stats")
-        if stats is None:
-            raise BGGApiError("missing 'stats'")
-
-        stat_data = {"usersrated": xml_subelement_attr(stats, "usersrated", convert=int, quiet=True),
-                     "average": xml_subelement_attr(stats, "average", convert=float, quiet=True),
-                     "bayesaverage": xml_subelement_attr(stats, "bayesaverage", convert=float, quiet=True),
-                     "stddev": xml_subelement_attr(stats, "stddev", convert=float, quiet=True),
-                     "median": xml_subelement_attr(stats, "median", convert=float, quiet=True),
-                     "ranks": []}
-
-        for rank in stats.findall("ranks/rank"):
-            stat_data["ranks"].append({"type": rank.attrib.get("type"),
-                                       "id": rank.attrib["id"],
-                                       "name": rank.attrib["name"],
-                                       "friendlyname": rank.attrib["friendlyname"],
-                                       "value": rank.attrib.get("value"),
-                                       "bayesaverage": float(rank.attrib.get("bayesaverage", 0.0))})
-
-        data.update({"stats": stat_data,
-                     "minplayers": int(stats.attrib.get("minplayers", 0)),
-                     "maxplayers": int(stats.attrib.get("maxplayers", 0)),
-                     "minplaytime": int(stats.attrib.get("minplaytime", 0)),
-                     "maxplaytime": int(stats.attrib.get("maxplaytime", 0)),
-                     "playingtime": int(stats.attrib.get("playingtime", 0)),
-                     "rating": xml_subelement_attr(stats, "rating", convert=float, quiet=True)})
-
-        # status of the item in the collection
-        status = item.find("status")
-        if status is not None:
-            data.update({stat: status.attrib.get(stat) for stat in ["lastmodified",
-                                                                    "own",
-                                                                    "preordered",
-                                                                    "prevowned",
-                                                                    "want",
-                                                                    "wanttobuy",
-                                                                    "wanttoplay",
-                                                                    "fortrade",
-                                                                    "wishlist",
-                                                                    "wishlistpriority"]})
-
-        # get the version, if any
-        version = item.find("version")
-        if version is not None:
-            # This collection item has version information
-            ver = version.find("item[@type='boardgameversion']")
-            if ver is not None:
-                try:
-                    data["versions"] = [get_board_game_version_from_element(ver)]
-                except KeyError:
-                    raise BGGApiError("malformed XML element ('version')")
-
-        collection.add_game(data)
+        add_collection_item_from_xml(collection, item, fields=fields)
         added_items = True
 
     return added_items
+
+
+def add_collection_item_from_xml(collection, item, fields=None):
+    """
+    Adds an item to a collection
+
+    :param collection: the collection
+    :param item: the ``item`` XML node
+    :param fields: if set, only these values (keys of :py:data:`COLLECTION_ITEM_FIELDS`) are read, besides the id and
+                   the name, the others are left out. The statistics are only required if some of the values read
+                   from them are requested
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGApiError` if the item is missing the statistics, or is malformed
+    """
+    if fields is None:
+        fields = COLLECTION_ITEM_FIELDS
+
+    # initial data for this collection item
+    data = {"name": xml_subelement_text(item, "name"),
+            "id": int(item.attrib["objectid"])}
+
+    for key in ["image", "thumbnail"]:
+        if key in fields:
+            data[key] = xml_subelement_text(item, key)
+
+    if "yearpublished" in fields:
+        data["yearpublished"] = xml_subelement_attr(item, "yearpublished", default=0, convert=int, quiet=True)
+
+    if "numplays" in fields:
+        data["numplays"] = xml_subelement_text(item, "numplays", convert=int, default=0)
+
+    if "comment" in fields:
+        data["comment"] = xml_subelement_text(item, "comment", default='')
+
+    if not COLLECTION_STATS_FIELDS.isdisjoint(fields):
+        _add_collection_item_stats_from_xml(data, item, fields)
+
+    # status of the item in the collection
+    status = item.find("status")
+    if status is not None:
+        data.update({stat: status.attrib.get(stat) for stat in _STATUS_FIELDS if stat in fields})
+
+    # get the version, if any
+    version = item.find("version") if "versions" in fields else None
+    if version is not None:
+        # This collection item has version information
+        ver = version.find("item[@type='boardgameversion']")
+        if ver is not None:
+            try:
+                data["versions"] = [get_board_game_version_from_element(ver)]
+            except KeyError:
+                raise BGGApiError("malformed XML element ('version')")
+
+    collection.add_game(data)
+
+
+def _add_collection_item_stats_from_xml(data, item, fields):
+    # Add item statistics
+    stats = item.find("stats")
+    if stats is None:
+        raise BGGApiError("missing 'stats'")
+
+    stat_data = {"usersrated": xml_subelement_attr(stats, "usersrated", convert=int, quiet=True),
+                 "average": xml_subelement_attr(stats, "average", convert=float, quiet=True),
+                 "bayesaverage": xml_subelement_attr(stats, "bayesaverage", convert=float, quiet=True),
+                 "stddev": xml_subelement_attr(stats, "stddev", convert=float, quiet=True),
+                 "median": xml_subelement_attr(stats, "median", convert=float, quiet=True),
+                 "ranks": []}
+
+    for rank in stats.findall("ranks/rank"):
+        stat_data["ranks"].append({"type": rank.attrib.get("type"),
+                                   "id": rank.attrib["id"],
+                                   "name": rank.attrib["name"],
+                                   "friendlyname": rank.attrib["friendlyname"],
+                                   "value": rank.attrib.get("value"),
+                                   "bayesaverage": float(rank.attrib.get("bayesaverage", 0.0))})
+
+    stat_values = {"stats": stat_data,
+                   "minplayers": int(stats.attrib.get("minplayers", 0)),
+                   "maxplayers": int(stats.attrib.get("maxplayers", 0)),
+                   "minplaytime": int(stats.attrib.get("minplaytime", 0)),
+                   "maxplaytime": int(stats.attrib.get("maxplaytime", 0)),
+                   "playingtime": int(stats.attrib.get("playingtime", 0)),
+                   "rating": xml_subelement_attr(stats, "rating", convert=float, quiet=True)}
+
+    data.update((key, value) for key, value in stat_values.items() if key in fields)
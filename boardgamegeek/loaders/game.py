@@ -2,18 +2,36 @@ import logging
 import re
 from dateutil import parser as datetime_parser
 
-from ..objects.games import BoardGame
+from ..objects.games import BoardGame, GameStats, LazyBoardGame
 from ..objects.rpgs import RPGGame, RPGIssue
 from ..exceptions import BGGApiError
-from ..utils import xml_subelement_attr_list, xml_subelement_text, xml_subelement_attr, get_board_game_version_from_element
+from ..parsers import DEFAULT_PARSER, parser_of
+from .schema import Attribute, AttributeList, Expansions, ItemSchema, Text, compile_schema
 
 
 log = logging.getLogger("boardgamegeek.loaders.game")
 
-def create_game_from_xml(xml_root, game_id, html_parser):
+_BOARD_GAME_TYPES = ["boardgame", "boardgameexpansion", "boardgameaccessory"]
+
+
+def create_game_from_xml(xml_root, game_id, html_parser, lazy=False, fields=None):
+    """
+    Creates a game from its ``item`` XML node
+
+    :param xml_root: the ``item`` XML node
+    :param int game_id: the id of the game
+    :param html_parser: the parser used for unescaping the description
+    :param bool lazy: if ``True``, board games are created as :py:class:`boardgamegeek.objects.games.LazyBoardGame`,
+                      reading ``xml_root`` when their information is used
+    :param fields: if set, only these values (keys of :py:data:`BOARD_GAME_FIELDS`) of board games are read, besides
+                   the id and the name, the others are left out
+    :return: the game
+    """
     game_type = xml_root.attrib["type"]
-    if game_type in ["boardgame", "boardgameexpansion", "boardgameaccessory"]:
-        game = _create_game_from_xml(xml_root, game_id, game_type, html_parser)
+    if game_type in _BOARD_GAME_TYPES and lazy:
+        game = LazyBoardGame(game_id, _LazyGameReader(xml_root, html_parser, fields=fields))
+    elif game_type in _BOARD_GAME_TYPES:
+        game = _create_game_from_xml(xml_root, game_id, game_type, html_parser, fields=fields)
     elif game_type == 'rpgitem':
         game = _create_rpg_from_xml(xml_root, game_id, game_type, html_parser)
     elif game_type == 'rpgissue':
@@ -26,315 +44,144 @@ def create_game_from_xml(xml_root, game_id, html_parser):
     
     return game
     
-def _create_game_from_xml(xml_root, game_id, game_type, html_parser):
-    data = {"id": game_id,
-            "name": xml_subelement_attr(xml_root, "name[@type='primary']"),
-            "alternative_names": xml_subelement_attr_list(xml_root, "name[@type='alternate']"),
-            "thumbnail": xml_subelement_text(xml_root, "thumbnail"),
-            "image": xml_subelement_text(xml_root, "image"),
-            "expansion": game_type == "boardgameexpansion",       # is this game an expansion?
-            "accessory": game_type == "boardgameaccessory",       # is this game an accessory?
-            "families": xml_subelement_attr_list(xml_root, "link[@type='boardgamefamily']"),
-            "categories": xml_subelement_attr_list(xml_root, "link[@type='boardgamecategory']"),
-            "implementations": xml_subelement_attr_list(xml_root, "link[@type='boardgameimplementation']"),
-            "mechanics": xml_subelement_attr_list(xml_root, "link[@type='boardgamemechanic']"),
-            "designers": xml_subelement_attr_list(xml_root, "link[@type='boardgamedesigner']"),
-            "artists": xml_subelement_attr_list(xml_root, "link[@type='boardgameartist']"),
-            "publishers": xml_subelement_attr_list(xml_root, "link[@type='boardgamepublisher']"),
-            "description": xml_subelement_text(xml_root, "description", convert=html_parser.unescape, quiet=True)}
-
-    expands = []        # list of items this game expands
-    expansions = []     # list of expansions this game has
-    for e in xml_root.findall("link[@type='boardgameexpansion']"):
-        try:
-            item = {"id": e.attrib["id"], "name": e.attrib["value"]}
-        except KeyError:
-            raise BGGApiError("malformed XML element ('link type=boardgameexpansion')")
-
-        if e.attrib.get("inbound", "false").lower()[0] == 't':
-            # this is an item expanded by game_id
-            expands.append(item)
-        else:
-            expansions.append(item)
-
-    data["expansions"] = expansions
-    data["expands"] = expands
-
-    # These XML elements have a numberic value, attempt to convert them to integers
-    for i in ["yearpublished", "minplayers", "maxplayers", "playingtime", "minplaytime", "maxplaytime", "minage"]:
-        data[i] = xml_subelement_attr(xml_root, i, convert=int, quiet=True)
-
-    # Look for the videos
-    # TODO: The BGG API doesn't take the page=NNN parameter into account for videos; when it does, paginate them too
-    videos = xml_root.find("videos")
-    if videos is not None:
-        vid_list = []
-        for vid in videos.findall("video"):
-            try:
-                vd = {"id": vid.attrib["id"],
-                      "name": vid.attrib["title"],
-                      "category": vid.attrib.get("category"),
-                      "language": vid.attrib.get("language"),
-                      "link": vid.attrib["link"],
-                      "uploader": vid.attrib.get("username"),
-                      "uploader_id": vid.attrib.get("userid"),
-                      "post_date": vid.attrib.get("postdate")
-                      }
-                vid_list.append(vd)
-            except KeyError:
-                raise BGGApiError("malformed XML element ('video')")
-
-        data["videos"] = vid_list
-
-    # look for the versions
-    versions = xml_root.find("versions")
-    if versions is not None:
-        ver_list = []
-
-        for version in versions.findall("item[@type='boardgameversion']"):
-            try:
-                vd = get_board_game_version_from_element(version)
-                ver_list.append(vd)
-            except KeyError:
-                raise BGGApiError("malformed XML element ('versions')")
-
-        data["versions"] = ver_list
-
-    # look for the statistics
-    stats = xml_root.find("statistics/ratings")
-    if stats is not None:
-        sd = {
-            "usersrated": xml_subelement_attr(stats, "usersrated", convert=int, quiet=True),
-            "average": xml_subelement_attr(stats, "average", convert=float, quiet=True),
-            "bayesaverage": xml_subelement_attr(stats, "bayesaverage", convert=float, quiet=True),
-            "stddev": xml_subelement_attr(stats, "stddev", convert=float, quiet=True),
-            "median": xml_subelement_attr(stats, "median", convert=float, quiet=True),
-            "owned": xml_subelement_attr(stats, "owned", convert=int, quiet=True),
-            "trading": xml_subelement_attr(stats, "trading", convert=int, quiet=True),
-            "wanting": xml_subelement_attr(stats, "wanting", convert=int, quiet=True),
-            "wishing": xml_subelement_attr(stats, "wishing", convert=int, quiet=True),
-            "numcomments": xml_subelement_attr(stats, "numcomments", convert=int, quiet=True),
-            "numweights": xml_subelement_attr(stats, "numweights", convert=int, quiet=True),
-            "averageweight": xml_subelement_attr(stats, "averageweight", convert=float, quiet=True),
-            "ranks": []
-        }
-
-        ranks = stats.findall("ranks/rank")
-        for rank in ranks:
-            try:
-                rank_value = int(rank.attrib.get("value"))
-            except:
-                rank_value = None
-            sd["ranks"].append({"id": rank.attrib["id"],
-                                "name": rank.attrib["name"],
-                                "friendlyname": rank.attrib.get("friendlyname"),
-                                "value": rank_value})
-
-        data["stats"] = sd
-
-        polls = xml_root.findall("poll")
-        data["suggested_players"] = {}
-        for poll in polls:
-            if poll.attrib.get("name") == "suggested_numplayers":
-                results = poll.findall('results')
-                data["suggested_players"]['total_votes'] = poll.attrib.get('totalvotes')
-                data["suggested_players"]['results'] = {}
-                for result in results:
-                    player_count = result.attrib.get("numplayers")
-                    if result.find("result[@value='Best']") is not None:
-                        data["suggested_players"]['results'][player_count] = {
-                            'best_rating': result.find("result[@value='Best']")
-                            .attrib.get("numvotes"),
-                            'recommended_rating': result
-                            .find("result[@value='Recommended']").attrib.get("numvotes"),
-                            'not_recommeded_rating': result
-                            .find("result[@value='Not Recommended']")
-                            .attrib.get("numvotes"),
-                        }
-                    else:
-                        ''' if there is only one poll player count and no votes recorded
-                            by default it is the the best player count '''
-                        data["suggested_players"]['results'][player_count] = {
-                            'best_rating': '1',
-                            'recommended_rating': '0',
-                            'not_recommeded_rating': '0',
-                        }
+def _rpg_fields():
+    # the fields shared by the RPG items and issues
+    return [Attribute("name", "name", type="primary"),
+            AttributeList("alternative_names", "name", type="alternate"),
+            Text("thumbnail", "thumbnail"),
+            Text("image", "image"),
+            AttributeList("systems", "link", type="rpg"),
+            AttributeList("categories", "link", type="rpgcategory"),
+            AttributeList("genres", "link", type="rpggenre"),
+            AttributeList("mechanics", "link", type="rpgmechanic"),
+            AttributeList("designers", "link", type="rpgdesigner"),
+            AttributeList("artists", "link", type="rpgartist"),
+            AttributeList("publishers", "link", type="rpgpublisher"),
+            AttributeList("producers", "link", type="rpgproducer"),
+            Text("description", "description", unescape=True)]
+
+
+BOARD_GAME_SCHEMA = ItemSchema([Attribute("name", "name", type="primary"),
+                                AttributeList("alternative_names", "name", type="alternate"),
+                                Text("thumbnail", "thumbnail"),
+                                Text("image", "image"),
+                                AttributeList("families", "link", type="boardgamefamily"),
+                                AttributeList("categories", "link", type="boardgamecategory"),
+                                AttributeList("implementations", "link", type="boardgameimplementation"),
+                                AttributeList("mechanics", "link", type="boardgamemechanic"),
+                                AttributeList("designers", "link", type="boardgamedesigner"),
+                                AttributeList("artists", "link", type="boardgameartist"),
+                                AttributeList("publishers", "link", type="boardgamepublisher"),
+                                Expansions("boardgameexpansion"),
+                                Text("description", "description", unescape=True),
+                                Attribute("yearpublished", "yearpublished", convert=int),
+                                Attribute("minplayers", "minplayers", convert=int),
+                                Attribute("maxplayers", "maxplayers", convert=int),
+                                Attribute("playingtime", "playingtime", convert=int),
+                                Attribute("minplaytime", "minplaytime", convert=int),
+                                Attribute("maxplaytime", "maxplaytime", convert=int),
+                                Attribute("minage", "minage", convert=int)],
+                               version_type="boardgameversion",
+                               polls=True)
+
+RPG_ITEM_SCHEMA = ItemSchema(_rpg_fields() + [Attribute("yearpublished", "yearpublished", convert=int)],
+                             version_type="rpgitemversion")
+
+RPG_ISSUE_SCHEMA = ItemSchema(_rpg_fields() + [Attribute("magazine", "link", type="rpgissue"),
+                                               Attribute("issue_number", "issueindex", convert=int),
+                                               Attribute("datepublished", "datepublished",
+                                                         convert=lambda x: datetime_parser.parse(x.replace("-00", "")),
+                                                         quiet=False)],
+                              version_type="rpgitemversion")
+
+#: the values of a board game which can be requested (see the ``fields`` argument of :py:func:`create_game_from_xml`)
+BOARD_GAME_FIELDS = frozenset(BOARD_GAME_SCHEMA.keys())
+
+_extract_board_game = compile_schema(BOARD_GAME_SCHEMA)
+_extract_rpg_item = compile_schema(RPG_ITEM_SCHEMA)
+_extract_rpg_issue = compile_schema(RPG_ISSUE_SCHEMA)
+
+
+def _create_game_from_xml(xml_root, game_id, game_type, html_parser, fields=None):
+    extract = _extract_board_game if fields is None else _board_game_extractor(frozenset(fields) | {"name"})
+    data = extract(xml_root, html_parser)
+    data["id"] = game_id
+    data["expansion"] = game_type == "boardgameexpansion"       # is this game an expansion?
+    data["accessory"] = game_type == "boardgameaccessory"       # is this game an accessory?
 
     return BoardGame(data)
 
-def _create_rpg_from_xml(xml_root, game_id, game_type, html_parser):
-    data = {"id": game_id,
-            "name": xml_subelement_attr(xml_root, "name[@type='primary']"),
-            "alternative_names": xml_subelement_attr_list(xml_root, "name[@type='alternate']"),
-            "thumbnail": xml_subelement_text(xml_root, "thumbnail"),
-            "image": xml_subelement_text(xml_root, "image"),
-            "systems": xml_subelement_attr_list(xml_root, "link[@type='rpg']"),
-            "categories": xml_subelement_attr_list(xml_root, "link[@type='rpgcategory']"),
-            "genres": xml_subelement_attr_list(xml_root, "link[@type='rpggenre']"),
-            "mechanics": xml_subelement_attr_list(xml_root, "link[@type='rpgmechanic']"),
-            "designers": xml_subelement_attr_list(xml_root, "link[@type='rpgdesigner']"),
-            "artists": xml_subelement_attr_list(xml_root, "link[@type='rpgartist']"),
-            "publishers": xml_subelement_attr_list(xml_root, "link[@type='rpgpublisher']"),
-            "producers": xml_subelement_attr_list(xml_root, "link[@type='rpgproducer']"),
-            "description": xml_subelement_text(xml_root, "description", convert=html_parser.unescape, quiet=True),
-            "yearpublished": xml_subelement_attr(xml_root, "yearpublished", convert=int, quiet=True)}
-
-    # Look for the videos
-    # TODO: The BGG API doesn't take the page=NNN parameter into account for videos; when it does, paginate them too
-    videos = xml_root.find("videos")
-    if videos is not None:
-        vid_list = []
-        for vid in videos.findall("video"):
-            try:
-                vd = {"id": vid.attrib["id"],
-                      "name": vid.attrib["title"],
-                      "category": vid.attrib.get("category"),
-                      "language": vid.attrib.get("language"),
-                      "link": vid.attrib["link"],
-                      "uploader": vid.attrib.get("username"),
-                      "uploader_id": vid.attrib.get("userid"),
-                      "post_date": vid.attrib.get("postdate")
-                      }
-                vid_list.append(vd)
-            except KeyError:
-                raise BGGApiError("malformed XML element ('video')")
-
-        data["videos"] = vid_list
-
-    # look for the versions
-    versions = xml_root.find("versions")
-    if versions is not None:
-        ver_list = []
-
-        for version in versions.findall("item[@type='rpgitemversion']"):
-            try:
-                vd = get_board_game_version_from_element(version)
-                ver_list.append(vd)
-            except KeyError:
-                raise BGGApiError("malformed XML element ('versions')")
-
-        data["versions"] = ver_list
-
-    # look for the statistics
-    stats = xml_root.find("statistics/ratings")
-    if stats is not None:
-        sd = {
-            "usersrated": xml_subelement_attr(stats, "usersrated", convert=int, quiet=True),
-            "average": xml_subelement_attr(stats, "average", convert=float, quiet=True),
-            "bayesaverage": xml_subelement_attr(stats, "bayesaverage", convert=float, quiet=True),
-            "stddev": xml_subelement_attr(stats, "stddev", convert=float, quiet=True),
-            "median": xml_subelement_attr(stats, "median", convert=float, quiet=True),
-            "owned": xml_subelement_attr(stats, "owned", convert=int, quiet=True),
-            "trading": xml_subelement_attr(stats, "trading", convert=int, quiet=True),
-            "wanting": xml_subelement_attr(stats, "wanting", convert=int, quiet=True),
-            "wishing": xml_subelement_attr(stats, "wishing", convert=int, quiet=True),
-            "numcomments": xml_subelement_attr(stats, "numcomments", convert=int, quiet=True),
-            "numweights": xml_subelement_attr(stats, "numweights", convert=int, quiet=True),
-            "averageweight": xml_subelement_attr(stats, "averageweight", convert=float, quiet=True),
-            "ranks": []
-        }
-
-        ranks = stats.findall("ranks/rank")
-        for rank in ranks:
+
+def create_lazy_game_from_bytes(xml, game_id, html_parser, parser=None):
+    """
+    Creates a :py:class:`boardgamegeek.objects.games.LazyBoardGame` from the XML of its ``item`` node, which isn't
+    parsed until the game's information is used
+
+    :param bytes xml: the ``item`` XML node of a board game, serialized
+    :param int game_id: the id of the game
+    :param html_parser: the parser used for unescaping the description
+    :param parser: the parser backend (see :py:mod:`boardgamegeek.parsers`), the standard library's if not set
+    :return: the game
+    """
+    return LazyBoardGame(game_id, _LazyGameReader(xml, html_parser, parser=parser))
+
+
+# the extractors reading some of the values of a board game, by the keys they read
+_board_game_extractors = {}
+
+
+def _board_game_extractor(keys):
+    extract = _board_game_extractors.get(keys)
+    if extract is None:
+        extract = _board_game_extractors.setdefault(keys, compile_schema(BOARD_GAME_SCHEMA, keys=keys))
+    return extract
+
+
+class _LazyGameReader(object):
+    """
+    Reads the data of a board game (or just some of its keys) from its XML node, or from the serialized node, which
+    is parsed the first time it's needed. It's pickled with the node serialized (lxml elements can't be pickled), which
+    is parsed with the standard library's parser when it's unpickled.
+    """
+    def __init__(self, xml, html_parser, parser=None, fields=None):
+        self._xml = xml
+        self._html_parser = html_parser
+        self._parser = parser if parser is not None else DEFAULT_PARSER
+        self._fields = frozenset(fields) | {"name"} if fields is not None else None
+
+    def __call__(self, keys):
+        if self._fields is not None:
+            keys = self._fields if keys is None else [key for key in keys if key in self._fields]
+
+        if isinstance(self._xml, bytes):
             try:
-                rank_value = int(rank.attrib.get("value"))
-            except:
-                rank_value = None
-            sd["ranks"].append({"id": rank.attrib["id"],
-                                "name": rank.attrib["name"],
-                                "friendlyname": rank.attrib.get("friendlyname"),
-                                "value": rank_value})
+                self._xml = self._parser.fromstring(self._xml)
+            except self._parser.errors as e:
+                raise BGGApiError("error decoding BGG API response: {}".format(e))
+
+        data = _board_game_extractor(frozenset(keys) if keys is not None else None)(self._xml, self._html_parser)
 
-        data["stats"] = sd
+        game_type = self._xml.attrib["type"]
+        data["expansion"] = game_type == "boardgameexpansion"
+        data["accessory"] = game_type == "boardgameaccessory"
+        return data
+
+    def __reduce__(self):
+        xml = self._xml if isinstance(self._xml, bytes) else parser_of(self._xml).tostring(self._xml)
+        return _LazyGameReader, (xml, self._html_parser, None, self._fields)
+
+
+def _create_rpg_from_xml(xml_root, game_id, game_type, html_parser):
+    data = _extract_rpg_item(xml_root, html_parser)
+    data["id"] = game_id
 
     return RPGGame(data)
 
+
 def _create_rpgissue_from_xml(xml_root, game_id, game_type, html_parser):
-    data = {"id": game_id,
-            "name": xml_subelement_attr(xml_root, "name[@type='primary']"),
-            "alternative_names": xml_subelement_attr_list(xml_root, "name[@type='alternate']"),
-            "magazine": xml_subelement_attr(xml_root, "link[@type='rpgissue']"),
-            "issue_number": xml_subelement_attr(xml_root, "issueindex", convert=int, quiet=True),
-            "thumbnail": xml_subelement_text(xml_root, "thumbnail"),
-            "image": xml_subelement_text(xml_root, "image"),
-            "systems": xml_subelement_attr_list(xml_root, "link[@type='rpg']"),
-            "categories": xml_subelement_attr_list(xml_root, "link[@type='rpgcategory']"),
-            "genres": xml_subelement_attr_list(xml_root, "link[@type='rpggenre']"),
-            "mechanics": xml_subelement_attr_list(xml_root, "link[@type='rpgmechanic']"),
-            "designers": xml_subelement_attr_list(xml_root, "link[@type='rpgdesigner']"),
-            "artists": xml_subelement_attr_list(xml_root, "link[@type='rpgartist']"),
-            "publishers": xml_subelement_attr_list(xml_root, "link[@type='rpgpublisher']"),
-            "producers": xml_subelement_attr_list(xml_root, "link[@type='rpgproducer']"),
-            "description": xml_subelement_text(xml_root, "description", convert=html_parser.unescape, quiet=True),
-            "datepublished": xml_subelement_attr(xml_root, "datepublished", convert=lambda x: datetime_parser.parse(x.replace("-00", "")), quiet=False)}
+    data = _extract_rpg_issue(xml_root, html_parser)
+    data["id"] = game_id
     data['yearpublished'] = data['datepublished'].year
-    # Look for the videos
-    # TODO: The BGG API doesn't take the page=NNN parameter into account for videos; when it does, paginate them too
-    videos = xml_root.find("videos")
-    if videos is not None:
-        vid_list = []
-        for vid in videos.findall("video"):
-            try:
-                vd = {"id": vid.attrib["id"],
-                      "name": vid.attrib["title"],
-                      "category": vid.attrib.get("category"),
-                      "language": vid.attrib.get("language"),
-                      "link": vid.attrib["link"],
-                      "uploader": vid.attrib.get("username"),
-                      "uploader_id": vid.attrib.get("userid"),
-                      "post_date": vid.attrib.get("postdate")
-                      }
-                vid_list.append(vd)
-            except KeyError:
-                raise BGGApiError("malformed XML element ('video')")
-
-        data["videos"] = vid_list
-
-    # look for the versions
-    versions = xml_root.find("versions")
-    if versions is not None:
-        ver_list = []
-
-        for version in versions.findall("item[@type='rpgitemversion']"):
-            try:
-                vd = get_board_game_version_from_element(version)
-                ver_list.append(vd)
-            except KeyError:
-                raise BGGApiError("malformed XML element ('versions')")
-
-        data["versions"] = ver_list
-
-    # look for the statistics
-    stats = xml_root.find("statistics/ratings")
-    if stats is not None:
-        sd = {
-            "usersrated": xml_subelement_attr(stats, "usersrated", convert=int, quiet=True),
-            "average": xml_subelement_attr(stats, "average", convert=float, quiet=True),
-            "bayesaverage": xml_subelement_attr(stats, "bayesaverage", convert=float, quiet=True),
-            "stddev": xml_subelement_attr(stats, "stddev", convert=float, quiet=True),
-            "median": xml_subelement_attr(stats, "median", convert=float, quiet=True),
-            "owned": xml_subelement_attr(stats, "owned", convert=int, quiet=True),
-            "trading": xml_subelement_attr(stats, "trading", convert=int, quiet=True),
-            "wanting": xml_subelement_attr(stats, "wanting", convert=int, quiet=True),
-            "wishing": xml_subelement_attr(stats, "wishing", convert=int, quiet=True),
-            "numcomments": xml_subelement_attr(stats, "numcomments", convert=int, quiet=True),
-            "numweights": xml_subelement_attr(stats, "numweights", convert=int, quiet=True),
-            "averageweight": xml_subelement_attr(stats, "averageweight", convert=float, quiet=True),
-            "ranks": []
-        }
-
-        ranks = stats.findall("ranks/rank")
-        for rank in ranks:
-            try:
-                rank_value = int(rank.attrib.get("value"))
-            except:
-                rank_value = None
-            sd["ranks"].append({"id": rank.attrib["id"],
-                                "name": rank.attrib["name"],
-                                "friendlyname": rank.attrib.get("friendlyname"),
-                                "value": rank_value})
-
-        data["stats"] = sd
 
     issue = RPGIssue(data)
     _add_linked_articles(issue)
@@ -361,23 +208,68 @@ def _add_linked_articles(rpgissue):
         rpgissue.add_article(data)
 
         
-def add_game_comments_from_xml(game, xml_root):
+def get_game_ranks_from_xml(xml_items):
+    """
+    Reads only the ranks of the games returned by the /thing API (called with ``stats=1``), without creating the
+    games
+
+    :param xml_items: the ``item`` XML nodes (e.g. a :py:class:`boardgamegeek.utils.XMLItemStream`)
+    :return: dictionary mapping the id of each game to its rank (as returned by
+             :py:attr:`boardgamegeek.objects.games.BoardGame.bgg_rank`), ``None`` if it's not ranked
+    """
+
+    ranks = {}
+
+    for item in xml_items:
+        rank_list = []
+        for rank in item.findall("statistics/ratings/ranks/rank"):
+            try:
+                rank_value = int(rank.attrib.get("value"))
+            except:
+                rank_value = None
+            rank_list.append({"id": rank.attrib["id"],
+                              "name": rank.attrib["name"],
+                              "friendlyname": rank.attrib.get("friendlyname"),
+                              "value": rank_value})
+
+        stats = GameStats({"ranks": rank_list})
+        ranks[int(item.attrib["id"])] = stats.bgg_rank if rank_list else None
+
+    return ranks
+
+
+def get_game_comments_from_xml(xml_root):
+    """
+    Parses a page of comments of a game
 
-    added_items = False
+    :param xml_root: the ``item`` XML node of the game
+    :return: a tuple containing the list of comments (as dictionaries) and the total number of comments reported
+             by the server
+    """
+
+    comments = []
     total_comments = 0
 
     # TODO: this is not working (API PROBLEM??)
-    comments = xml_root.find("comments")
-    if comments is not None:
-        total_comments = int(comments.attrib["totalitems"])
+    comments_node = xml_root.find("comments")
+    if comments_node is not None:
+        total_comments = int(comments_node.attrib["totalitems"])
 
-        for comm in xml_root.findall("comments/comment"):
-            comment = {
+        for comm in comments_node.findall("comment"):
+            comments.append({
                 "username": comm.attrib["username"],
                 "rating": comm.attrib.get("rating", "n/a").lower(),
                 "comment": comm.attrib.get("value", "n/a")
-            }
-            added_items = True
-            game.add_comment(comment)
+            })
+
+    return comments, total_comments
+
+
+def add_game_comments_from_xml(game, xml_root):
+
+    comments, total_comments = get_game_comments_from_xml(xml_root)
+
+    for comment in comments:
+        game.add_comment(comment)
 
-    return added_items, total_comments
+    return len(comments) > 0, total_comments
@@ -36,37 +36,60 @@ def add_plays_from_xml(plays, xml_root):
     added_items = False
 
     for play in xml_root.findall("play"):
+        add_play_from_xml(plays, play)
+        added_items = True
+
+    return added_items
+
+
+def add_plays_from_xml_stream(plays, xml_stream):
+    """
+    Adds the plays from a reply which is parsed incrementally, each play being added as soon as it's parsed
 
-        player_list = []
-        for player in play.findall("players/player"):
-            player_data = {"username": player.attrib.get("username"),
-                           "user_id": int(player.attrib.get("userid", -1)),
-                           "name": player.attrib.get("name"),
-                           "startposition": player.attrib.get("startposition"),
-                           "new": player.attrib.get("new"),
-                           "win": player.attrib.get("win"),
-                           "rating": player.attrib.get("rating"),
-                           "score": player.attrib.get("score"),
-                           "color": player.attrib.get("color"),
-                           "location": player.attrib.get("location")}
-
-            player_list.append(player_data)
-
-        # TODO: add the game subtype too
-        data = {"id": int(play.attrib["id"]),
-                "date": play.attrib["date"],
-                "quantity": int(play.attrib["quantity"]),
-                "duration": int(play.attrib["length"]),
-                "incomplete": int(play.attrib["incomplete"]),
-                "nowinstats": int(play.attrib["nowinstats"]),
-                # for User plays, will be overwritten with the user id when adding the play.
-                "user_id": int(play.attrib.get("userid", -1)),
-                "game_id": xml_subelement_attr(play, "item", attribute="objectid", convert=int),
-                "game_name": xml_subelement_attr(play, "item", attribute="name"),
-                "comment": xml_subelement_text(play, "comments"),
-                "players": player_list}
-
-        plays.add_play(data)
+    :param plays: the object to add the plays to
+    :param xml_stream: the reply's ``play`` items
+    :type xml_stream: :py:class:`boardgamegeek.utils.XMLItemStream`
+    :return: True if at least a play was added, False otherwise
+    """
+
+    added_items = False
+
+    for play in xml_stream:
+        add_play_from_xml(plays, play)
         added_items = True
 
     return added_items
+
+
+def add_play_from_xml(plays, play):
+
+    player_list = []
+    for player in play.findall("players/player"):
+        player_data = {"username": player.attrib.get("username"),
+                       "user_id": int(player.attrib.get("userid", -1)),
+                       "name": player.attrib.get("name"),
+                       "startposition": player.attrib.get("startposition"),
+                       "new": player.attrib.get("new"),
+                       "win": player.attrib.get("win"),
+                       "rating": player.attrib.get("rating"),
+                       "score": player.attrib.get("score"),
+                       "color": player.attrib.get("color"),
+                       "location": player.attrib.get("location")}
+
+        player_list.append(player_data)
+
+    # TODO: add the game subtype too
+    data = {"id": int(play.attrib["id"]),
+            "date": play.attrib["date"],
+            "quantity": int(play.attrib["quantity"]),
+            "duration": int(play.attrib["length"]),
+            "incomplete": int(play.attrib["incomplete"]),
+            "nowinstats": int(play.attrib["nowinstats"]),
+            # for User plays, will be overwritten with the user id when adding the play.
+            "user_id": int(play.attrib.get("userid", -1)),
+            "game_id": xml_subelement_attr(play, "item", attribute="objectid", convert=int),
+            "game_name": xml_subelement_attr(play, "item", attribute="name"),
+            "comment": xml_subelement_text(play, "comments"),
+            "players": player_list}
+
+    plays.add_play(data)
@@ -0,0 +1,354 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.loaders.schema` - Item schemas
+==================================================
+
+The items returned by the ``/thing`` and ``/family`` APIs (board games, RPG items, RPG issues, families) share most
+of their structure: names, links, videos, versions, statistics. Each item type is described by an
+:py:class:`ItemSchema`, a list of fields telling which element each value comes from, and
+:py:func:`compile_schema` turns it into an extractor function. The extractor walks the children of an item once,
+dispatching each of them on its tag (and ``type`` attribute) with tables built when the schema is compiled, so adding
+an item type doesn't duplicate any parsing code.
+
+.. module:: boardgamegeek.loaders.schema
+   :platform: Unix, Windows
+   :synopsis: declarative description of the items returned by the API
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+"""
+from __future__ import unicode_literals
+
+from ..exceptions import BGGApiError, BGGValueError
+from ..utils import get_board_game_version_from_element
+
+
+# what the extractor does with an element
+_LIST, _FIRST_ATTRIBUTE, _FIRST_TEXT, _FIRST_UNESCAPED_TEXT, _EXPANSION = range(5)
+
+_RATINGS_FIELDS = {"usersrated": int,
+                   "average": float,
+                   "bayesaverage": float,
+                   "stddev": float,
+                   "median": float,
+                   "owned": int,
+                   "trading": int,
+                   "wanting": int,
+                   "wishing": int,
+                   "numcomments": int,
+                   "numweights": int,
+                   "averageweight": float}
+
+
+class Attribute(object):
+    """
+    The ``value`` attribute of the first element with a tag (and ``type``)
+
+    :param str key: the key of the value in the item's data
+    :param str tag: the tag of the element
+    :param str type: if set, only the elements with this ``type`` attribute match
+    :param callable convert: if set, converts the value
+    :param bool quiet: if ``True``, a value which can't be converted becomes ``None``, otherwise the error is raised
+    """
+    action = _FIRST_ATTRIBUTE
+
+    def __init__(self, key, tag, type=None, convert=None, quiet=True):
+        self.key = key
+        self.tag = tag
+        self.type = type
+        self.convert = convert
+        self.quiet = quiet
+
+    def default(self):
+        return None
+
+
+class AttributeList(Attribute):
+    """
+    The ``value`` attributes of all the elements with a tag (and ``type``), in document order
+    """
+    action = _LIST
+
+    def __init__(self, key, tag, type=None):
+        super(AttributeList, self).__init__(key, tag, type=type)
+
+    def default(self):
+        return []
+
+
+class Text(Attribute):
+    """
+    The text of the first element with a tag
+
+    :param bool unescape: if ``True``, the HTML entities of the text are replaced (with the ``html_parser`` given to
+                          the extractor)
+    """
+    def __init__(self, key, tag, unescape=False):
+        super(Text, self).__init__(key, tag)
+        self.action = _FIRST_UNESCAPED_TEXT if unescape else _FIRST_TEXT
+
+
+class Expansions(Attribute):
+    """
+    The links to the expansions of a game, split in ``expansions`` (the expansions of the game) and ``expands`` (the
+    games it expands, the ``inbound`` links), as lists of dictionaries with the ``id`` and ``name`` of each game
+
+    :param str type: the ``type`` of the links
+    """
+    action = _EXPANSION
+
+    def __init__(self, type):
+        super(Expansions, self).__init__("expansions", "link", type=type)
+
+
+class ItemSchema(object):
+    """
+    Describes an item type. Besides its fields, each item may have videos (stored as ``videos``), versions
+    (``versions``) and statistics (``stats``), which are read when present.
+
+    :param list fields: the fields (:py:class:`Attribute`, :py:class:`AttributeList`, :py:class:`Text`,
+                        :py:class:`Expansions`)
+    :param str version_type: the ``type`` of the versions of the item
+    :param bool polls: read the suggested number of players poll (as ``suggested_players``, only when the statistics
+                       are present)
+    """
+    def __init__(self, fields, version_type, polls=False):
+        self.fields = list(fields)
+        self.version_type = version_type
+        self.polls = polls
+
+    def keys(self):
+        """
+        :return: the keys of the values which may be extracted for an item
+        :rtype: set
+        """
+        keys = {"videos", "versions", "stats"}
+        if self.polls:
+            keys.add("suggested_players")
+        for field in self.fields:
+            keys.update(["expansions", "expands"] if isinstance(field, Expansions) else [field.key])
+        return keys
+
+
+def _convert_quietly(value, convert):
+    if value is None:
+        return None
+    try:
+        return convert(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def compile_schema(schema, keys=None):
+    """
+    Builds the function extracting the data of the items described by a schema
+
+    :param schema: the :py:class:`ItemSchema`
+    :param keys: if set, only the values with these keys are extracted (e.g. ``["name", "stats"]``), the elements
+                 holding the other ones are skipped
+    :return: a function taking the XML element of an item and the HTML parser used for unescaping, returning the
+             data of the item, as a dictionary
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if several fields match the same elements
+    """
+    by_tag = {}             # tag -> (action, key, convert, quiet), for the fields which don't check the type
+    by_type = {}            # tag -> type -> (action, key, convert, quiet)
+    list_keys = []
+    defaults = {}
+
+    def wanted(*field_keys):
+        return keys is None or any(key in keys for key in field_keys)
+
+    for field in schema.fields:
+        if isinstance(field, Expansions):
+            if not wanted("expansions", "expands"):
+                continue
+        elif not wanted(field.key):
+            continue
+
+        if field.tag in by_tag or field.type in by_type.get(field.tag, {}) or \
+                (field.type is None and field.tag in by_type):
+            raise BGGValueError("several fields match the <{}> elements".format(field.tag))
+
+        match = (field.action, field.key, field.convert, field.quiet)
+        if field.type is None:
+            by_tag[field.tag] = match
+        else:
+            by_type.setdefault(field.tag, {})[field.type] = match
+
+        if isinstance(field, Expansions):
+            list_keys.extend(["expansions", "expands"])
+        elif field.action == _LIST:
+            list_keys.append(field.key)
+        else:
+            defaults[field.key] = field.default()
+
+    version_type = schema.version_type
+    read_videos = wanted("videos")
+    read_versions = wanted("versions")
+    read_stats = wanted("stats")
+    read_polls = schema.polls and wanted("suggested_players")
+    read_statistics = read_stats or read_polls
+    by_tag_get = by_tag.get
+    by_type_get = by_type.get
+
+    def extract(xml_root, html_parser):
+        data = dict(defaults)
+        for key in list_keys:
+            data[key] = []
+
+        seen = set()        # the fields of which only the first element is used
+        videos = versions = ratings = None
+        polls = []
+
+        for child in xml_root:
+            tag = child.tag
+            match = by_tag_get(tag)
+            if match is None:
+                types = by_type_get(tag)
+                if types is not None:
+                    match = types.get(child.get("type"))
+
+            if match is not None:
+                action, key, convert, quiet = match
+                if action == _LIST:
+                    data[key].append(child.get("value"))
+                elif key in seen:
+                    continue
+                elif action == _FIRST_ATTRIBUTE:
+                    seen.add(key)
+                    value = child.get("value")
+                    if convert is None or value is None:
+                        data[key] = value
+                    elif quiet:
+                        data[key] = _convert_quietly(value, convert)
+                    else:
+                        data[key] = convert(value)
+                elif action == _FIRST_TEXT:
+                    seen.add(key)
+                    data[key] = child.text
+                elif action == _FIRST_UNESCAPED_TEXT:
+                    seen.add(key)
+                    data[key] = _convert_quietly(child.text, html_parser.unescape)
+                else:
+                    data["expands" if _is_inbound(child) else "expansions"].append(_expansion_from_xml(child))
+            elif tag == "poll":
+                if read_polls:
+                    polls.append(child)
+            elif tag == "videos":
+                if videos is None and read_videos:
+                    videos = child
+            elif tag == "versions":
+                if versions is None and read_versions:
+                    versions = child
+            elif tag == "statistics":
+                if ratings is None and read_statistics:
+                    ratings = child.find("ratings")
+
+        # TODO: The BGG API doesn't take the page=NNN parameter into account for videos; when it does, paginate them too
+        if videos is not None:
+            data["videos"] = [_video_from_xml(video) for video in videos.findall("video")]
+
+        if versions is not None:
+            data["versions"] = _versions_from_xml(versions, version_type)
+
+        if ratings is not None:
+            if read_stats:
+                data["stats"] = _ratings_from_xml(ratings)
+            if read_polls:
+                data["suggested_players"] = _suggested_players_from_xml(polls)
+
+        return data
+
+    return extract
+
+
+def _is_inbound(link):
+    return link.get("inbound", "false").lower()[0] == 't'
+
+
+def _expansion_from_xml(link):
+    try:
+        return {"id": link.attrib["id"], "name": link.attrib["value"]}
+    except KeyError:
+        raise BGGApiError("malformed XML element ('link type={}')".format(link.get("type")))
+
+
+def _video_from_xml(video):
+    try:
+        return {"id": video.attrib["id"],
+                "name": video.attrib["title"],
+                "category": video.attrib.get("category"),
+                "language": video.attrib.get("language"),
+                "link": video.attrib["link"],
+                "uploader": video.attrib.get("username"),
+                "uploader_id": video.attrib.get("userid"),
+                "post_date": video.attrib.get("postdate")}
+    except KeyError:
+        raise BGGApiError("malformed XML element ('video')")
+
+
+def _versions_from_xml(versions, version_type):
+    ver_list = []
+    for version in versions:
+        if version.tag != "item" or version.get("type") != version_type:
+            continue
+        try:
+            ver_list.append(get_board_game_version_from_element(version))
+        except KeyError:
+            raise BGGApiError("malformed XML element ('versions')")
+    return ver_list
+
+
+def _ratings_from_xml(ratings):
+    sd = dict.fromkeys(_RATINGS_FIELDS)
+    sd["ranks"] = []
+
+    seen = set()
+    for child in ratings:
+        tag = child.tag
+        if tag == "ranks":
+            for rank in child:
+                if rank.tag != "rank":
+                    continue
+                try:
+                    rank_value = int(rank.get("value"))
+                except (TypeError, ValueError):
+                    rank_value = None
+                sd["ranks"].append({"id": rank.attrib["id"],
+                                    "name": rank.attrib["name"],
+                                    "friendlyname": rank.get("friendlyname"),
+                                    "value": rank_value})
+        elif tag in _RATINGS_FIELDS and tag not in seen:
+            seen.add(tag)
+            sd[tag] = _convert_quietly(child.get("value"), _RATINGS_FIELDS[tag])
+
+    return sd
+
+
+def _suggested_players_from_xml(polls):
+    suggested_players = {}
+    for poll in polls:
+        if poll.get("name") != "suggested_numplayers":
+            continue
+
+        suggested_players['total_votes'] = poll.get('totalvotes')
+        suggested_players['results'] = {}
+        for result in poll:
+            if result.tag != "results":
+                continue
+            votes = {}
+            for vote in result:
+                votes.setdefault(vote.get("value"), vote.get("numvotes"))
+
+            if "Best" in votes:
+                counts = {'best_rating': votes["Best"],
+                          'recommended_rating': votes.get("Recommended"),
+                          'not_recommeded_rating': votes.get("Not Recommended")}
+            else:
+                # if there is only one poll player count and no votes recorded by default it is the the best player
+                # count
+                counts = {'best_rating': '1',
+                          'recommended_rating': '0',
+                          'not_recommeded_rating': '0'}
+            suggested_players['results'][result.get("numplayers")] = counts
+
+    return suggested_players
@@ -0,0 +1,20 @@
+from ..objects.search import SearchResult
+from ..utils import xml_subelement_attr
+
+
+def create_search_results_from_xml(xml_root):
+
+    results = []
+    for item in xml_root.findall("item"):
+        kwargs = {"id": item.attrib["id"],
+                  "name": xml_subelement_attr(item, "name"),
+                  "yearpublished": xml_subelement_attr(item,
+                                                       "yearpublished",
+                                                       default=0,
+                                                       convert=int,
+                                                       quiet=True),
+                  "type": item.attrib["type"]}
+
+        results.append(SearchResult(kwargs))
+
+    return results
@@ -0,0 +1,88 @@
+import datetime
+import logging
+
+from ..objects.user import User
+from ..exceptions import BGGItemNotFoundError
+from ..utils import xml_subelement_attr
+
+
+log = logging.getLogger("boardgamegeek.loaders.user")
+
+
+def create_user_from_xml(xml_root):
+
+    # when the user is not found, the API returns an response, but with most fields empty. id is empty too
+    try:
+        data = {"name": xml_root.attrib["name"],
+                "id": int(xml_root.attrib["id"])}
+    except (KeyError, ValueError):
+        raise BGGItemNotFoundError
+
+    for i in ["firstname", "lastname", "avatarlink",
+              "stateorprovince", "country", "webaddress", "xboxaccount",
+              "wiiaccount", "steamaccount", "psnaccount", "traderating"]:
+        data[i] = xml_subelement_attr(xml_root, i)
+
+    data["yearregistered"] = xml_subelement_attr(xml_root, "yearregistered", convert=int, quiet=True)
+    data["lastlogin"] = xml_subelement_attr(xml_root,
+                                            "lastlogin",
+                                            convert=lambda x: datetime.datetime.strptime(x, "%Y-%m-%d"),
+                                            quiet=True)
+
+    user = User(data)
+
+    # add top items
+    for top_item in xml_root.findall(".//top/item"):
+        user.add_top_item({"id": int(top_item.attrib["id"]),
+                           "name": top_item.attrib["name"]})
+
+    # add hot items
+    for hot_item in xml_root.findall(".//hot/item"):
+        user.add_hot_item({"id": int(hot_item.attrib["id"]),
+                           "name": hot_item.attrib["name"]})
+
+    return user
+
+
+def get_user_buddies_and_guilds_totals_from_xml(xml_root):
+    """
+    Returns the total number of buddies and guilds of an user, as reported by the server
+
+    :param xml_root: XML node (first page of the user's data)
+    :return: (total buddies, total guilds)
+    """
+    total_buddies = 0
+    total_guilds = 0
+
+    buddies = xml_root.find("buddies")
+    if buddies is not None:
+        total_buddies = int(buddies.attrib["total"])
+
+    guilds = xml_root.find("guilds")
+    if guilds is not None:
+        total_guilds = int(guilds.attrib["total"])
+
+    return total_buddies, total_guilds
+
+
+def add_user_buddies_and_guilds_from_xml(user, xml_root):
+    """
+    Processes the XML and adds buddies and guilds to ``user``
+
+    :param user: the :py:class:`boardgamegeek.User` object to add buddies and guilds to
+    :param xml_root: XML node
+    :return: True if at least a buddy or a guild was added, False otherwise
+    """
+    added_items = False
+
+    for buddy in xml_root.findall(".//buddy"):
+        user.add_buddy({"name": buddy.attrib["name"],
+                        "id": buddy.attrib["id"]})
+        added_items = True
+
+    for guild in xml_root.findall(".//guild"):
+        user.add_guild({"name": guild.attrib["name"],
+                        "id": guild.attrib["id"]})
+        added_items = True
+
+    return added_items
@@ -1,9 +1,13 @@
 from __future__ import unicode_literals
+import os
 import sys
 import argparse
 import logging
 
 from boardgamegeek.api import BGGClient, HOT_ITEM_CHOICES
+from boardgamegeek.cache import vacuum_database
+from boardgamegeek.exceptions import BGGValueError
+from boardgamegeek.warm import main as warm_main
 
 log = logging.getLogger("boardgamegeek")
 log_fmt = "[%(levelname)s] %(message)s"
@@ -37,8 +41,39 @@ def brief_game_stats(game):
     log.info("MY SCORE    : {}".format(my_score))
 
 
+def vacuum_main(argv=None):
+    """
+    Entry point of ``boardgamegeek vacuum``, compacting a cache database
+
+    :param list argv: the command line arguments (``sys.argv[1:]`` if not set)
+    :return: the exit code
+    """
+    p = argparse.ArgumentParser(prog="boardgamegeek vacuum",
+                                description="Compacts a SQLite cache database, dropping the expired responses")
+    p.add_argument("path", help="path of the SQLite cache database")
+    args = p.parse_args(argv)
+
+    try:
+        size_before = os.path.getsize(args.path) if os.path.isfile(args.path) else 0
+        size_after = vacuum_database(args.path)
+    except BGGValueError as e:
+        p.error(str(e))
+
+    sys.stdout.write("{}: {} bytes, was {} bytes\n".format(args.path, size_after, size_before))
+    return 0
+
+
 def main():
-    p = argparse.ArgumentParser(prog="boardgamegeek")
+    # subcommands (the Python 2 argparse doesn't support optional subparsers)
+    if len(sys.argv) > 1 and sys.argv[1] == "warm":
+        sys.exit(warm_main(sys.argv[2:]))
+
+    if len(sys.argv) > 1 and sys.argv[1] == "vacuum":
+        sys.exit(vacuum_main(sys.argv[2:]))
+
+    p = argparse.ArgumentParser(prog="boardgamegeek",
+                                epilog="run 'boardgamegeek warm --help' for filling a cache database ahead of time, "
+                                       "'boardgamegeek vacuum --help' for compacting one")
 
     p.add_argument("-u", "--user", help="Query by user name")
     p.add_argument("-g", "--game", help="Query by game name")
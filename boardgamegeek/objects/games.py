@@ -66,6 +66,7 @@ class GameStats(DictObject):
     """
     def __init__(self, data):
         self._ranks = []
+        self._bgg_rank = None
 
         for rank in data.get("ranks", []):
             try:
@@ -416,32 +417,59 @@ class BoardGameVersion(Thing):
         return self._data.get("yearpublished")
 
 
+def _unique_things(items, thing_class, error):
+    """
+    Creates the objects for a list of items, skipping the duplicates
+
+    :param list items: the data of the items, as dictionaries
+    :param thing_class: the class of the objects
+    :param str error: message of the exception raised for invalid data
+    :return: the list of objects and the set of their ids
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGError` if an item's data is invalid
+    """
+    things = []
+    ids = set()
+    for item in items:
+        try:
+            if item["id"] not in ids:
+                things.append(thing_class(item))
+                ids.add(item["id"])
+        except KeyError:
+            raise BGGError(error)
+    return things, ids
+
+
+def _player_suggestions(suggested_players):
+    suggestions = []
+    if suggested_players and "results" in suggested_players:
+        for count, result in suggested_players['results'].items():
+            suggestion_data = {
+                'player_count': count,
+                'best': int(result['best_rating']),
+                'recommended': int(result['recommended_rating']),
+                'not_recommended': int(result['not_recommeded_rating']),
+            }
+            suggestions.append(PlayerSuggestion(suggestion_data))
+    return suggestions
+
+
 class BaseGame(Thing):
 
     def __init__(self, data):
 
         self._thumbnail = fix_url(data["thumbnail"]) if "thumbnail" in data else None
         self._image = fix_url(data["image"]) if "image" in data else None
-        if "stats" not in data:
-            raise BGGError("invalid data")
 
-        self._stats = GameStats(data["stats"])
-
-        self._versions = []
-        self._versions_set = set()
+        # the statistics are missing if they weren't requested
+        self._stats = GameStats(data.get("stats") or {})
 
         try:
             self._year_published = fix_unsigned_negative(data["yearpublished"])
         except:
             self._year_published = None
 
-        for version in data.get("versions", []):
-            try:
-                if version["id"] not in self._versions_set:
-                    self._versions.append(BoardGameVersion(version))
-                    self._versions_set.add(version["id"])
-            except KeyError:
-                raise BGGError("invalid version data")
+        self._versions, self._versions_set = _unique_things(data.get("versions", []), BoardGameVersion,
+                                                            "invalid version data")
 
         super(BaseGame, self).__init__(data)
 
@@ -737,50 +765,20 @@ class BoardGame(BaseGame):
     """
     def __init__(self, data):
 
-        self._expansions = []                      # list of Thing for the expansions
-        self._expansions_set = set()               # set for making sure things are unique
-        for exp in data.get("expansions", []):
-            try:
-                if exp["id"] not in self._expansions_set:
-                    self._expansions_set.add(exp["id"])
-                    self._expansions.append(Thing(exp))
-            except KeyError:
-                raise BGGError("invalid expansion data")
-
-        self._expands = []                         # list of Thing which this item expands
-        self._expands_set = set()                  # set for keeping things unique
-        for exp in data.get("expands", []):        # for all the items this game expands, create a Thing
-            try:
-                if exp["id"] not in self._expands_set:
-                    self._expands_set.add(exp["id"])
-                    self._expands.append(Thing(exp))
-            except KeyError:
-                raise BGGError("invalid expanded game data")
-
-        self._videos = []
-        self._videos_ids = set()
-        for video in data.get("videos", []):
-            try:
-                if video["id"] not in self._videos_ids:
-                    self._videos.append(BoardGameVideo(video))
-                    self._videos_ids.add(video["id"])
-            except KeyError:
-                raise BGGError("invalid video data")
+        # lists of Thing for the expansions and for the items this game expands, and sets of their ids
+        self._expansions, self._expansions_set = _unique_things(data.get("expansions", []), Thing,
+                                                                "invalid expansion data")
+        self._expands, self._expands_set = _unique_things(data.get("expands", []), Thing,
+                                                          "invalid expanded game data")
+
+        self._videos, self._videos_ids = _unique_things(data.get("videos", []), BoardGameVideo,
+                                                        "invalid video data")
 
         self._comments = []
         for comment in data.get("comments", []):
             self.add_comment(comment)
 
-        self._player_suggestion = []
-        if "suggested_players" in data and "results" in data['suggested_players']:
-            for count, result in data['suggested_players']['results'].items():
-                suggestion_data = {
-                    'player_count': count,
-                    'best': int(result['best_rating']),
-                    'recommended': int(result['recommended_rating']),
-                    'not_recommended': int(result['not_recommeded_rating']),
-                }
-                self._player_suggestion.append(PlayerSuggestion(suggestion_data))
+        self._player_suggestion = _player_suggestions(data.get("suggested_players"))
 
         super(BoardGame, self).__init__(data)
 
@@ -1120,3 +1118,170 @@ class BoardGame(BaseGame):
         :rtype: list of dicts
         """
         return self._player_suggestion
+
+
+class _lazy_attribute(object):
+    """
+    Decorator for a method computing an attribute of the object the first time it's read. The value is stored in the
+    object (under the method's name), so the method isn't called again.
+    """
+    def __init__(self, compute):
+        self._compute = compute
+        self._name = compute.__name__
+
+    def __get__(self, obj, cls):
+        if obj is None:
+            return self
+        value = obj.__dict__[self._name] = self._compute(obj)
+        return value
+
+
+class _LazyData(dict):
+    """
+    The data of a :py:class:`LazyBoardGame`: a dictionary whose values are read when they're first looked up
+    """
+    def __init__(self, read):
+        super(_LazyData, self).__init__()
+        self._read = read
+        self._missing = set()           # the keys which were looked up, but which the game doesn't have
+        self._complete = False
+
+    def __missing__(self, key):
+        if self._complete or key in self._missing:
+            raise KeyError(key)
+
+        for k, value in self._read([key]).items():
+            self.setdefault(k, value)
+
+        if key not in self:
+            self._missing.add(key)
+            raise KeyError(key)
+
+        return dict.__getitem__(self, key)
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def complete(self):
+        """
+        Reads all the values which weren't read yet
+
+        :return: the dictionary
+        """
+        if not self._complete:
+            for key, value in self._read(None).items():
+                self.setdefault(key, value)
+            self._complete = True
+        return self
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        if self._complete:
+            # there's nothing left to read, don't keep the XML
+            state["_read"] = None
+        return state
+
+
+class LazyBoardGame(BoardGame):
+    """
+    A :py:class:`BoardGame` which reads its information from the XML returned by the API only when it's used: each
+    value is decoded the first time it's accessed, then kept. Creating one costs next to nothing, so it's useful when
+    loading many games and reading only some of their information (e.g. the name and the rank).
+
+    The object keeps a reference to the XML (and reads it every time a value is accessed for the first time), so it
+    should be treated as read-only.
+
+    :param int game_id: the id of the game
+    :param callable read: called with a list of keys (or ``None`` for all of them) to get the game's data for these
+                          keys, as a dictionary
+    """
+    def __init__(self, game_id, read):
+        self._id = game_id
+        self._data = _LazyData(read)
+        self._data["id"] = game_id
+
+    def data(self):
+        return self._data.complete()
+
+    @_lazy_attribute
+    def _name(self):
+        return self._data.get("name")
+
+    @_lazy_attribute
+    def _thumbnail(self):
+        return fix_url(self._data.get("thumbnail"))
+
+    @_lazy_attribute
+    def _image(self):
+        return fix_url(self._data.get("image"))
+
+    @_lazy_attribute
+    def _year_published(self):
+        try:
+            return fix_unsigned_negative(self._data["yearpublished"])
+        except:
+            return None
+
+    @_lazy_attribute
+    def _stats(self):
+        return GameStats(self._data.get("stats") or {})
+
+    # the lists of objects and the sets of ids of the versions, expansions, expanded games and videos
+    @_lazy_attribute
+    def _unique_versions(self):
+        return _unique_things(self._data.get("versions") or [], BoardGameVersion, "invalid version data")
+
+    @_lazy_attribute
+    def _unique_expansions(self):
+        return _unique_things(self._data.get("expansions") or [], Thing, "invalid expansion data")
+
+    @_lazy_attribute
+    def _unique_expands(self):
+        return _unique_things(self._data.get("expands") or [], Thing, "invalid expanded game data")
+
+    @_lazy_attribute
+    def _unique_videos(self):
+        return _unique_things(self._data.get("videos") or [], BoardGameVideo, "invalid video data")
+
+    @_lazy_attribute
+    def _versions(self):
+        return self._unique_versions[0]
+
+    @_lazy_attribute
+    def _versions_set(self):
+        return self._unique_versions[1]
+
+    @_lazy_attribute
+    def _expansions(self):
+        return self._unique_expansions[0]
+
+    @_lazy_attribute
+    def _expansions_set(self):
+        return self._unique_expansions[1]
+
+    @_lazy_attribute
+    def _expands(self):
+        return self._unique_expands[0]
+
+    @_lazy_attribute
+    def _expands_set(self):
+        return self._unique_expands[1]
+
+    @_lazy_attribute
+    def _videos(self):
+        return self._unique_videos[0]
+
+    @_lazy_attribute
+    def _videos_ids(self):
+        return self._unique_videos[1]
+
+    @_lazy_attribute
+    def _comments(self):
+        return []
+
+    @_lazy_attribute
+    def _player_suggestion(self):
+        return _player_suggestions(self._data.get("suggested_players"))
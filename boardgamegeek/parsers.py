@@ -0,0 +1,152 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.parsers` - XML parser backends
+==================================================
+
+The replies of the BGG API are parsed with the :py:mod:`xml.etree.ElementTree` module of the standard library, or,
+when it's installed, with lxml_, which parses several times faster. Both build trees with the same API, which the
+loaders use, so they create the same objects.
+
+The backend is chosen with the ``parser`` argument of :py:class:`boardgamegeek.api.BGGClient`.
+
+.. _lxml: https://lxml.de
+
+.. module:: boardgamegeek.parsers
+   :platform: Unix, Windows
+   :synopsis: XML parser backends
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+"""
+from __future__ import unicode_literals
+
+import threading
+import xml.etree.ElementTree as ET
+from xml.etree.ElementTree import ParseError as ETParseError
+
+try:
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
+
+from .exceptions import BGGValueError
+
+
+class ElementTreeParser(object):
+    """
+    Parses XML with :py:mod:`xml.etree.ElementTree`
+    """
+    name = "etree"
+
+    #: the exceptions raised for malformed XML
+    errors = (ETParseError,)
+
+    #: whether an incremental parse must be continued by the thread which started it
+    thread_bound = False
+
+    def fromstring(self, data):
+        """
+        Parses a document
+
+        :param bytes data: the document
+        :return: the root element
+        """
+        return ET.fromstring(data)
+
+    def iterparse(self, source, events):
+        """
+        Parses a document incrementally
+
+        :param source: file-like object to read the document from
+        :param tuple events: the events to report (``"start"``, ``"end"``)
+        :return: an iterator of ``(event, element)`` tuples
+        """
+        return ET.iterparse(source, events=events)
+
+    def tostring(self, element):
+        """
+        Serializes an element
+
+        :param element: the element
+        :return: the element, as UTF-8 encoded XML
+        :rtype: bytes
+        """
+        return ET.tostring(element, encoding="utf-8")
+
+
+class LxmlParser(ElementTreeParser):
+    """
+    Parses XML with lxml. Comments and processing instructions are dropped, like the standard library parser does, so
+    the trees have the same elements. lxml parsers are tied to the thread which created them, so a document is parsed
+    by the thread which uses it.
+
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if lxml isn't installed
+    """
+    name = "lxml"
+    thread_bound = True
+
+    def __init__(self):
+        if lxml_etree is None:
+            raise BGGValueError("lxml isn't installed")
+
+        self.errors = (lxml_etree.XMLSyntaxError,)
+        # lxml parsers can't be used by several threads at once
+        self._local = threading.local()
+
+    def _parser(self):
+        parser = getattr(self._local, "parser", None)
+        if parser is None:
+            parser = lxml_etree.XMLParser(remove_comments=True, remove_pis=True, resolve_entities=False,
+                                          no_network=True)
+            self._local.parser = parser
+        return parser
+
+    def fromstring(self, data):
+        return lxml_etree.fromstring(data, self._parser())
+
+    def iterparse(self, source, events):
+        return lxml_etree.iterparse(source, events=events, remove_comments=True, remove_pis=True,
+                                    resolve_entities=False, no_network=True)
+
+    def tostring(self, element):
+        return lxml_etree.tostring(element, encoding="utf-8", with_tail=False)
+
+
+_PARSERS = {"etree": ElementTreeParser,
+            "lxml": LxmlParser}
+
+DEFAULT_PARSER = ElementTreeParser()
+
+
+def parser_of(element):
+    """
+    Returns the parser backend which can serialize an element: lxml's for the elements built by lxml, the standard
+    library's for the others
+
+    :param element: the element
+    :return: the parser
+    """
+    if lxml_etree is not None and isinstance(element, lxml_etree._Element):
+        return LxmlParser()
+    return DEFAULT_PARSER
+
+
+def get_parser(parser=None):
+    """
+    Returns a parser backend
+
+    :param parser: ``"lxml"``, ``"etree"`` (the standard library), ``None`` for lxml when it's installed and the
+                   standard library otherwise, or a parser object (returned as it is)
+    :return: the parser
+    :raises: :py:exc:`boardgamegeek.exceptions.BGGValueError` if the parser is unknown, or it's ``"lxml"`` and lxml
+             isn't installed
+    """
+    if parser is None:
+        return LxmlParser() if lxml_etree is not None else DEFAULT_PARSER
+
+    if isinstance(parser, ElementTreeParser):
+        return parser
+
+    try:
+        return _PARSERS[parser]()
+    except (KeyError, TypeError):
+        raise BGGValueError("invalid parser: {}".format(parser))
@@ -0,0 +1,147 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.poller` - Deferred requests
+===============================================
+
+The BGG API answers some requests (most notably ``/collection``) with HTTP 202 while it prepares the reply, asking the
+client to try again later. Instead of sleeping in the calling thread, the :py:class:`DeferredRequestPoller` parks
+these requests in a queue and re-polls them from a background thread, so that a worker thread is never kept busy
+waiting on a single request.
+
+.. module:: boardgamegeek.poller
+   :platform: Unix, Windows
+   :synopsis: background polling of the requests which the BGG API has queued
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+"""
+from __future__ import unicode_literals
+
+import heapq
+import itertools
+import logging
+import threading
+from concurrent.futures import Future
+
+from .exceptions import BGGApiRetryError, BGGApiTimeoutError
+from .utils import _clock
+
+
+log = logging.getLogger("boardgamegeek.poller")
+
+
+class _DeferredRequest(object):
+
+    def __init__(self, attempt, retries, retry_delay, backoff):
+        self.attempt = attempt
+        self.future = Future()
+        self.retries = retries
+        self.retries_left = retries
+        self.retry_delay = retry_delay
+        self.backoff = backoff
+
+
+class DeferredRequestPoller(object):
+    """
+    Runs requests which can be deferred by the server on a thread pool. A request whose attempt raises
+    :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` (or times out) is put back in a queue, and a single background
+    thread submits it again once its retry delay (which grows by ``backoff`` after each attempt) has passed. All the
+    queued requests share this schedule.
+
+    :param executor: the :py:class:`concurrent.futures.Executor` running the attempts
+    """
+    def __init__(self, executor):
+        self._executor = executor
+        self._queue = []                        # heap of (due time, sequence number, request)
+        self._sequence = itertools.count()      # keeps requests due at the same time in FIFO order
+        self._condition = threading.Condition()
+        self._thread = None
+        self._closed = False
+
+    def submit(self, attempt, retries, retry_delay, backoff=1.5):
+        """
+        Schedules a request
+
+        :param callable attempt: callable making the request and returning its result. It must raise
+                                 :py:exc:`boardgamegeek.exceptions.BGGApiRetryError` if the server queued the request
+        :param int retries: how many times to retry the request
+        :param float retry_delay: delay before the first retry, in seconds
+        :param float backoff: how much to increase the delay after each retry
+        :return: a future resolving to the result of ``attempt``, or to the exception it raised. Cancelling the
+                 future drops the request if it's still queued
+        :rtype: :py:class:`concurrent.futures.Future`
+        """
+        request = _DeferredRequest(attempt, retries, retry_delay, backoff)
+        self._schedule(request, 0)
+        return request.future
+
+    def close(self):
+        """
+        Stops polling, cancelling the requests which are still queued
+        """
+        with self._condition:
+            self._closed = True
+            queue, self._queue = self._queue, []
+            self._condition.notify()
+
+        for _, _, request in queue:
+            request.future.cancel()
+
+    def _schedule(self, request, delay):
+        with self._condition:
+            if self._closed:
+                request.future.cancel()
+                return
+
+            heapq.heappush(self._queue, (_clock() + delay, next(self._sequence), request))
+
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="bgg-poller")
+                self._thread.daemon = True
+                self._thread.start()
+
+            self._condition.notify()
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while True:
+                    if self._closed or not self._queue:
+                        # a new thread is started when something is scheduled again
+                        self._thread = None
+                        return
+
+                    wait = self._queue[0][0] - _clock()
+                    if wait <= 0:
+                        break
+                    self._condition.wait(wait)
+
+                _, _, request = heapq.heappop(self._queue)
+
+            if not request.future.cancelled():
+                self._executor.submit(self._attempt, request)
+
+    def _attempt(self, request):
+        future = request.future
+
+        try:
+            result = request.attempt()
+        except (BGGApiRetryError, BGGApiTimeoutError) as e:
+            if request.retries_left > 0:
+                log.debug("request deferred by the server, polling again in {} seconds ({} more retries)".format(
+                    request.retry_delay, request.retries_left))
+                request.retries_left -= 1
+                delay = request.retry_delay
+                request.retry_delay *= request.backoff
+                self._schedule(request, delay)
+                return
+
+            if future.set_running_or_notify_cancel():
+                future.set_exception(e.__class__("failed to retrieve data after {} retries".format(request.retries)))
+            return
+        except Exception as e:
+            if future.set_running_or_notify_cancel():
+                future.set_exception(e)
+            return
+
+        if future.set_running_or_notify_cancel():
+            future.set_result(result)
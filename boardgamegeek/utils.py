@@ -11,9 +11,6 @@
 
 """
 from __future__ import unicode_literals
-import sys
-import xml.etree.ElementTree as ET
-from xml.etree.ElementTree import ParseError as ETParseError
 import requests
 import logging
 import time
@@ -27,58 +24,168 @@ except:
     import urlparse
 
 from .exceptions import BGGApiError, BGGApiRetryError, BGGError, BGGApiTimeoutError
+from .parsers import DEFAULT_PARSER
 
 log = logging.getLogger("boardgamegeek.utils")
 
 DEFAULT_REQUESTS_PER_MINUTE = 30
+DEFAULT_REQUESTS_BURST = 1
 
+# time.monotonic isn't affected by system clock changes, but it's only available on Python 3
+_clock = getattr(time, "monotonic", time.time)
 
-class RateLimitingAdapter(HTTPAdapter):
+
+def api_endpoint_name(url):
     """
-    Adapter for the Requests library which makes sure there's a delay between consecutive requests to the BGG site
-    so that we don't get throttled
+    Returns the name of the BGG API endpoint a request is addressed to (e.g. ``thing``, ``collection``, ``plays``)
+
+    :param str url: the URL of the request
+    :return: the last component of the URL's path
+    :rtype: str
     """
+    path = urlparse.urlparse(url).path.rstrip("/")
+    return path[path.rfind("/") + 1:]
 
-    __last_request_timestamp = None     # time when the last request was made
-    __time_between_requests = 0         # interval to wait between requests in order to match the expected number of
-                                        # requests per second
 
-    __rate_limit_lock = threading.Lock()
+class TokenBucket(object):
+    """
+    Token bucket allowing ``burst`` requests at once, refilled at a rate of ``rpm`` tokens per minute.
 
-    def __init__(self, rpm=DEFAULT_REQUESTS_PER_MINUTE, **kw):
+    Tokens are handed out as reservations: :py:meth:`reserve` never blocks, it returns how long the caller has to
+    wait before it can use its token. Since reservations are made in the order in which callers acquire the
+    (short lived) internal lock, waiting callers are served in FIFO order and nobody holds a lock while sleeping.
+
+    :param float rpm: how many requests per minute to allow
+    :param int burst: maximum number of requests which can be made back to back, after a period of inactivity
+    """
+    def __init__(self, rpm, burst=DEFAULT_REQUESTS_BURST):
+        self._rate = float(rpm) / 60.0      # tokens per second
+        self._burst = float(burst)
+        self._tokens = float(burst)
+        self._last_refill = _clock()
+        self._lock = threading.Lock()
+
+    def reserve(self):
         """
+        Reserves a token
 
-        :param rpm: how many requests per minute to allow
-        :param kw:
-        :return:
+        :return: number of seconds the caller needs to wait before using the reserved token
+        :rtype: float
         """
-        if rpm <= 0:
-            log.warning("invalid requests per minute value ({}), falling back to default".format(rpm))
+        with self._lock:
+            now = _clock()
+            self._tokens = min(self._burst, self._tokens + (now - self._last_refill) * self._rate)
+            self._last_refill = now
+
+            # the token count goes negative when there are pending reservations
+            self._tokens -= 1.0
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self._rate
+
+
+class RateLimiter(object):
+    """
+    Keeps a :py:class:`TokenBucket` for each of the BGG API endpoints, so that the request budget of one endpoint
+    (e.g. ``/collection``) isn't used up by another one (e.g. ``/thing``).
+
+    :param float rpm: default number of requests per minute allowed for an endpoint
+    :param int burst: default number of requests which can be made back to back for an endpoint
+    :param dict endpoint_limits: overrides for specific endpoints, mapping the endpoint name (e.g. ``"thing"``)
+                                 to a ``(rpm, burst)`` tuple
+    """
+    def __init__(self, rpm=DEFAULT_REQUESTS_PER_MINUTE, burst=DEFAULT_REQUESTS_BURST, endpoint_limits=None):
+        self._rpm, self._burst = self._check_limits("default", rpm, burst)
+        self._endpoint_limits = {}
+        for endpoint, limits in (endpoint_limits or {}).items():
+            try:
+                rpm, burst = limits
+            except (TypeError, ValueError):
+                log.warning("invalid rate limit for '{}' ({}), falling back to default".format(endpoint, limits))
+                continue
+            self._endpoint_limits[endpoint] = self._check_limits(endpoint, rpm, burst)
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _check_limits(endpoint, rpm, burst):
+        # invalid values fall back to the defaults
+        try:
+            valid_rpm = float(rpm) > 0
+        except (TypeError, ValueError):
+            valid_rpm = False
+        if not valid_rpm:
+            log.warning("invalid requests per minute value for '{}' ({}), falling back to default".format(endpoint,
+                                                                                                          rpm))
             rpm = DEFAULT_REQUESTS_PER_MINUTE
 
-        RateLimitingAdapter.__time_between_requests = 60.0 / float(rpm)
+        try:
+            valid_burst = int(burst) >= 1
+        except (TypeError, ValueError):
+            valid_burst = False
+        if not valid_burst:
+            log.warning("invalid burst value for '{}' ({}), falling back to default".format(endpoint, burst))
+            burst = DEFAULT_REQUESTS_BURST
+
+        return float(rpm), int(burst)
+
+    def _bucket(self, endpoint):
+        with self._lock:
+            bucket = self._buckets.get(endpoint)
+            if bucket is None:
+                rpm, burst = self._endpoint_limits.get(endpoint, (self._rpm, self._burst))
+                bucket = TokenBucket(rpm, burst)
+                self._buckets[endpoint] = bucket
+            return bucket
+
+    def reserve(self, url):
+        """
+        Reserves a request slot for the endpoint ``url`` belongs to
 
-        super(RateLimitingAdapter, self).__init__(**kw)
+        :param str url: URL of the request to be made
+        :return: number of seconds to wait before making the request
+        :rtype: float
+        """
+        return self._bucket(api_endpoint_name(url)).reserve()
 
-    def send(self, request, **kw):
-        log.debug("acquiring rate limiting lock")
-        with RateLimitingAdapter.__rate_limit_lock:
+    def wait(self, url):
+        """
+        Blocks the calling thread until a request to ``url`` is allowed to go out
 
-            log.debug("time between requests:{}, last request timestamp: {}".format(RateLimitingAdapter.__time_between_requests,
-                                                                                    RateLimitingAdapter.__last_request_timestamp))
+        :param str url: URL of the request to be made
+        """
+        need_to_wait = self.reserve(url)
+        if need_to_wait > 0:
+            log.debug("rate limiting, need to wait: {}".format(need_to_wait))
+            time.sleep(need_to_wait)
 
-            # determine if we need to sleep in order to enforce the maximum requested amount of requests per minute
-            if RateLimitingAdapter.__last_request_timestamp is not None:
-                time_delta = time.time() - RateLimitingAdapter.__last_request_timestamp
-                need_to_wait = RateLimitingAdapter.__time_between_requests - time_delta
 
-                log.debug("time since last request: {}, need to wait: {}".format(time_delta, need_to_wait))
+class RateLimitingAdapter(HTTPAdapter):
+    """
+    Adapter for the Requests library which makes sure that requests to the BGG site are throttled, so that we don't
+    get blocked. Each adapter has its own :py:class:`RateLimiter`, unless one is explicitly passed in order to share
+    the request budget between multiple adapters.
+    """
 
-                if need_to_wait > 0:
-                    time.sleep(need_to_wait)
+    def __init__(self, rpm=DEFAULT_REQUESTS_PER_MINUTE, burst=DEFAULT_REQUESTS_BURST, endpoint_limits=None,
+                 rate_limiter=None, **kw):
+        """
 
-            RateLimitingAdapter.__last_request_timestamp = time.time()
-            log.debug("releasing rate limiting lock")
+        :param rpm: how many requests per minute to allow, for each endpoint
+        :param burst: how many requests can be sent back to back, for each endpoint
+        :param endpoint_limits: dictionary of per endpoint ``(rpm, burst)`` overrides (e.g. ``{"collection": (10, 2)}``)
+        :param rate_limiter: a :py:class:`RateLimiter` to use instead of creating one from the above parameters
+        :param kw:
+        :return:
+        """
+        if rate_limiter is None:
+            rate_limiter = RateLimiter(rpm=rpm, burst=burst, endpoint_limits=endpoint_limits)
+        self.rate_limiter = rate_limiter
+
+        super(RateLimitingAdapter, self).__init__(**kw)
+
+    def send(self, request, **kw):
+        self.rate_limiter.wait(request.url)
 
         log.debug("sending request: {}".format(request))
         return super(RateLimitingAdapter, self).send(request, **kw)
@@ -284,9 +391,9 @@ def xml_subelement_text(xml_elem, subelement, convert=None, default=None, quiet=
     return text
 
 
-def request_and_parse_xml(requests_session, url, params=None, timeout=15, retries=3, retry_delay=5):
+def get_xml_response(requests_session, url, params=None, timeout=15, retries=3, retry_delay=5, stream=False):
     """
-    Downloads an XML from the specified url, parses it and returns the xml ElementTree.
+    Sends a request to the BGG API, retrying it if needed, and returns the response containing the XML
 
     :param requests_session: A Session of the ``requests`` library, used to fetch the url
     :param url: the address where to get the XML from
@@ -294,9 +401,11 @@ def request_and_parse_xml(requests_session, url, params=None, timeout=15, retrie
     :param timeout: number of seconds after which the request times out
     :param retries: number of retries to perform in case of timeout
     :param retry_delay: the amount of seconds to sleep when retrying an API call that returned 202
-    :return: :py:func:`xml.etree.ElementTree` corresponding to the XML
+    :param bool stream: if ``True``, the body of the response is downloaded as it's read
+    :return: the response
+    :rtype: :py:class:`requests.Response`
     :raises: :py:class:`BGGApiRetryError` if this request should be retried after a short delay
-    :raises: :py:class:`BGGApiError` if the response was invalid or couldn't be parsed
+    :raises: :py:class:`BGGApiError` if the response was invalid
     :raises: :py:class:`BGGApiTimeoutError` if there was a timeout
     """
 
@@ -306,7 +415,7 @@ def request_and_parse_xml(requests_session, url, params=None, timeout=15, retrie
     while retr >= 0:
         retr -= 1
         try:
-            r = requests_session.get(url, params=params, timeout=timeout)
+            r = requests_session.get(url, params=params, timeout=timeout, stream=stream)
 
             if r.status_code == 202:
                 if retries == 0:
@@ -336,15 +445,7 @@ def request_and_parse_xml(requests_session, url, params=None, timeout=15, retrie
             if not r.headers.get("content-type").lower().startswith("text/xml"):
                 raise BGGApiError("non-XML reply")
 
-            xml = r.text
-
-            if sys.version_info >= (3,):
-                root_elem = ET.fromstring(xml)
-            else:
-                utf8_xml = xml.encode("utf-8")
-                root_elem = ET.fromstring(utf8_xml)
-
-            return root_elem
+            return r
 
         except requests.exceptions.Timeout:
             if retries == 0:
@@ -357,9 +458,6 @@ def request_and_parse_xml(requests_session, url, params=None, timeout=15, retrie
                 timeout *= 2.5
                 continue
 
-        except ETParseError as e:
-            raise BGGApiError("error decoding BGG API response: {}".format(e))
-
         except (BGGApiRetryError, BGGApiTimeoutError):
             raise
 
@@ -369,6 +467,161 @@ def request_and_parse_xml(requests_session, url, params=None, timeout=15, retrie
     raise BGGApiError("couldn't fetch data within the configured number of retries")
 
 
+def request_and_parse_xml(requests_session, url, params=None, timeout=15, retries=3, retry_delay=5, parser=None):
+    """
+    Downloads an XML from the specified url, parses it and returns the xml ElementTree.
+
+    :param requests_session: A Session of the ``requests`` library, used to fetch the url
+    :param url: the address where to get the XML from
+    :param params: dictionary containing the parameters which should be sent with the request
+    :param timeout: number of seconds after which the request times out
+    :param retries: number of retries to perform in case of timeout
+    :param retry_delay: the amount of seconds to sleep when retrying an API call that returned 202
+    :param parser: the parser backend (see :py:mod:`boardgamegeek.parsers`), the standard library's if not set
+    :return: :py:func:`xml.etree.ElementTree` corresponding to the XML
+    :raises: :py:class:`BGGApiRetryError` if this request should be retried after a short delay
+    :raises: :py:class:`BGGApiError` if the response was invalid or couldn't be parsed
+    :raises: :py:class:`BGGApiTimeoutError` if there was a timeout
+    """
+    r = get_xml_response(requests_session, url, params=params, timeout=timeout, retries=retries,
+                         retry_delay=retry_delay)
+
+    if parser is None:
+        parser = DEFAULT_PARSER
+
+    try:
+        # Feed the raw bytes to the parser, which honours the encoding from the XML declaration. Using r.text
+        # would have requests guess the charset and decode the whole body, just for the parser to encode it back.
+        return parser.fromstring(r.content)
+    except parser.errors as e:
+        raise BGGApiError("error decoding BGG API response: {}".format(e))
+
+
+def request_and_iterparse_xml(requests_session, url, item_tag, params=None, timeout=15, retries=3, retry_delay=5,
+                              stream=True, parser=None):
+    """
+    Sends a request to the BGG API and returns a :py:class:`XMLItemStream` for parsing the reply incrementally. The
+    request is made (and retried, if needed) right away, the XML is parsed while iterating over the stream.
+
+    :param requests_session: A Session of the ``requests`` library, used to fetch the url
+    :param url: the address where to get the XML from
+    :param str item_tag: the tag of the items (children of the root element) returned by the stream
+    :param params: dictionary containing the parameters which should be sent with the request
+    :param timeout: number of seconds after which the request times out
+    :param retries: number of retries to perform in case of timeout
+    :param retry_delay: the amount of seconds to sleep when retrying an API call that returned 202
+    :param bool stream: if ``True``, the body of the response is downloaded while it's parsed. Otherwise it's
+                        downloaded before returning (useful when the parsing is done by another thread)
+    :param parser: the parser backend (see :py:mod:`boardgamegeek.parsers`), the standard library's if not set
+    :return: the stream of items
+    :rtype: :py:class:`XMLItemStream`
+    :raises: :py:class:`BGGApiRetryError` if this request should be retried after a short delay
+    :raises: :py:class:`BGGApiError` if the response was invalid or couldn't be parsed
+    :raises: :py:class:`BGGApiTimeoutError` if there was a timeout
+    """
+    r = get_xml_response(requests_session, url, params=params, timeout=timeout, retries=retries,
+                         retry_delay=retry_delay, stream=stream)
+
+    return XMLItemStream(_ResponseReader(r), item_tag, parser=parser)
+
+
+class _ResponseReader(object):
+    """
+    File-like object reading the body of a ``requests`` response, for feeding it to an incremental parser
+    """
+    def __init__(self, response, chunk_size=64 * 1024):
+        self._response = response
+        self._chunks = response.iter_content(chunk_size)
+        self._buffer = b""
+
+    def read(self, size=-1):
+        while size < 0 or len(self._buffer) < size:
+            try:
+                self._buffer += next(self._chunks)
+            except StopIteration:
+                break
+
+        if size < 0:
+            size = len(self._buffer)
+
+        data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def close(self):
+        self._response.close()
+
+
+class XMLItemStream(object):
+    """
+    Parses an XML document incrementally, returning the ``item_tag`` children of its root element one by one, as soon
+    as they are complete. Once the iteration moves on to the next item the previous one is removed from the tree, so
+    memory usage depends on the size of an item, not on the size of the document.
+
+    The root element is parsed when the stream is created (or, for parsers which can't hand an incremental parse over
+    to another thread, when it's first used) and it's available as :py:attr:`root`. Its attributes are available right
+    away, while its children which aren't items (e.g. error messages) are available once the whole document has been
+    parsed.
+
+    :param source: file-like object to read the XML from
+    :param str item_tag: the tag of the items
+    :param parser: the parser backend (see :py:mod:`boardgamegeek.parsers`), the standard library's if not set
+    :raises: :py:class:`BGGApiError` if the XML couldn't be parsed
+    """
+    def __init__(self, source, item_tag, parser=None):
+        if parser is None:
+            parser = DEFAULT_PARSER
+
+        self._source = source
+        self._item_tag = item_tag
+        self._parser = parser
+        self._errors = parser.errors
+        self._events = None
+        self._root = None
+
+        if not parser.thread_bound:
+            self._start()
+
+    def _start(self):
+        self._events = self._parser.iterparse(self._source, events=("start", "end"))
+        try:
+            _, self._root = next(self._events)
+        except self._errors + (StopIteration,) as e:
+            self.close()
+            raise BGGApiError("error decoding BGG API response: {}".format(e))
+
+    @property
+    def root(self):
+        if self._events is None:
+            self._start()
+        return self._root
+
+    def __iter__(self):
+        root = self.root
+        depth = 1
+        try:
+            for event, elem in self._events:
+                if event == "start":
+                    depth += 1
+                    continue
+
+                depth -= 1
+                if depth == 1 and elem.tag == self._item_tag:
+                    yield elem
+                    # the item has been processed, drop it
+                    root.remove(elem)
+        except self._errors as e:
+            raise BGGApiError("error decoding BGG API response: {}".format(e))
+        finally:
+            self.close()
+
+    def close(self):
+        """
+        Releases the connection the XML is read from. Called automatically at the end of the iteration.
+        """
+        if hasattr(self._source, "close"):
+            self._source.close()
+
+
 def fix_url(url):
     """
     The BGG API started returning URLs like //cf.geekdo-images.com/images/pic55406.jpg for thumbnails and images.
@@ -390,22 +643,60 @@ def fix_unsigned_negative(value):
     return value
 
 
+# where the values of the children of a version go: (key, convert, default), by tag, or by link type
+_VERSION_FIELDS = {"name": ("name", None, None),
+                   "productcode": ("product_code", None, None),
+                   "yearpublished": ("yearpublished", int, 0),
+                   "width": ("width", float, 0.0),
+                   "length": ("length", float, 0.0),
+                   "depth": ("depth", float, 0.0),
+                   "weight": ("weight", float, 0.0)}
+
+_VERSION_LINKS = {"language": "language",
+                  "boardgamepublisher": "publisher",
+                  "boardgameartist": "artist"}
+
+
 def get_board_game_version_from_element(xml_elem):
+    # the children are walked once, instead of being searched for each field
     data = {"id": int(xml_elem.attrib["id"]),
-            "yearpublished": fix_unsigned_negative(xml_subelement_attr(xml_elem,
-                                                                       "yearpublished",
-                                                                       convert=int,
-                                                                       default=0,
-                                                                       quiet=True)),
-            "language": xml_subelement_attr_by_attr(xml_elem, "link", "type", "language"),
-            "publisher": xml_subelement_attr_by_attr(xml_elem, "link", "type", "boardgamepublisher"),
-            "artist": xml_subelement_attr_by_attr(xml_elem, "link", "type", "boardgameartist"),
-            "thumbnail": xml_subelement_text(xml_elem, "thumbnail"),
-            "image": xml_subelement_text(xml_elem, "image"),
-            "name": xml_subelement_attr(xml_elem, "name"),
-            "product_code": xml_subelement_attr(xml_elem, "productcode")}
-
-    for item in ["width", "length", "depth", "weight"]:
-        data[item] = xml_subelement_attr(xml_elem, item, convert=float, quiet=True, default=0.0)
+            "thumbnail": None,
+            "image": None}
+    for key, _, default in _VERSION_FIELDS.values():
+        data[key] = default
+    for key in _VERSION_LINKS.values():
+        data[key] = None
+
+    seen = set()
+    for child in xml_elem:
+        tag = child.tag
+        if tag == "link":
+            key = _VERSION_LINKS.get(child.get("type"))
+        elif tag in _VERSION_FIELDS or tag == "thumbnail" or tag == "image":
+            key = tag
+        else:
+            continue
+
+        if key is None or key in seen:
+            continue
+        seen.add(key)
+
+        if tag == "thumbnail" or tag == "image":
+            data[tag] = child.text
+            continue
+
+        value = child.get("value")
+        if tag != "link":
+            key, convert, default = _VERSION_FIELDS[tag]
+            if value is None:
+                value = default
+            elif convert is not None:
+                try:
+                    value = convert(value)
+                except (TypeError, ValueError):
+                    value = default
+        data[key] = value
+
+    data["yearpublished"] = fix_unsigned_negative(data["yearpublished"])
 
     return data
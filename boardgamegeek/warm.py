@@ -0,0 +1,226 @@
+# coding: utf-8
+"""
+:mod:`boardgamegeek.warm` - Cache warming
+=========================================
+
+Fills the cache of a :py:class:`boardgamegeek.api.BGGClient` ahead of time, from lists of game ids, user names and
+guild ids, so that the first requests of the day don't have to wait for the BGG API.
+
+The games are requested in batches (as many at a time as the /thing API accepts), while the collections, plays and
+guilds are requested concurrently, using the client's worker threads. Everything goes through the client, so its
+rate limits are respected.
+
+Usage from the command line::
+
+    boardgamegeek warm --cache /path/to/cache.db --games game_ids.txt --users user_names.txt --guilds guild_ids.txt
+
+.. module:: boardgamegeek.warm
+   :platform: Unix, Windows
+   :synopsis: prefetching data into the cache
+
+.. moduleauthor:: Cosmin Luță <q4break@gmail.com>
+"""
+from __future__ import unicode_literals, division
+
+import argparse
+import io
+import logging
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .api import BGGClient, DEFAULT_WORKERS, GAME_LIST_CHUNK_SIZE
+from .cache import CacheBackendSqlite, CacheBackendCompressedSqlite
+from .exceptions import BGGError
+from .utils import _clock, DEFAULT_REQUESTS_PER_MINUTE
+
+
+log = logging.getLogger("boardgamegeek.warm")
+
+
+class WarmingProgress(object):
+    """
+    Progress of a cache warming run, passed to the progress callback of :py:func:`warm_cache`
+    """
+    def __init__(self, total):
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self._start = _clock()
+
+    @property
+    def elapsed(self):
+        """
+        :return: seconds since the warming started
+        :rtype: float
+        """
+        return _clock() - self._start
+
+    @property
+    def throughput(self):
+        """
+        :return: items processed per second
+        :rtype: float
+        """
+        elapsed = self.elapsed
+        return self.done / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def eta(self):
+        """
+        :return: estimated number of seconds until the warming is done, ``None`` if it can't be estimated yet
+        :rtype: float
+        """
+        throughput = self.throughput
+        if not throughput:
+            return None
+        return (self.total - self.done) / throughput
+
+    def __str__(self):
+        eta = self.eta
+        return "{}/{} items ({} failed), {:.1f} items/s, ETA {}".format(self.done, self.total, self.failed,
+                                                                       self.throughput,
+                                                                       "{:.0f}s".format(eta) if eta is not None
+                                                                       else "n/a")
+
+
+def read_list(path):
+    """
+    Reads a list of ids or names from a file, one per line. Empty lines and the lines starting with ``#`` are skipped
+
+    :param str path: the path of the file
+    :return: the entries
+    :rtype: list of str
+    """
+    with io.open(path, "r", encoding="utf-8") as f:
+        lines = [line.strip() for line in f]
+    return [line for line in lines if line and not line.startswith("#")]
+
+
+def warm_cache(bgg, game_ids=(), user_names=(), guild_ids=(), collections=True, plays=True, progress=None):
+    """
+    Fills the cache of a client
+
+    :param bgg: the :py:class:`boardgamegeek.api.BGGClient` whose cache to fill
+    :param list game_ids: the ids of the games to fetch
+    :param list user_names: the users whose collections and/or plays to fetch
+    :param list guild_ids: the ids of the guilds to fetch (with their members)
+    :param bool collections: fetch the collections of the users
+    :param bool plays: fetch the plays of the users
+    :param callable progress: called with a :py:class:`WarmingProgress` after each item (or batch of games)
+    :return: the progress at the end
+    :rtype: :py:class:`WarmingProgress`
+    """
+    game_ids = list(game_ids)
+    user_names = list(user_names)
+    guild_ids = list(guild_ids)
+
+    status = WarmingProgress(total=len(game_ids) +
+                             len(user_names) * ((1 if collections else 0) + (1 if plays else 0)) +
+                             len(guild_ids))
+
+    def _report(done, failed=0):
+        status.done += done
+        status.failed += failed
+        if progress is not None:
+            progress(status)
+
+    # the collections take a while to be prepared by the server, so ask for them first
+    futures = {}
+    if collections and user_names:
+        for user_name, future in bgg.prefetch_collections(user_names).items():
+            futures[future] = "collection of {}".format(user_name)
+
+    # not the client's own worker threads: they're the ones fetching the pages of the plays and guilds, so they
+    # can't be kept waiting for them
+    executor = ThreadPoolExecutor(max_workers=bgg.workers)
+    if plays:
+        for user_name in user_names:
+            futures[executor.submit(bgg.plays, name=user_name)] = "plays of {}".format(user_name)
+    for guild_id in guild_ids:
+        futures[executor.submit(bgg.guild, guild_id)] = "guild {}".format(guild_id)
+
+    # game_list() fetches its chunks concurrently, give it enough ids to keep the workers busy
+    batch_size = GAME_LIST_CHUNK_SIZE * bgg.workers
+    for start in range(0, len(game_ids), batch_size):
+        batch = game_ids[start:start + batch_size]
+        try:
+            games = bgg.game_list(batch)
+        except BGGError as e:
+            log.warning("failed to fetch games {}: {}".format(",".join(str(game_id) for game_id in batch), e))
+            _report(len(batch), failed=len(batch))
+        else:
+            missing = sum(1 for game in games if game is None)
+            _report(len(batch), failed=missing)
+
+    for future in as_completed(futures):
+        try:
+            future.result()
+        except Exception as e:
+            log.warning("failed to fetch the {}: {}".format(futures[future], e))
+            _report(1, failed=1)
+        else:
+            _report(1)
+
+    executor.shutdown()
+
+    # make sure everything is saved (some backends write in the background)
+    flush = getattr(getattr(bgg.requests_session, "cache", None), "flush", None)
+    if flush is not None:
+        flush()
+
+    return status
+
+
+def main(argv=None):
+    """
+    The ``boardgamegeek warm`` command
+    """
+    p = argparse.ArgumentParser(prog="boardgamegeek warm",
+                                description="fill a cache database with data from the BGG API")
+    p.add_argument("--cache", help="path of the SQLite cache database", required=True)
+    p.add_argument("--compressed", help="use the compressed SQLite cache", action="store_true")
+    p.add_argument("--ttl", help="how long the cached data is valid for, in seconds", type=int, default=24 * 3600)
+    p.add_argument("--games", help="file with the game ids to fetch, one per line")
+    p.add_argument("--users", help="file with the user names whose collections and plays to fetch, one per line")
+    p.add_argument("--guilds", help="file with the guild ids to fetch, one per line")
+    p.add_argument("--no-collections", help="don't fetch the users' collections", action="store_true")
+    p.add_argument("--no-plays", help="don't fetch the users' plays", action="store_true")
+    p.add_argument("--requests-per-minute", type=int, default=DEFAULT_REQUESTS_PER_MINUTE)
+    p.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    p.add_argument("--retries", type=int, default=5)
+    p.add_argument("--timeout", type=int, default=15)
+    args = p.parse_args(argv)
+
+    if not any([args.games, args.users, args.guilds]):
+        p.error("nothing to fetch, use --games, --users and/or --guilds")
+
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    logging.getLogger("requests").setLevel(logging.WARNING)
+
+    if args.compressed:
+        cache = CacheBackendCompressedSqlite(args.cache, ttl=args.ttl)
+    else:
+        cache = CacheBackendSqlite(args.cache, ttl=args.ttl)
+
+    bgg = BGGClient(cache=cache,
+                    timeout=args.timeout,
+                    retries=args.retries,
+                    requests_per_minute=args.requests_per_minute,
+                    workers=args.workers)
+
+    game_ids = [int(game_id) for game_id in read_list(args.games)] if args.games else []
+    user_names = read_list(args.users) if args.users else []
+    guild_ids = [int(guild_id) for guild_id in read_list(args.guilds)] if args.guilds else []
+
+    def _progress(status):
+        log.info("warming: {}".format(status))
+
+    status = warm_cache(bgg,
+                        game_ids=game_ids,
+                        user_names=user_names,
+                        guild_ids=guild_ids,
+                        collections=not args.no_collections,
+                        plays=not args.no_plays,
+                        progress=_progress)
+
+    log.info("done in {:.0f}s: {}".format(status.elapsed, status))
+    return 1 if status.failed else 0
@@ -36,7 +36,9 @@ setup(
     long_description=long_description,
     url="https://github.com/lcosmin/boardgamegeek",
     tests_require=tests_require,
-    extras_require={'test': tests_require},
+    extras_require={'test': tests_require,
+                    'async': ["aiohttp>=3.0"],
+                    'lxml': ["lxml"]},
     cmdclass={'test': PyTest},
     classifiers=[
         "Programming Language :: Python",
@@ -53,7 +55,8 @@ setup(
         "Topic :: Internet :: WWW/HTTP :: Dynamic Content",
     ],
     install_requires=["requests>=2.3.0",
-                      "requests-cache>=0.4.4"],
+                      "requests-cache>=0.4.4",
+                      "futures>=3.0.5; python_version < \"3.0\""],
     entry_points={
         "console_scripts": [
             "boardgamegeek = boardgamegeek.main:main"
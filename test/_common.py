@@ -79,8 +79,16 @@ class MockResponse():
         self.headers = {"content-type": "text/xml"}
         self.status_code = 200
         self.text = text
+        self.content = text.encode("utf-8")
 
-def simulate_bgg(url, params, timeout):
+    def iter_content(self, chunk_size=1):
+        for i in range(0, len(self.content), chunk_size):
+            yield self.content[i:i + chunk_size]
+
+    def close(self):
+        pass
+
+def simulate_bgg(url, params, timeout, stream=False):
     last_slash = url.rindex('/')
     fragment = url[last_slash + 1:]
 
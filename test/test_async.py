@@ -0,0 +1,253 @@
+# coding: utf-8
+import asyncio
+import io
+
+from _common import *
+
+aiohttp = pytest.importorskip("aiohttp")
+
+from aiohttp import web
+from aiohttp.test_utils import TestServer
+
+from boardgamegeek import BGGApiRetryError, BGGItemNotFoundError, BGGValueError, BGGRestrictGameSearchResultsTo
+from boardgamegeek.asyncapi import AsyncBGGClient
+
+
+async def serve_xml(request):
+    """ aiohttp handler standing in for the BGG API, serving the recorded replies from ``XML_PATH`` """
+    sorted_params = sorted(request.query.items(), key=lambda t: t[0])
+    query_string = "&".join([str(k) + "=" + str(v) for k, v in sorted_params])
+
+    filename = os.path.join(XML_PATH, request.match_info["endpoint"] + "?" + query_string)
+    if not os.path.isfile(filename):
+        return web.Response(status=404, text="no recorded reply for {}".format(filename))
+
+    with io.open(filename, "rb") as xmlfile:
+        return web.Response(body=xmlfile.read(), content_type="text/xml")
+
+
+def run_with_bgg(test_coro, handler=serve_xml, **kwargs):
+    """ Starts a local server using ``handler`` and runs ``test_coro`` with an ``AsyncBGGClient`` connected to it """
+
+    async def _run():
+        app = web.Application()
+        app.router.add_get("/xmlapi2/{endpoint}", handler)
+
+        server = TestServer(app)
+        await server.start_server()
+        try:
+            kwargs.setdefault("requests_per_minute", 6000)
+            async with AsyncBGGClient(api_endpoint=str(server.make_url("/xmlapi2")), retries=2, retry_delay=0.1,
+                                      **kwargs) as bgg:
+                return await test_coro(bgg)
+        finally:
+            await server.close()
+
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(_run())
+    finally:
+        loop.close()
+
+
+def test_async_collection():
+    async def _test(bgg):
+        return await bgg.collection(TEST_VALID_USER)
+
+    collection = run_with_bgg(_test)
+
+    assert collection.owner == TEST_VALID_USER
+    assert len(collection) > 0
+
+    for g in collection:
+        assert g.id is not None
+        assert g.name is not None
+
+
+def test_async_invalid_parameters():
+    async def _test(bgg):
+        with pytest.raises(BGGValueError):
+            await bgg.collection(None)
+
+        with pytest.raises(BGGValueError):
+            await bgg.user(TEST_VALID_USER, domain="voodoo")
+
+        with pytest.raises(BGGItemNotFoundError):
+            await bgg.collection(TEST_INVALID_USER)
+
+        with pytest.raises(BGGItemNotFoundError):
+            await bgg.user(TEST_INVALID_USER)
+
+    run_with_bgg(_test)
+
+
+def test_async_plays_are_paginated():
+    async def _test(bgg):
+        return await bgg.plays(name=TEST_VALID_USER)
+
+    plays = run_with_bgg(_test)
+
+    assert plays.user == TEST_VALID_USER
+    assert len(plays) == plays.plays_count
+
+
+def test_async_user_hot_items_and_search():
+    async def _test(bgg):
+        return await asyncio.gather(bgg.user(TEST_USER_WITH_LOTS_OF_FRIENDS),
+                                    bgg.hot_items("boardgame"),
+                                    bgg.search("Agricola", search_type=[BGGRestrictGameSearchResultsTo.BOARD_GAME]))
+
+    user, hot_items, results = run_with_bgg(_test)
+
+    assert user.name == TEST_USER_WITH_LOTS_OF_FRIENDS
+    assert user.total_buddies > 100
+    assert len(hot_items) > 0
+    assert results[0].name == "Agricola"
+
+
+def test_async_game_and_guild():
+    async def _test(bgg):
+        return await asyncio.gather(bgg.game(game_id=TEST_GAME_ID, versions=True, videos=True),
+                                    bgg.guild(TEST_GUILD_ID))
+
+    game, guild = run_with_bgg(_test)
+
+    assert game.id == TEST_GAME_ID
+    assert game.name == TEST_GAME_NAME
+    assert len(game.versions) > 0
+
+    assert guild.id == TEST_GUILD_ID
+    assert len(guild) == guild.members_count
+
+
+def test_async_retries_queued_requests_without_blocking():
+    calls = {"count": 0}
+
+    async def queued_once(request):
+        calls["count"] += 1
+        if calls["count"] == 1:
+            return web.Response(status=202, text="queued")
+        return await serve_xml(request)
+
+    async def _test(bgg):
+        # the event loop stays free to run other tasks while the retry delay passes
+        ticks = []
+
+        async def _ticker():
+            for _ in range(3):
+                ticks.append(True)
+                await asyncio.sleep(0.1)
+
+        collection, _ = await asyncio.gather(bgg.collection(TEST_VALID_USER), _ticker())
+        return collection, ticks
+
+    collection, ticks = run_with_bgg(_test, handler=queued_once)
+
+    assert calls["count"] == 2
+    assert len(ticks) == 3
+    assert len(collection) > 0
+
+    async def always_queued(request):
+        return web.Response(status=202, text="queued")
+
+    async def _test_fail(bgg):
+        with pytest.raises(BGGApiRetryError):
+            await bgg.collection(TEST_VALID_USER)
+
+    run_with_bgg(_test_fail, handler=always_queued)
+
+
+def test_async_iterators():
+    async def _test(bgg):
+        plays = [p async for p in bgg.iter_plays(game_id=TEST_GAME_ID_2)]
+        members = [m async for m in bgg.iter_guild_members(TEST_GUILD_ID)]
+
+        # stopping early doesn't leave the prefetched page running
+        stream = bgg.iter_plays(name=TEST_VALID_USER)
+        first = await stream.__anext__()
+        await stream.aclose()
+
+        return plays, members, first
+
+    plays, members, first = run_with_bgg(_test)
+
+    assert len(plays) == 104
+    assert len(members) == 483
+    assert first.user_id == TEST_VALID_USER_ID
+
+
+def test_async_game_list():
+    async def _test(bgg):
+        return await bgg.game_list([TEST_GAME_ID, TEST_GAME_ID_2], videos=True, versions=True)
+
+    game_list = run_with_bgg(_test)
+
+    assert [game.id for game in game_list] == [TEST_GAME_ID, TEST_GAME_ID_2]
+
+
+def test_async_fields():
+    requested = []
+
+    async def _serve_recorded(request):
+        requested.append(dict(request.query))
+        # the replies were recorded with everything requested
+        query = dict((k, v) for k, v in request.query.items() if k != "brief")
+        if request.match_info["endpoint"] == "thing":
+            query.update(stats=1, versions=1, videos=1)
+        else:
+            query.update(stats=1, versions=0)
+        query_string = "&".join([str(k) + "=" + str(v) for k, v in sorted(query.items())])
+
+        with io.open(os.path.join(XML_PATH, request.match_info["endpoint"] + "?" + query_string), "rb") as xmlfile:
+            return web.Response(body=xmlfile.read(), content_type="text/xml")
+
+    async def _test(bgg):
+        with pytest.raises(BGGValueError):
+            await bgg.game(game_id=TEST_GAME_ID, fields={"name", "rank"})
+
+        return (await bgg.game(game_id=TEST_GAME_ID, fields={"name", "versions"}),
+                await bgg.game_list([TEST_GAME_ID, TEST_GAME_ID_2], versions=True, fields={"name", "stats"}),
+                await bgg.collection(TEST_VALID_USER, versions=True, fields={"name", "own"}))
+
+    game, game_list, collection = run_with_bgg(_test, handler=_serve_recorded)
+
+    assert requested[0]["versions"] == "1"
+    assert requested[0]["videos"] == "0"
+    assert "stats" not in requested[0]
+    assert game.versions
+    assert game.mechanics == []
+
+    assert requested[1]["stats"] == "1"
+    assert requested[1]["versions"] == "0"
+    assert [g.id for g in game_list] == [TEST_GAME_ID, TEST_GAME_ID_2]
+    assert all(g.bgg_rank is not None and g.versions == [] for g in game_list)
+
+    assert requested[2]["brief"] == "1"
+    assert "stats" not in requested[2]
+    assert len(collection) > 0
+    for item in collection:
+        assert set(item.data()) == {"id", "name", "own"}
+
+
+def test_async_pages_are_fetched_by_at_most_workers_requests():
+    in_flight = {"now": 0, "max": 0, "pages": 0}
+
+    async def _slow_serve_xml(request):
+        in_flight["now"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        if "page" in request.query:
+            in_flight["pages"] += 1
+        try:
+            await asyncio.sleep(0.1)
+            return await serve_xml(request)
+        finally:
+            in_flight["now"] -= 1
+
+    async def _test(bgg):
+        return await bgg.guild(TEST_GUILD_ID)
+
+    guild = run_with_bgg(_test, handler=_slow_serve_xml, workers=2, requests_burst=100)
+
+    assert len(guild) == guild.members_count
+    assert in_flight["pages"] > 2
+    assert in_flight["max"] == 2
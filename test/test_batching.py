@@ -0,0 +1,120 @@
+import threading
+import time
+
+from _common import *
+from boardgamegeek import BGGApiError
+from boardgamegeek.api import GAME_LIST_CHUNK_SIZE
+from boardgamegeek.batching import ThingBatcher
+
+with io.open(os.path.join(XML_PATH, "thing?historical=0&id=31260,283&marketplace=0&stats=1&versions=1&videos=1"),
+             "rb") as f:
+    TEMPLATE_ITEM = ET.tostring(ET.fromstring(f.read()).find("item")).decode("utf-8")
+
+
+def make_simulate_thing(requested, missing=()):
+    lock = threading.Lock()
+
+    def simulate_thing(url, params, timeout, stream=False):
+        ids = [int(game_id) for game_id in str(params["id"]).split(",")]
+        with lock:
+            requested.append((ids, params["versions"]))
+        time.sleep(0.01)
+        items = [TEMPLATE_ITEM.replace('id="{}"'.format(TEST_GAME_ID), 'id="{}"'.format(game_id), 1)
+                 for game_id in ids if game_id not in missing]
+        return MockResponse("<items>{}</items>".format("".join(items)))
+
+    return simulate_thing
+
+
+def run_in_threads(func, args):
+    results = [None] * len(args)
+
+    def _run(i):
+        try:
+            results[i] = func(args[i])
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=_run, args=(i,)) for i in range(len(args))]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+
+def test_concurrent_game_calls_are_merged(mocker):
+    requested = []
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = make_simulate_thing(requested, missing={13})
+
+    bgg = BGGClient(cache=CacheBackendNone(), requests_per_minute=60000, batch_window=0.1)
+
+    game_ids = list(range(1, 31)) + [5, 5]
+    games = run_in_threads(lambda game_id: bgg.game(game_id=game_id), game_ids)
+
+    # full batches are sent right away, the rest when the window expires; each id is requested once
+    assert sorted(sum([ids for ids, _ in requested], [])) == [i for i in range(1, 31)]
+    assert all(len(ids) <= GAME_LIST_CHUNK_SIZE for ids, _ in requested)
+    assert len(requested) <= 3
+
+    for game_id, game in zip(game_ids, games):
+        if game_id == 13:
+            assert isinstance(game, BGGApiError)
+        else:
+            assert game.id == game_id
+
+    # the same game requested concurrently is shared
+    assert games[4] is games[-1]
+
+
+def test_batches_are_split_by_options(mocker):
+    requested = []
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = make_simulate_thing(requested)
+
+    bgg = BGGClient(cache=CacheBackendNone(), requests_per_minute=60000, batch_window=0.1)
+
+    results = run_in_threads(lambda args: bgg.game(game_id=args[0], versions=args[1]),
+                             [(1, False), (2, True), (3, False)])
+    game_list = bgg.game_list([4, 1])
+
+    assert [game.id for game in results] == [1, 2, 3]
+    assert [game.id for game in game_list] == [4, 1]
+    assert sorted((sorted(ids), versions) for ids, versions in requested) == [([1, 3], 0), ([1, 4], 0), ([2], 1)]
+
+
+def test_batcher_propagates_errors():
+    def fetch(ids, options):
+        raise BGGApiError("boom")
+
+    batcher = ThingBatcher(fetch, window=0.01, max_batch_size=10)
+    futures = [batcher.submit(1), batcher.submit(2)]
+
+    for future in futures:
+        with pytest.raises(BGGApiError):
+            future.result(timeout=5)
+
+
+def test_batches_are_sent_by_a_bounded_pool():
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+    threads = set()
+
+    def fetch(ids, options):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            threads.add(threading.current_thread().name)
+        time.sleep(0.01)
+        with lock:
+            in_flight["now"] -= 1
+        return dict((item_id, item_id * 10) for item_id in ids)
+
+    # every request is a full batch, sent right away
+    batcher = ThingBatcher(fetch, window=1, max_batch_size=1, workers=2)
+    futures = [batcher.submit(item_id) for item_id in range(20)]
+
+    assert [future.result(timeout=5) for future in futures] == [item_id * 10 for item_id in range(20)]
+    assert in_flight["max"] == 2
+    assert len(threads) == 2
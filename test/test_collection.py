@@ -1,9 +1,11 @@
 from __future__ import unicode_literals
 
+import re
+
 import pytest
 
 from _common import *
-from boardgamegeek import BGGError, BGGValueError, BGGItemNotFoundError
+from boardgamegeek import BGGError, BGGValueError, BGGItemNotFoundError, BGGApiRetryError, BGGApiError
 from boardgamegeek.objects.collection import CollectionBoardGame, Collection
 from boardgamegeek.objects.games import BoardGameVersion
 import time
@@ -57,6 +59,92 @@ def test_get_valid_users_collection(bgg, mocker, null_logger):
     # TODO: test the filters for the collection
 
 
+def test_prefetch_collections_polls_queued_requests_in_background(mocker):
+    queued_replies = {}
+
+    def simulate_queued_exports(url, params, timeout, stream=False):
+        # every export is "being prepared" for the first two requests, "neverready" never gets ready
+        user = params["username"]
+        queued_replies[user] = queued_replies.get(user, 0) + 1
+        if user == "neverready" or (user.startswith("queued") and queued_replies[user] <= 2):
+            response = MockResponse("<message>Your request has been accepted</message>")
+            response.status_code = 202
+            return response
+
+        if user.startswith("queued"):
+            params = dict(params, username=TEST_VALID_USER)
+        return simulate_bgg(url, params, timeout, stream)
+
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_queued_exports
+
+    bgg = BGGClient(cache=CacheBackendNone(), retries=3, retry_delay=0.2, requests_per_minute=60000,
+                    requests_burst=100, workers=2)
+
+    with pytest.raises(BGGValueError):
+        bgg.prefetch_collections([TEST_VALID_USER, None])
+
+    users = ["queued{}".format(i) for i in range(8)]
+
+    start = time.time()
+    futures = bgg.prefetch_collections(users + [TEST_INVALID_USER, "neverready"])
+
+    for user in users:
+        collection = futures[user].result(timeout=10)
+        assert collection.owner == user
+        assert len(collection) > 0
+
+    # waiting for the exports one by one would take at least 8 * (0.2 + 0.3) seconds
+    assert time.time() - start < 2
+
+    with pytest.raises(BGGItemNotFoundError):
+        futures[TEST_INVALID_USER].result(timeout=10)
+
+    with pytest.raises(BGGApiRetryError):
+        futures["neverready"].result(timeout=10)
+
+    assert queued_replies["neverready"] == 4
+
+
+def test_get_collection_fields(mocker):
+    requested = []
+
+    def simulate_collection(url, params, timeout, stream=False):
+        requested.append(dict(params))
+        # reply without the statistics, like the server does when it's not asked for them
+        recorded_params = dict((k, v) for k, v in params.items() if k != "brief")
+        response = simulate_bgg(url, dict(recorded_params, stats=1, versions=0), timeout)
+        return MockResponse(re.sub(r"<stats .*?</stats>", "", response.text, flags=re.DOTALL))
+
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_collection
+
+    bgg = BGGClient(cache=CacheBackendNone(), requests_burst=10)
+
+    collection = bgg.collection(TEST_VALID_USER, versions=True, fields={"name", "own", "numplays"})
+    assert "stats" not in requested[-1]
+    assert requested[-1]["versions"] == 0
+    assert "brief" not in requested[-1]
+
+    assert len(collection) > 0
+    for item in collection:
+        assert set(item.data()) == {"id", "name", "own", "numplays"}
+        assert item.name
+        assert item.owned in (True, False)
+        assert item.rating_average is None
+
+    bgg.collection(TEST_VALID_USER, fields=["name", "own"])
+    assert requested[-1]["brief"] == 1
+
+    with pytest.raises(BGGApiError):
+        # the statistics are needed, but they're missing
+        bgg.collection(TEST_VALID_USER, fields={"name", "minplayers"})
+    assert requested[-1]["stats"] == 1
+
+    with pytest.raises(BGGValueError):
+        bgg.collection(TEST_VALID_USER, fields={"name", "description"})
+
+
 def test_creating_collection_out_of_raw_data():
     # test raise exception if invalid items given
     with pytest.raises(BGGError):
@@ -0,0 +1,51 @@
+from _common import *
+from boardgamegeek import BGGItemNotFoundError, BGGValueError
+from boardgamegeek.objects.games import BoardGameComment
+
+
+TOTAL_COMMENTS = 250
+
+
+def simulate_comments(url, params, timeout, stream=False):
+    """ Generates the pages of comments of a game with ``TOTAL_COMMENTS`` comments, 100 per page """
+    if params["id"] != TEST_GAME_ID:
+        return MockResponse("<items></items>")
+
+    page = params.get("page", 1)
+    comments = "".join(['<comment username="user{0}" rating="{1}" value="comment {0}" />'.format(i, i % 10 + 1)
+                        for i in range((page - 1) * 100, min(page * 100, TOTAL_COMMENTS))])
+
+    return MockResponse('<items><item type="boardgame" id="{}"><comments page="{}" totalitems="{}">{}</comments>'
+                        '</item></items>'.format(TEST_GAME_ID, page, TOTAL_COMMENTS, comments))
+
+
+def test_iter_comments(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_comments
+
+    with pytest.raises(BGGValueError):
+        bgg.iter_comments("asd")
+
+    with pytest.raises(BGGItemNotFoundError):
+        bgg.iter_comments(1)
+
+    comments = list(bgg.iter_comments(TEST_GAME_ID))
+
+    assert len(comments) == TOTAL_COMMENTS
+    assert all(isinstance(c, BoardGameComment) for c in comments)
+    assert comments[0].commenter == "user0"
+    assert comments[-1].comment == "comment {}".format(TOTAL_COMMENTS - 1)
+
+
+def test_iter_comments_stops_early(mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_comments
+
+    bgg = BGGClient(cache=CacheBackendNone(), requests_per_minute=6000, workers=1)
+
+    comments = bgg.iter_comments(TEST_GAME_ID)
+    for _ in range(150):
+        next(comments)
+    comments.close()
+
+    assert mock_get.call_count == 2
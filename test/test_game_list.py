@@ -0,0 +1,316 @@
+import pickle
+import threading
+import time
+
+import requests
+
+from _common import *
+from boardgamegeek import BGGChoose, BGGError, BGGApiError, BGGValueError, CacheBackendMemory
+from boardgamegeek.api import GAME_LIST_CHUNK_SIZE, html_parser
+from boardgamegeek.loaders import create_game_from_xml, create_lazy_game_from_bytes
+from boardgamegeek.objects.games import LazyBoardGame
+
+try:
+    from urllib.parse import urlparse, parse_qsl
+except ImportError:
+    from urlparse import urlparse, parse_qsl
+
+# the recorded reply for a game, used as a template for the games requested in bulk
+with io.open(os.path.join(XML_PATH, "thing?historical=0&id=31260,283&marketplace=0&stats=1&versions=1&videos=1"),
+             "rb") as f:
+    TEMPLATE_ITEM = ET.tostring(ET.fromstring(f.read()).find("item")).decode("utf-8")
+
+MISSING_IDS = {7, 33}
+
+
+def test_get_game_list_by_ids(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    with pytest.raises(BGGError):
+        bgg.game_list([])
+
+    with pytest.raises(BGGValueError):
+        bgg.game_list([TEST_GAME_ID, "asd"])
+
+    game_list = bgg.game_list(game_id_list=[TEST_GAME_ID, TEST_GAME_ID_2], videos=True, versions=True)
+
+    assert [game.id for game in game_list] == [TEST_GAME_ID, TEST_GAME_ID_2]
+    assert game_list[0].name == TEST_GAME_NAME
+    assert game_list[1].name == TEST_GAME_NAME_2
+
+
+def test_game_loader_reads_every_field():
+    item = ET.fromstring("""
+        <item type="boardgameexpansion" id="10">
+            <name type="primary" value="Game &amp; Co" />
+            <name type="alternate" value="Other name" />
+            <name type="primary" value="ignored" />
+            <description>A &amp;quot;game&amp;quot;</description>
+            <yearpublished value="2001" />
+            <yearpublished value="2002" />
+            <minplayers value="n/a" />
+            <poll name="suggested_numplayers" totalvotes="3">
+                <results numplayers="2">
+                    <result value="Best" numvotes="2" />
+                    <result value="Recommended" numvotes="1" />
+                    <result value="Not Recommended" numvotes="0" />
+                </results>
+                <results numplayers="3+" />
+            </poll>
+            <link type="boardgamemechanic" id="1" value="Dice Rolling" />
+            <link type="boardgameexpansion" id="11" value="Base game" inbound="true" />
+            <link type="boardgameexpansion" id="12" value="Other expansion" />
+            <link type="boardgamemechanic" id="2" value="Pattern Building" />
+            <statistics page="1">
+                <ratings>
+                    <usersrated value="10" />
+                    <average value="7.5" />
+                    <ranks>
+                        <rank type="subtype" id="1" name="boardgame" friendlyname="Board Game Rank" value="Not Ranked" />
+                    </ranks>
+                </ratings>
+            </statistics>
+        </item>""")
+
+    game = create_game_from_xml(item, 10, html_parser=html_parser)
+
+    assert game.name == "Game & Co"
+    assert game.alternative_names == ["Other name"]
+    assert game.description == 'A "game"'
+    assert game.expansion
+    assert game.year == 2001
+    assert game.min_players is None
+    assert game.mechanics == ["Dice Rolling", "Pattern Building"]
+    assert [thing.id for thing in game.expands] == [11]
+    assert [thing.id for thing in game.expansions] == [12]
+    assert game.users_rated == 10
+    assert game.rating_average == 7.5
+    assert game.bgg_rank is None
+    assert sorted((s.player_count, s.best, s.recommended) for s in game.player_suggestions) == [("2", 2, 1),
+                                                                                              ("3+", 1, 0)]
+
+
+def test_lazy_games_have_the_same_information(mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    ids = [TEST_GAME_ID, TEST_GAME_ID_2]
+    eager = BGGClient(cache=CacheBackendNone(), requests_burst=10).game_list(ids, versions=True, videos=True)
+    lazy = BGGClient(cache=CacheBackendNone(), requests_burst=10, lazy_games=True).game_list(ids, versions=True,
+                                                                                            videos=True)
+
+    assert all(isinstance(game, LazyBoardGame) for game in lazy)
+
+    for eager_game, lazy_game in zip(eager, lazy):
+        for attr in ["id", "name", "year", "bgg_rank", "rating_average", "description", "min_players", "mechanics",
+                     "expansion", "users_owned", "alternative_names"]:
+            assert getattr(lazy_game, attr) == getattr(eager_game, attr)
+
+        assert [v.data() for v in lazy_game.videos] == [v.data() for v in eager_game.videos]
+        assert [v.data() for v in lazy_game.versions] == [v.data() for v in eager_game.versions]
+        assert [t.id for t in lazy_game.expansions] == [t.id for t in eager_game.expansions]
+        assert [p.data() for p in lazy_game.player_suggestions] == [p.data() for p in eager_game.player_suggestions]
+        assert lazy_game.data() == eager_game.data()
+
+
+
+@pytest.mark.parametrize("parser", ["lxml", "etree"])
+def test_lazy_games_can_be_pickled(mocker, parser):
+    if parser == "lxml":
+        pytest.importorskip("lxml")
+
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    ids = [TEST_GAME_ID, TEST_GAME_ID_2]
+    eager = BGGClient(cache=CacheBackendNone(), requests_burst=10).game_list(ids, versions=True, videos=True)
+    lazy = BGGClient(cache=CacheBackendNone(), requests_burst=10, lazy_games=True,
+                     parser=parser).game_list(ids, versions=True, videos=True)
+
+    # one game partly read, the other one not at all
+    assert lazy[0].name == eager[0].name
+
+    for eager_game, lazy_game in zip(eager, lazy):
+        unpickled = pickle.loads(pickle.dumps(lazy_game))
+        assert isinstance(unpickled, LazyBoardGame)
+        assert unpickled.name == eager_game.name
+        assert unpickled.bgg_rank == eager_game.bgg_rank
+        assert unpickled.data() == eager_game.data()
+
+    # once everything was read, the XML isn't kept
+    complete = pickle.loads(pickle.dumps(lazy[0]))
+    complete.data()
+    assert b"<item" not in pickle.dumps(complete)
+    assert pickle.loads(pickle.dumps(complete)).data() == eager[0].data()
+
+def test_lazy_game_reads_values_when_used():
+    reads = []
+
+    def read(keys):
+        reads.append(keys)
+        data = {"name": "Game", "stats": {"average": 7.5, "ranks": []}, "videos": []}
+        return data if keys is None else dict((key, data[key]) for key in keys if key in data)
+
+    game = LazyBoardGame(10, read)
+    assert reads == []
+
+    assert game.name == "Game"
+    assert game.name == "Game"
+    assert game.rating_average == 7.5
+    assert game.min_players is None
+    assert game.min_players is None
+    assert reads == [["name"], ["stats"], ["minplayers"]]
+
+    assert game.data() == {"id": 10, "name": "Game", "stats": {"average": 7.5, "ranks": []}, "videos": []}
+    assert game.videos == []
+    assert len(reads) == 4
+
+    item = create_lazy_game_from_bytes(TEMPLATE_ITEM.encode("utf-8"), TEST_GAME_ID, html_parser=html_parser)
+    assert item.name == TEST_GAME_NAME
+    assert item.data() == create_game_from_xml(ET.fromstring(TEMPLATE_ITEM), TEST_GAME_ID, html_parser).data()
+
+    with pytest.raises(BGGApiError):
+        create_lazy_game_from_bytes(b"<item", 1, html_parser=html_parser).name
+
+
+def test_game_fields(mocker):
+    requested = []
+
+    def simulate_thing(url, params, timeout, stream=False):
+        requested.append(dict(params))
+        ids = [int(game_id) for game_id in str(params["id"]).split(",")]
+        items = [TEMPLATE_ITEM.replace('id="{}"'.format(TEST_GAME_ID), 'id="{}"'.format(game_id), 1)
+                 for game_id in ids]
+        return MockResponse("<items>{}</items>".format("".join(items)))
+
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_thing
+
+    bgg = BGGClient(cache=CacheBackendNone(), requests_burst=10)
+
+    games = bgg.game_list([1, 2], versions=True, fields={"name", "mechanics"})
+    assert "stats" not in requested[-1]
+    assert requested[-1]["versions"] == 0
+    assert requested[-1]["videos"] == 0
+    for game in games:
+        assert set(game.data()) == {"id", "name", "mechanics", "expansion", "accessory"}
+        assert game.name == TEST_GAME_NAME
+        assert game.mechanics
+        assert game.rating_average is None
+        assert game.bgg_rank is None
+        assert game.versions == []
+
+    game = bgg.game(game_id=3, fields=["stats", "versions"])
+    assert requested[-1]["stats"] == 1
+    assert requested[-1]["versions"] == 1
+    assert game.bgg_rank is not None
+    assert game.versions
+    assert game.description == ""
+
+    lazy = BGGClient(cache=CacheBackendNone(), requests_burst=10, lazy_games=True)
+    game = lazy.game(game_id=4, fields={"stats"})
+    assert game.name == TEST_GAME_NAME
+    assert game.bgg_rank is not None
+    assert game.mechanics == []
+
+    with pytest.raises(BGGValueError):
+        bgg.game_list([1], fields={"name", "rank"})
+
+
+def test_game_list_is_fetched_in_chunks(mocker):
+    lock = threading.Lock()
+    requested = []
+    in_flight = {"now": 0, "max": 0}
+
+    def simulate_thing(url, params, timeout, stream=False):
+        ids = [int(game_id) for game_id in params["id"].split(",")]
+        with lock:
+            requested.append(ids)
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.02)
+        with lock:
+            in_flight["now"] -= 1
+
+        # the server returns the items in its own order, and nothing for the ids it doesn't know
+        items = [TEMPLATE_ITEM.replace('id="{}"'.format(TEST_GAME_ID), 'id="{}"'.format(game_id), 1)
+                 for game_id in reversed(ids) if game_id not in MISSING_IDS]
+        return MockResponse("<items>{}</items>".format("".join(items)))
+
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_thing
+
+    bgg = BGGClient(cache=CacheBackendNone(), requests_per_minute=60000, requests_burst=10, workers=4)
+
+    game_ids = list(range(1, 51)) + [3, 7]
+    game_list = bgg.game_list(game_ids)
+
+    # each id is requested once, in chunks the server accepts
+    assert sorted(sum(requested, [])) == list(range(1, 51))
+    assert all(len(chunk) <= GAME_LIST_CHUNK_SIZE for chunk in requested)
+    assert len(requested) == 3
+    assert in_flight["max"] > 1
+
+    # results follow the input order, missing ids are marked by None
+    assert len(game_list) == len(game_ids)
+    for game_id, game in zip(game_ids, game_list):
+        if game_id in MISSING_IDS:
+            assert game is None
+        else:
+            assert game.id == game_id
+
+
+def test_best_ranked_game_is_chosen_with_one_request(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    # one search, then the ranks of all the results in one /thing call
+    assert bgg.get_game_id("eclipse", choose=BGGChoose.BEST_RANK) == 72125
+    assert mock_get.call_count == 2
+
+
+def test_get_games_by_name_with_one_request(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    games = bgg.games("coup")
+
+    assert [game.id for game in games] == [1653, 2088, 131357]
+    assert all(game.name.lower().startswith("coup") for game in games)
+    assert mock_get.call_count == 2
+
+
+def test_game_list_items_are_cached_separately(mocker):
+    requested = []
+
+    def send(adapter, request, **kwargs):
+        params = dict(parse_qsl(urlparse(request.url).query))
+        requested.append(params["id"])
+        items = [TEMPLATE_ITEM.replace('id="{}"'.format(TEST_GAME_ID), 'id="{}"'.format(game_id), 1)
+                 for game_id in params["id"].split(",")]
+
+        response = requests.Response()
+        response.status_code = 200
+        response.headers["Content-Type"] = "text/xml; charset=utf-8"
+        response._content = "<items>{}</items>".format("".join(items)).encode("utf-8")
+        response.url = request.url
+        response.request = request
+        response.raw = io.BytesIO(response._content)
+        return response
+
+    mocker.patch("requests.adapters.HTTPAdapter.send", side_effect=send, autospec=True)
+
+    bgg = BGGClient(cache=CacheBackendMemory(ttl=3600), requests_per_minute=60000)
+
+    assert [game.id for game in bgg.game_list([1, 2, 3])] == [1, 2, 3]
+    assert requested == ["1,2,3"]
+
+    # only the missing games are requested
+    assert bgg.game(game_id=2).id == 2
+    assert [game.id for game in bgg.game_list([2, 3, 4])] == [2, 3, 4]
+    assert requested == ["1,2,3", "4"]
+
+    # the games fetched with other flags aren't reused
+    bgg.game_list([1, 2], versions=True)
+    assert requested == ["1,2,3", "4", "1,2"]
@@ -1,3 +1,4 @@
+import threading
 import time
 
 from boardgamegeek import BGGItemNotFoundError, BGGValueError
@@ -71,3 +72,52 @@ def test_get_invalid_guild_info(bgg, mocker):
 
     with pytest.raises(BGGItemNotFoundError):
         bgg.guild(0, progress=progress_cb)
+
+
+def test_guild_member_pages_are_fetched_concurrently(mocker):
+    lock = threading.Lock()
+    in_flight = {"now": 0, "max": 0}
+
+    def slow_bgg(url, params, timeout, stream=False):
+        with lock:
+            in_flight["now"] += 1
+            in_flight["max"] = max(in_flight["max"], in_flight["now"])
+        time.sleep(0.02)
+        with lock:
+            in_flight["now"] -= 1
+        return simulate_bgg(url, params, timeout, stream)
+
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = slow_bgg
+
+    bgg = BGGClient(cache=CacheBackendNone(), requests_per_minute=60000, requests_burst=20, workers=4)
+    guild = bgg.guild(TEST_GUILD_ID)
+
+    assert len(guild) == guild.members_count
+    assert in_flight["max"] > 1
+
+    # with a single worker the pages are fetched one by one
+    in_flight["max"] = 0
+    bgg = BGGClient(cache=CacheBackendNone(), requests_per_minute=60000, requests_burst=20, workers=1)
+    assert bgg.workers == 1
+    guild = bgg.guild(TEST_GUILD_ID)
+
+    assert len(guild) == guild.members_count
+    assert in_flight["max"] == 1
+
+
+def test_iter_guild_members(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    with pytest.raises(BGGValueError):
+        bgg.iter_guild_members(None)
+
+    with pytest.raises(BGGItemNotFoundError):
+        bgg.iter_guild_members(0)
+
+    guild = bgg.guild(TEST_GUILD_ID)
+    members = list(bgg.iter_guild_members(TEST_GUILD_ID))
+
+    assert len(members) == guild.members_count
+    assert set(members) == guild.members
@@ -1,9 +1,20 @@
+import datetime
+import itertools
 import os
+import shutil
 import tempfile
+import threading
 import time
 
+import requests
+
 from _common import *
-from boardgamegeek import BGGValueError, CacheBackendNone, CacheBackendSqlite
+from boardgamegeek import BGGApiError, BGGItemNotFoundError, BGGValueError, CacheBackendMemory, CacheBackendNone
+from boardgamegeek import CacheBackendCompressedSqlite, CacheBackendFileSystem, CacheBackendSqlite, CacheStats
+from boardgamegeek import NegativeCache, ObjectCache
+from boardgamegeek.cache import BoundedMemoryCache, CompressedSqliteCache, FileSystemCache, SqliteCache, TTLPolicy
+from boardgamegeek.cache import _clock, vacuum_database
+from boardgamegeek.main import vacuum_main
 
 
 #
@@ -52,6 +63,446 @@ def test_sqlite_caching(mocker):
     os.unlink(name)
 
 
+def make_cached_response(body):
+    response = requests.Response()
+    response.status_code = 200
+    response._content = body
+    response.url = "https://www.boardgamegeek.com/xmlapi2/thing"
+    response.request = requests.Request("GET", response.url).prepare()
+    return response
+
+
+def test_bounded_memory_cache_eviction():
+    entry_size = 1000 + BoundedMemoryCache.ENTRY_OVERHEAD
+
+    with pytest.raises(BGGValueError):
+        BoundedMemoryCache(eviction="random")
+
+    store = BoundedMemoryCache(max_bytes=3 * entry_size, eviction="lru")
+    for key in "abc":
+        store.save_response(key, make_cached_response(b"x" * 1000))
+    assert store.bytes_used == 3 * entry_size
+
+    # "b" becomes the least recently used
+    assert store.get_response_and_time("a")[0].content == b"x" * 1000
+    store.save_response("d", make_cached_response(b"x" * 1000))
+    assert store.get_response_and_time("b") == (None, None)
+    assert store.stats()["evictions"] == 1
+    assert store.bytes_used <= store.max_bytes
+
+    # responses larger than the budget aren't stored at all
+    store.save_response("huge", make_cached_response(b"x" * 4 * entry_size))
+    assert not store.has_key("huge")
+
+    store.delete("a")
+    assert store.bytes_used == 2 * entry_size
+
+    store = BoundedMemoryCache(max_bytes=2 * entry_size, eviction="lfu")
+    store.save_response("a", make_cached_response(b"x" * 1000))
+    store.save_response("b", make_cached_response(b"x" * 1000))
+    store.get_response_and_time("a")
+    store.get_response_and_time("a")
+    store.get_response_and_time("b")
+    store.save_response("c", make_cached_response(b"x" * 1000))
+    assert store.has_key("a") and not store.has_key("b")
+
+
+def test_bounded_memory_cache_expiry(mocker):
+    store = BoundedMemoryCache(ttl=10, sweep_interval=5)
+    store.save_response("a", make_cached_response(b"hello"))
+
+    # expired entries are dropped by the next access after the sweep interval, whatever its key
+    now = _clock()
+    mocker.patch("boardgamegeek.cache.datetime", **{"utcnow.return_value": datetime.datetime.utcnow() +
+                                                                          datetime.timedelta(seconds=11)})
+    mocker.patch("boardgamegeek.cache._clock", return_value=now + 6)
+    assert store.get_response_and_time("b") == (None, None)
+    assert store.stats() == {"entries": 0, "bytes_used": 0, "max_bytes": None, "evictions": 0, "expirations": 1}
+
+    # the memory backend uses it
+    assert isinstance(CacheBackendMemory(ttl=10, max_bytes=1000).cache.cache, BoundedMemoryCache)
+
+
+def test_compressed_sqlite_cache():
+    fd, name = tempfile.mkstemp(suffix=".cache")
+    os.close(fd)
+    os.unlink(name)
+
+    with io.open(os.path.join(XML_PATH, "thing?historical=0&id=31260,283&marketplace=0&stats=1&versions=1&videos=1"),
+                 "rb") as f:
+        body = f.read()
+
+    try:
+        store = CompressedSqliteCache(name, ttl=1000)
+        store.save_response("game", make_cached_response(body))
+
+        # served before (and after) being written to the database
+        assert store.get_response_and_time("game")[0].content == body
+        store.flush()
+        assert store.get_response_and_time("game")[0].content == body
+
+        # other connections (e.g. from other processes) see it
+        other = CompressedSqliteCache(name)
+        assert other.get_response_and_time("game")[0].content == body
+        assert other.get_response_and_time("missing") == (None, None)
+
+        stored_size = other._connection().execute("SELECT length(data) FROM responses").fetchone()[0]
+        assert stored_size * 4 < len(body)
+
+        store.delete("game")
+        store.flush()
+        assert not other.has_key("game")
+
+        assert store.vacuum() > 0
+        assert other._connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    finally:
+        for suffix in ["", "-wal", "-shm"]:
+            if os.path.exists(name + suffix):
+                os.unlink(name + suffix)
+
+
+def test_ttl_policy():
+    policy = TTLPolicy(default=100,
+                       endpoints={"hot": 10, "search": None},
+                       rules=[("thing", {"comments": 1}, 5), (None, {"page": 2}, 1)])
+
+    assert policy.ttl_for("https://www.boardgamegeek.com/xmlapi2/hot?type=boardgame") == 10
+    assert policy.ttl_for("https://www.boardgamegeek.com/xmlapi2/thing?id=1&comments=1") == 5
+    assert policy.ttl_for("https://www.boardgamegeek.com/xmlapi2/thing?id=1&comments=0") == 100
+    assert policy.ttl_for("https://www.boardgamegeek.com/xmlapi2/guild?id=1&page=2") == 1
+    assert policy.ttl_for("https://www.boardgamegeek.com/xmlapi2/search?query=coup") is None
+    assert policy.longest() is None
+
+    with pytest.raises(BGGValueError):
+        TTLPolicy(default="blabla")
+
+
+def test_ttl_policy_is_applied_by_the_backends(mocker):
+    def send(adapter, request, **kwargs):
+        response = make_cached_response(b"<items />")
+        response.url = request.url
+        response.request = request
+        response.raw = io.BytesIO(response._content)
+        return response
+
+    mock_send = mocker.patch("requests.adapters.HTTPAdapter.send", side_effect=send, autospec=True)
+
+    # the hot items expire right away, the games never do
+    policy = TTLPolicy(default=None, endpoints={"hot": 0})
+
+    fd, name = tempfile.mkstemp(suffix=".cache")
+    os.close(fd)
+    os.unlink(name)
+
+    try:
+        for backend in [CacheBackendMemory(ttl=policy), CacheBackendSqlite(name, ttl=policy)]:
+            mock_send.reset_mock()
+            for _ in range(2):
+                backend.cache.get("https://www.boardgamegeek.com/xmlapi2/hot", params={"type": "boardgame"})
+                backend.cache.get("https://www.boardgamegeek.com/xmlapi2/thing", params={"id": 1})
+            assert mock_send.call_count == 3
+    finally:
+        os.unlink(name)
+
+
+def test_stale_while_revalidate(mocker):
+    refreshing = threading.Event()
+    bodies = itertools.chain([b"<items>old</items>"], itertools.repeat(b"<items>new</items>"))
+
+    def send(adapter, request, **kwargs):
+        response = make_cached_response(next(bodies))
+        if response.content == b"<items>new</items>":
+            refreshing.wait(5)
+        response.url = request.url
+        response.request = request
+        response.raw = io.BytesIO(response._content)
+        return response
+
+    mock_send = mocker.patch("requests.adapters.HTTPAdapter.send", side_effect=send, autospec=True)
+
+    backend = CacheBackendMemory(ttl=TTLPolicy(default=0), stale_grace=60)
+    url = "https://www.boardgamegeek.com/xmlapi2/hot"
+
+    assert backend.cache.get(url).content == b"<items>old</items>"
+
+    # the expired response is served right away, while a single refresh runs in the background
+    for _ in range(3):
+        response = backend.cache.get(url)
+        assert response.content == b"<items>old</items>"
+        assert response.stale
+    assert mock_send.call_count == 2
+
+    refreshing.set()
+    for _ in range(50):
+        if backend.cache.get(url).content == b"<items>new</items>":
+            break
+        time.sleep(0.05)
+    assert backend.cache.get(url).content == b"<items>new</items>"
+
+
+def test_object_cache_lru_and_ttl(mocker):
+    cache = ObjectCache(max_size=2, ttl=10)
+
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1
+
+    # "b" is the least recently used
+    cache.set("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("c") == 3
+    assert len(cache) == 2
+
+    # everything expires after the ttl
+    now = _clock()
+    mocker.patch("boardgamegeek.cache._clock", return_value=now + 11)
+    assert cache.get("a") is None
+
+    assert cache.stats() == {"hits": 2, "misses": 2, "evictions": 1, "size": 1}
+
+    with pytest.raises(BGGValueError):
+        ObjectCache(max_size=0)
+
+
+def test_object_caching(mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    object_cache = ObjectCache()
+    bgg = BGGClient(cache=CacheBackendNone(), object_cache=object_cache)
+
+    user = bgg.user(TEST_VALID_USER)
+    assert bgg.user(TEST_VALID_USER) is user
+
+    # the games retrieved with game_list are available to game() and the other way around
+    game_list = bgg.game_list([TEST_GAME_ID, TEST_GAME_ID_2], videos=True, versions=True)
+    assert bgg.game(game_id=TEST_GAME_ID, videos=True, versions=True) is game_list[0]
+    requests_made = mock_get.call_count
+    assert bgg.game_list([TEST_GAME_ID_2, TEST_GAME_ID], videos=True, versions=True) == game_list[::-1]
+    assert mock_get.call_count == requests_made
+
+    assert object_cache.hits == 4
+
+
+def test_negative_caching(mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    negative_cache = NegativeCache(ttl=10)
+    bgg = BGGClient(cache=CacheBackendNone(), negative_cache=negative_cache)
+
+    for _ in range(3):
+        with pytest.raises(BGGItemNotFoundError):
+            bgg.collection(TEST_INVALID_USER)
+        with pytest.raises(BGGItemNotFoundError):
+            bgg.plays(name=TEST_INVALID_USER)
+    assert mock_get.call_count == 2
+
+    # the other requests aren't affected
+    assert bgg.user(TEST_VALID_USER).name == TEST_VALID_USER
+
+    # until it expires
+    now = _clock()
+    mocker.patch("boardgamegeek.cache._clock", return_value=now + 11)
+    with pytest.raises(BGGItemNotFoundError):
+        bgg.collection(TEST_INVALID_USER)
+    assert mock_get.call_count == 4
+
+
+
+def test_negative_caching_of_unknown_game_ids(mocker):
+    def simulate_unknown_thing(url, params, timeout, stream=False):
+        return MockResponse('<?xml version="1.0" encoding="utf-8"?><items termsofuse="x"></items>')
+
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_unknown_thing
+
+    for batch_window in [None, 0.001]:
+        mock_get.reset_mock()
+        bgg = BGGClient(cache=CacheBackendNone(), negative_cache=NegativeCache(ttl=10), batch_window=batch_window)
+
+        # both the direct and the batched requests report the missing game as such
+        for _ in range(3):
+            with pytest.raises(BGGItemNotFoundError):
+                bgg.game(game_id=999999999)
+        assert mock_get.call_count == 1
+
+        # ...which still is an API error, for the existing callers
+        with pytest.raises(BGGApiError):
+            bgg.game(game_id=999999999)
+        assert mock_get.call_count == 1
+
+    # the other items which aren't found aren't API errors
+    assert not issubclass(BGGItemNotFoundError, BGGApiError)
+
+def test_file_system_cache(mocker):
+    path = tempfile.mkdtemp()
+
+    with pytest.raises(BGGValueError):
+        FileSystemCache(path, index_slots=2)
+
+    # two stores on the same directory, as in two processes
+    store = FileSystemCache(path, ttl=10, index_slots=64)
+    other = FileSystemCache(path, index_slots=1024)
+    assert other.index_slots == 64
+
+    store.save_response("game", make_cached_response(b"<items>game</items>"))
+    response, created = other.get_response_and_time("game")
+    assert response.content == b"<items>game</items>"
+    assert abs((datetime.datetime.utcnow() - created).total_seconds()) < 5
+    assert other.get_response_and_time("missing") == (None, None)
+
+    # the same contents are stored once
+    other.save_response("same game", make_cached_response(b"<items>game</items>"))
+    assert sum(len(files) for _, _, files in os.walk(os.path.join(path, "objects"))) == 1
+
+    other.delete("same game")
+    assert not store.has_key("same game")
+    assert store.has_key("game")
+
+    # once the probed slots are full, the oldest response is replaced
+    for i in range(100):
+        store.save_response("key {}".format(i), make_cached_response("<items>{}</items>".format(i).encode("ascii")))
+    assert other.get_response_and_time("key 99")[0].content == b"<items>99</items>"
+
+    # the expired responses, and their files, are dropped
+    mocker.patch.object(FileSystemCache, "ORPHAN_AGE", -1)
+    mocker.patch("boardgamegeek.cache.datetime", **{"utcnow.return_value": datetime.datetime.utcnow() +
+                                                                          datetime.timedelta(seconds=11)})
+    assert store.remove_expired() > 0
+    assert not other.has_key("key 99")
+    assert sum(len(files) for _, _, files in os.walk(os.path.join(path, "objects"))) == 0
+
+
+def test_file_system_backend(mocker):
+    mock_send = mocker.patch("requests.adapters.HTTPAdapter.send", autospec=True)
+
+    def send(adapter, request, **kwargs):
+        response = make_cached_response(b"<items />")
+        response.headers["Content-Type"] = "text/xml"
+        response.url = request.url
+        response.request = request
+        response.raw = io.BytesIO(response._content)
+        return response
+
+    mock_send.side_effect = send
+
+    path = tempfile.mkdtemp()
+    url = "https://www.boardgamegeek.com/xmlapi2/thing"
+
+    CacheBackendFileSystem(path, ttl=100).cache.get(url, params={"id": 1})
+    # served to the other processes right away
+    assert CacheBackendFileSystem(path, ttl=100).cache.get(url, params={"id": 1}).from_cache
+    assert mock_send.call_count == 1
+
+
+def test_cache_stats(mocker):
+    def send(adapter, request, **kwargs):
+        response = make_cached_response(b"<items>" + b"x" * 1000 + b"</items>")
+        response.headers["Content-Type"] = "text/xml"
+        response.url = request.url
+        response.request = request
+        response.raw = io.BytesIO(response._content)
+        return response
+
+    mocker.patch("requests.adapters.HTTPAdapter.send", side_effect=send, autospec=True)
+
+    entry_size = 1015 + BoundedMemoryCache.ENTRY_OVERHEAD
+    bgg = BGGClient(cache=CacheBackendMemory(ttl=TTLPolicy(default=100, endpoints={"hot": 0}), max_bytes=2 * entry_size,
+                                             stale_grace=100),
+                    requests_burst=10)
+    session = bgg.requests_session
+    thing_url = "https://www.boardgamegeek.com/xmlapi2/thing"
+
+    session.get(thing_url, params={"id": 1})
+    session.get(thing_url, params={"id": 1})
+    session.get("https://www.boardgamegeek.com/xmlapi2/hot")
+    session.get("https://www.boardgamegeek.com/xmlapi2/hot")
+    # evicts the first game
+    session.get(thing_url, params={"id": 2})
+
+    stats = bgg.cache_stats()
+    assert set(stats) == {"thing", "hot"}
+    assert stats["thing"]["hits"] == 1
+    assert stats["thing"]["misses"] == 2
+    assert stats["thing"]["evictions"] == 1
+    # the evicted game isn't stored anymore
+    assert stats["thing"]["bytes_stored"] == 1015
+    assert stats["thing"]["bytes_written"] == 2 * 1015
+    # the stale reply is replaced by the refreshed one, it doesn't add up
+    assert stats["hot"]["bytes_stored"] == 1015
+    assert stats["thing"]["hit_ratio"] == 1 / 3.0
+    assert stats["hot"]["stale"] == 1
+    assert stats["thing"]["lookup_latency"]["count"] == 3
+    assert sum(count for _, count in stats["thing"]["lookup_latency"]["buckets"]) == 3
+    assert stats["thing"]["lookup_latency"]["buckets"][-1][0] == float("inf")
+
+    # nothing to report without a cache
+    assert BGGClient(cache=CacheBackendNone()).cache_stats() == {}
+
+    counters = CacheStats()
+    counters.record_eviction()
+    assert counters.snapshot()[CacheStats.UNKNOWN_ENDPOINT]["hit_ratio"] is None
+    counters.reset()
+    assert counters.snapshot() == {}
+
+    # the size of what's stored isn't a counter, it survives resets
+    counters.record_store("thing", 100)
+    counters.record_lookup("thing", "hits", 0.001)
+    counters.reset()
+    assert counters.snapshot()["thing"]["bytes_stored"] == 100
+    assert counters.snapshot()["thing"]["bytes_written"] == 0
+    assert counters.snapshot()["thing"]["hits"] == 0
+
+
+def test_storages_track_the_stored_bytes():
+    path = tempfile.mkdtemp()
+
+    def check(store, stats, stored, written):
+        if hasattr(store, "flush"):
+            store.flush()
+        assert stats.snapshot()["thing"]["bytes_stored"] == stored
+        assert stats.snapshot()["thing"]["bytes_written"] == written
+
+    factories = [lambda stats: BoundedMemoryCache(stats=stats),
+                 lambda stats: SqliteCache(os.path.join(path, "plain.db"), stats=stats),
+                 lambda stats: CompressedSqliteCache(os.path.join(path, "compressed.db"), stats=stats),
+                 lambda stats: FileSystemCache(os.path.join(path, "files"), stats=stats)]
+
+    try:
+        for factory in factories:
+            stats = CacheStats()
+            store = factory(stats)
+
+            store.save_response("a", make_cached_response(b"x" * 100))
+            store.save_response("b", make_cached_response(b"x" * 200))
+            check(store, stats, 300, 300)
+
+            # replacing a response only counts the new one
+            store.save_response("a", make_cached_response(b"x" * 50))
+            check(store, stats, 250, 350)
+
+            store.delete("b")
+            check(store, stats, 50, 350)
+
+            store.save_response("c", make_cached_response(b"x" * 10))
+            store.remove_old_entries(datetime.datetime.utcnow() + datetime.timedelta(minutes=1))
+            check(store, stats, 0, 360)
+
+            store.save_response("d", make_cached_response(b"x" * 5))
+            store.clear()
+            check(store, stats, 0, 365)
+
+        # the sqlite backends record in their session's stats
+        for backend in [CacheBackendSqlite(os.path.join(path, "backend.db"), ttl=100),
+                        CacheBackendCompressedSqlite(os.path.join(path, "backend-compressed.db"), ttl=100)]:
+            backend.store.save_response("a", make_cached_response(b"x" * 100))
+            check(backend.store, backend.cache.stats, 100, 100)
+            assert backend.stats()["thing"]["bytes_stored"] == 100
+    finally:
+        shutil.rmtree(path)
+
+
 def test_invalid_parameter_values_for_bggclient():
     with pytest.raises(BGGValueError):
         BGGClient(retries="asd")
@@ -61,3 +512,41 @@ def test_invalid_parameter_values_for_bggclient():
 
     with pytest.raises(BGGValueError):
         BGGClient(timeout="asd")
+
+
+def test_vacuum_command(mocker, capsys):
+    path = tempfile.mkdtemp()
+    policy = TTLPolicy(default=100, endpoints={"hot": 0})
+
+    try:
+        compressed = CompressedSqliteCache(os.path.join(path, "compressed.db"), ttl=policy)
+        plain = SqliteCache(os.path.join(path, "plain.db"))
+        for store in [compressed, plain]:
+            store.save_response("game", make_cached_response(b"<items>" + b"x" * 10000 + b"</items>"))
+            hot = make_cached_response(b"<items />")
+            hot.url = "https://www.boardgamegeek.com/xmlapi2/hot"
+            store.save_response("hot", hot)
+        compressed.flush()
+
+        mocker.patch("boardgamegeek.cache.datetime", **{"utcnow.return_value": datetime.datetime.utcnow() +
+                                                                              datetime.timedelta(seconds=1)})
+        for name in ["compressed.db", "plain.db"]:
+            assert vacuum_main([os.path.join(path, name)]) == 0
+            assert name in capsys.readouterr().out
+
+        # the expired responses are dropped from the compressed database, the plain one doesn't know about expiry
+        assert not CompressedSqliteCache(os.path.join(path, "compressed.db")).has_key("hot")
+        assert CompressedSqliteCache(os.path.join(path, "compressed.db")).has_key("game")
+        assert SqliteCache(os.path.join(path, "plain.db")).has_key("hot")
+
+        not_a_cache = os.path.join(path, "notes.txt")
+        with open(not_a_cache, "w") as f:
+            f.write("hello")
+
+        for invalid in [not_a_cache, os.path.join(path, "missing.db")]:
+            with pytest.raises(SystemExit):
+                vacuum_main([invalid])
+            with pytest.raises(BGGValueError):
+                vacuum_database(invalid)
+    finally:
+        shutil.rmtree(path)
@@ -0,0 +1,45 @@
+from _common import *
+from boardgamegeek import BGGValueError
+from boardgamegeek.parsers import ElementTreeParser, LxmlParser, get_parser
+
+lxml = pytest.importorskip("lxml")
+
+
+def test_get_parser():
+    assert isinstance(get_parser(), LxmlParser)
+    assert isinstance(get_parser("lxml"), LxmlParser)
+    assert type(get_parser("etree")) is ElementTreeParser
+
+    parser = ElementTreeParser()
+    assert get_parser(parser) is parser
+
+    with pytest.raises(BGGValueError):
+        get_parser("html5lib")
+
+    with pytest.raises(BGGValueError):
+        BGGClient(parser=42)
+
+
+def _load_everything(mocker, parser):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    bgg = BGGClient(cache=CacheBackendNone(), retries=2, retry_delay=1, requests_burst=20, parser=parser)
+
+    games = bgg.game_list([TEST_GAME_ID, TEST_GAME_ID_2], versions=True, videos=True)
+    collection = bgg.collection(TEST_VALID_USER, versions=True)
+    plays = bgg.plays(game_id=TEST_GAME_ID_2)
+    streamed_plays = list(bgg.iter_plays(name=TEST_VALID_USER))
+    guild = bgg.guild(TEST_GUILD_ID)
+    user = bgg.user(TEST_VALID_USER)
+
+    return {"games": [game.data() for game in games],
+            "collection": [item.data() for item in collection],
+            "plays": [play.data() for play in plays],
+            "streamed_plays": [play.data() for play in streamed_plays],
+            "guild": guild.data(),
+            "user": user.data()}
+
+
+def test_parsers_create_the_same_objects(mocker):
+    assert _load_everything(mocker, "lxml") == _load_everything(mocker, "etree")
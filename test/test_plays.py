@@ -142,3 +142,40 @@ def test_create_plays_with_initial_data():
     p = Plays({"plays": [{"id": 10, "user_id": 102, "date": now}]})
 
     assert p[0].date == now
+
+
+def test_iter_plays(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    with pytest.raises(BGGValueError):
+        bgg.iter_plays(name=None, game_id=None)
+
+    with pytest.raises(BGGItemNotFoundError):
+        bgg.iter_plays(name=TEST_INVALID_USER)
+
+    plays = bgg.plays(game_id=TEST_GAME_ID_2)
+    streamed = list(bgg.iter_plays(game_id=TEST_GAME_ID_2))
+
+    assert len(streamed) == plays.plays_count
+    assert [p.id for p in streamed] == [p.id for p in plays]
+    assert all(isinstance(p, PlaySession) for p in streamed)
+
+    streamed = list(bgg.iter_plays(name=TEST_VALID_USER))
+    assert len(streamed) > 0
+    assert all(p.user_id == TEST_VALID_USER_ID for p in streamed)
+
+
+def test_iter_plays_stops_early(mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    bgg = BGGClient(cache=CacheBackendNone(), requests_per_minute=6000, workers=1)
+
+    plays = bgg.iter_plays(game_id=TEST_GAME_ID_2)
+    for _ in range(5):
+        next(plays)
+    plays.close()
+
+    # only the first page was needed
+    assert mock_get.call_count == 1
@@ -0,0 +1,77 @@
+from _common import *
+from boardgamegeek import BGGValueError
+from boardgamegeek.api import html_parser
+from boardgamegeek.loaders import create_game_from_xml
+from boardgamegeek.loaders.schema import Attribute, AttributeList, ItemSchema, Text, compile_schema
+
+
+ITEM = """
+    <item type="{}" id="3">
+        <name type="primary" value="First" />
+        <name type="alternate" value="Second" />
+        <description>Rock &amp;amp; roll</description>
+        <yearpublished value="1990" />
+        <link type="rpg" id="1" value="System" />
+        <link type="rpggenre" id="2" value="Horror" />
+        <link type="rpggenre" id="3" value="Fantasy" />
+        <link type="unknown" id="4" value="Ignored" />
+        <videos total="1">
+            <video id="5" title="Video" category="review" language="English" link="http://example.com"
+                   username="user" userid="6" postdate="2011-01-01T00:00:00-06:00" />
+        </videos>
+        <versions>
+            <item type="rpgitemversion" id="7">
+                <name type="primary" value="Version" />
+                <yearpublished value="4294967295" />
+                <width value="n/a" />
+            </item>
+            <item type="boardgameversion" id="8" />
+        </versions>
+        <statistics page="1">
+            <ratings>
+                <usersrated value="2" />
+                <average value="5.5" />
+            </ratings>
+        </statistics>
+    </item>"""
+
+
+def test_compiled_schema():
+    extract = compile_schema(ItemSchema([Attribute("name", "name", type="primary"),
+                                         AttributeList("genres", "link", type="rpggenre"),
+                                         Attribute("year", "yearpublished", convert=int),
+                                         Text("description", "description", unescape=True),
+                                         Text("image", "image")],
+                                        version_type="rpgitemversion"))
+
+    data = extract(ET.fromstring(ITEM.format("rpgitem")), html_parser)
+
+    assert data["name"] == "First"
+    assert data["genres"] == ["Horror", "Fantasy"]
+    assert data["year"] == 1990
+    assert data["description"] == "Rock & roll"
+    assert data["image"] is None
+    assert [video["id"] for video in data["videos"]] == ["5"]
+    assert [version["id"] for version in data["versions"]] == [7]
+    assert data["versions"][0]["yearpublished"] == -1
+    assert data["versions"][0]["width"] == 0.0
+    assert data["stats"]["average"] == 5.5
+    assert data["stats"]["owned"] is None
+    assert "suggested_players" not in data
+
+    # each element can only go to one field
+    with pytest.raises(BGGValueError):
+        compile_schema(ItemSchema([AttributeList("links", "link"),
+                                   AttributeList("genres", "link", type="rpggenre")],
+                                  version_type="rpgitemversion"))
+
+
+def test_rpg_item_loader():
+    rpg = create_game_from_xml(ET.fromstring(ITEM.format("rpgitem")), 3, html_parser=html_parser)
+
+    assert rpg.name == "First"
+    assert rpg.alternative_names == ["Second"]
+    assert rpg.year == 1990
+    assert rpg.systems == ["System"]
+    assert rpg.genres == ["Horror", "Fantasy"]
+    assert rpg.users_rated == 2
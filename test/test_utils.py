@@ -1,10 +1,10 @@
 import pickle
-import threading
-import time
+import requests
 
 import boardgamegeek.utils as bggutil
 from _common import *
 from boardgamegeek.objects.things import Thing
+from boardgamegeek import BGGApiError, CacheBackendMemory
 
 
 def test_get_xml_subelement_attr(xml):
@@ -119,52 +119,131 @@ def test_serialization():
     assert type(dummy_unserialized) == Thing
 
 
-def test_rate_limiting_for_requests():
-    # create two threads, give each a list of games to fetch, disable cache and time the amount needed to
-    # fetch the data. requests should be serialized, even if made from two different threads
+def test_token_bucket_allows_bursts():
+    bucket = bggutil.TokenBucket(rpm=60, burst=3)
 
-    test_set_1 = [5,     # acquire
-                  31260, # agricola
-                  72125] # "eclipse"
+    # the first requests of a burst go out right away
+    for _ in range(3):
+        assert bucket.reserve() == 0.0
 
-    test_set_2 = [18602, # caylus
-                  28720, # brass
-                  53953] # thunderstone]
+    # ...then each new request is spaced out at 1 second intervals (60 rpm), as a reservation
+    assert 0.9 < bucket.reserve() <= 1.0
+    assert 1.9 < bucket.reserve() <= 2.0
 
-    def _worker_thread(games):
-        bgg = BGGClient(cache=None, requests_per_minute=20)
-        for g in games:
-            bgg.game(game_id=g)
 
-    t1 = threading.Thread(target=_worker_thread, args=(test_set_1, ))
-    t2 = threading.Thread(target=_worker_thread, args=(test_set_2, ))
+def test_rate_limiter_uses_per_endpoint_buckets():
+    limiter = bggutil.RateLimiter(rpm=60, burst=1, endpoint_limits={"collection": (60, 2)})
 
-    start_time = time.time()
-    t1.start()
-    t2.start()
+    assert limiter.reserve("https://www.boardgamegeek.com/xmlapi2/thing?id=1") == 0.0
+    assert limiter.reserve("https://www.boardgamegeek.com/xmlapi2/thing?id=2") > 0.9
 
-    t1.join(timeout=10000)
-    t2.join(timeout=10000)
-    end_time = time.time()
+    # other endpoints have their own budget
+    assert limiter.reserve("https://www.boardgamegeek.com/xmlapi2/plays?username=x") == 0.0
+    assert limiter.reserve("https://www.boardgamegeek.com/xmlapi2/collection?username=x") == 0.0
+    assert limiter.reserve("https://www.boardgamegeek.com/xmlapi2/collection?username=y") == 0.0
+    assert limiter.reserve("https://www.boardgamegeek.com/xmlapi2/collection?username=z") > 0.9
 
-    # 20 requests per minute => a request every 3 seconds x 6 games => should take around 18 seconds
-    assert 15 < end_time - start_time < 21      # +/- a few seconds...
 
+def test_rate_limiting_state_is_per_adapter():
+    a1 = bggutil.RateLimitingAdapter(rpm=1)
+    a2 = bggutil.RateLimitingAdapter(rpm=1)
 
-    # second test, use caching and confirm it's working when combined with the rate limiting algorithm
-    # do cached requests for the test set, then do them again. should take only half of the time
+    assert a1.rate_limiter.reserve("https://www.boardgamegeek.com/xmlapi2/thing") == 0.0
+    assert a2.rate_limiter.reserve("https://www.boardgamegeek.com/xmlapi2/thing") == 0.0
 
-    bgg = BGGClient(requests_per_minute=20)
 
-    start_time = time.time()
-    for g in test_set_1:
-        bgg.game(game_id=g)
-    end_time = time.time()
+def test_xml_item_stream():
+    xml = ('<?xml version="1.0" encoding="utf-8"?>'
+           '<items total="3"><item id="1"><item id="nested" /></item><item id="2" /><other /><item id="3" /></items>')
 
-    assert 7 < end_time - start_time < 17       # 3 games should take ~9 seconds
+    stream = bggutil.XMLItemStream(io.BytesIO(xml.encode("utf-8")), "item")
+    assert stream.root.attrib["total"] == "3"
 
-    # repeat requests, should be served from cache
-    for g in test_set_1:
-        bgg.game(game_id=g)
+    ids = []
+    for item in stream:
+        ids.append(item.attrib["id"])
+        # the items already processed are dropped from the tree
+        assert [i.attrib["id"] for i in stream.root.findall("item")][0] == item.attrib["id"]
 
-    assert 0 < time.time() - end_time < 2
\ No newline at end of file
+    assert ids == ["1", "2", "3"]
+    assert stream.root.findall("item") == []
+    assert stream.root.find("other") is not None
+
+    with pytest.raises(BGGApiError):
+        list(bggutil.XMLItemStream(io.BytesIO(b"<items><item></items>"), "item"))
+
+    with pytest.raises(BGGApiError):
+        bggutil.XMLItemStream(io.BytesIO(b""), "item")
+
+
+def test_rate_limiting_for_requests(mocker):
+    # time doesn't pass while "sleeping", so the reservations add up and the waits can be checked exactly
+    waits = []
+    mocker.patch("boardgamegeek.utils.time.sleep", side_effect=waits.append)
+
+    def send(adapter, request, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        response._content = b"<items />"
+        response.url = request.url
+        response.request = request
+        return response
+
+    mocker.patch("requests.adapters.HTTPAdapter.send", side_effect=send, autospec=True)
+
+    thing_url = "https://www.boardgamegeek.com/xmlapi2/thing"
+    collection_url = "https://www.boardgamegeek.com/xmlapi2/collection"
+
+    bgg = BGGClient(cache=CacheBackendNone(), requests_per_minute=60, requests_burst=3,
+                    endpoint_rate_limits={"collection": (30, 1)})
+
+    # a burst goes out right away, then the requests are spaced out at 1 second intervals (60 rpm)
+    for game_id in range(5):
+        bgg.requests_session.get(thing_url, params={"id": game_id})
+    assert waits == [pytest.approx(1.0, abs=0.1), pytest.approx(2.0, abs=0.1)]
+
+    # the collection endpoint has its own bucket, with its own limits (30 rpm, no bursts)
+    del waits[:]
+    bgg.requests_session.get(collection_url, params={"username": "a"})
+    assert waits == []
+    bgg.requests_session.get(collection_url, params={"username": "b"})
+    assert waits == [pytest.approx(2.0, abs=0.1)]
+
+    # each client has its own budget, even when using the default cache
+    del waits[:]
+    clients = [BGGClient(requests_per_minute=1), BGGClient(requests_per_minute=1)]
+    assert clients[0].requests_session is not clients[1].requests_session
+
+    for client in clients:
+        client.requests_session.get(thing_url, params={"id": 1})
+    assert waits == []
+
+    # ...and its own limits: creating another client doesn't change the rate of the existing ones
+    slow = BGGClient(requests_per_minute=1)
+    BGGClient(requests_per_minute=60000)
+    slow.requests_session.get(thing_url, params={"id": 1})
+    slow.requests_session.get(thing_url, params={"id": 2})
+    assert waits == [pytest.approx(60.0, abs=0.1)]
+
+
+def test_invalid_rate_limits_fall_back_to_the_defaults():
+    defaults = (bggutil.DEFAULT_REQUESTS_PER_MINUTE, bggutil.DEFAULT_REQUESTS_BURST)
+
+    for rpm, burst in [(0, 0), (-1, -5), ("fast", None)]:
+        limiter = bggutil.RateLimiter(rpm=rpm, burst=burst, endpoint_limits={"collection": (rpm, burst)})
+        assert (limiter._rpm, limiter._burst) == defaults
+        assert limiter._endpoint_limits["collection"] == defaults
+
+    # only the invalid value is replaced
+    limiter = bggutil.RateLimiter(endpoint_limits={"collection": (10, 0), "plays": 10})
+    assert limiter._endpoint_limits == {"collection": (10, bggutil.DEFAULT_REQUESTS_BURST)}
+    assert limiter.reserve("https://www.boardgamegeek.com/xmlapi2/collection?username=x") == 0.0
+
+
+def test_default_cache_is_per_client():
+    clients = [BGGClient(), BGGClient()]
+    assert all(isinstance(client._cache, CacheBackendMemory) for client in clients)
+    assert clients[0]._cache is not clients[1]._cache
+
+    # None still disables caching
+    assert isinstance(BGGClient(cache=None)._cache, CacheBackendNone)
@@ -0,0 +1,47 @@
+import os
+import tempfile
+
+from _common import *
+from boardgamegeek.warm import main as warm_main, read_list, warm_cache
+
+
+def test_warm_cache(bgg, mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    reports = []
+    status = warm_cache(bgg,
+                        game_ids=[1653, 2088, 131357],
+                        user_names=[TEST_VALID_USER, TEST_INVALID_USER],
+                        guild_ids=[TEST_GUILD_ID_2],
+                        progress=lambda s: reports.append((s.done, s.failed)))
+
+    # the games are requested together
+    assert sum(1 for call in mock_get.call_args_list if call[0][0].endswith("/thing")) == 1
+
+    assert status.total == 3 + 2 * 2 + 1
+    assert status.done == status.total
+    # the collection and plays of the invalid user
+    assert status.failed == 2
+    assert status.eta == 0
+    assert reports[-1] == (status.total, 2)
+    assert len(reports) == 6
+
+
+def test_warm_command(mocker):
+    mock_get = mocker.patch("requests.sessions.Session.get")
+    mock_get.side_effect = simulate_bgg
+
+    tmp_dir = tempfile.mkdtemp()
+    games_file = os.path.join(tmp_dir, "games.txt")
+    with io.open(games_file, "w", encoding="utf-8") as f:
+        f.write("# games to warm\n1653\n\n2088\n131357\n")
+
+    assert read_list(games_file) == ["1653", "2088", "131357"]
+
+    cache_file = os.path.join(tmp_dir, "cache.db")
+    assert warm_main(["--cache", cache_file, "--compressed", "--games", games_file]) == 0
+
+    with pytest.raises(SystemExit):
+        # nothing to do
+        warm_main(["--cache", cache_file])